@@ -0,0 +1,154 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from typing import Optional
+
+from app.db.casting_index import casting_index
+from app.db.database import DATABASE_PATH
+
+# Cache-Control sent with cacheable responses; clients and proxies may reuse
+# a response for this long and must revalidate it with its ETag afterwards
+CACHE_MAX_AGE = int(os.getenv("CASTING_CACHE_MAX_AGE", "60"))
+CACHE_CONTROL = f"public, max-age={CACHE_MAX_AGE}, must-revalidate"
+
+
+def compute_etag(version: str, path: str, query_string: bytes) -> str:
+    """
+    Compute the strong ETag of a response.
+
+    Responses are fully determined by the dataset version and the request
+    URL, so the ETag can be computed before the request is handled.
+    """
+    hasher = hashlib.sha256(version.encode("utf-8"))
+    hasher.update(b"\n" + path.encode("utf-8") + b"?" + query_string)
+    return '"' + hasher.hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header value against an ETag."""
+    if not if_none_match:
+        return False
+
+    # "*" is not honoured: the 304 is sent before the endpoint runs, so it
+    # would also answer requests for castings that do not exist
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+
+    return False
+
+
+class DatasetVersion:
+    """
+    Version of the castings data in the database.
+
+    The version is read from the dataset_version table, whose counter
+    triggers bump on every change to the castings table, so it follows
+    imports and syncs run by other processes. It is only re-read when
+    SQLite's PRAGMA data_version reports that another connection has
+    changed the database since the last read.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = None
+        self._data_version = None
+        self._version = None
+
+    def get(self) -> Optional[str]:
+        """Return the current version, or None if the database has none."""
+        with self._lock:
+            try:
+                if self._connection is None:
+                    self._connection = sqlite3.connect(self.path, check_same_thread=False)
+
+                data_version = self._connection.execute("PRAGMA data_version").fetchall()[0][0]
+                if data_version != self._data_version:
+                    rows = self._connection.execute(
+                        "SELECT epoch, counter FROM dataset_version"
+                    ).fetchall()
+                    self._version = f"{rows[0][0]}-{rows[0][1]}" if rows else None
+                    self._data_version = data_version
+            except sqlite3.Error:
+                # E.g. a database created before the dataset_version table
+                self._data_version = None
+                self._version = None
+
+            return self._version
+
+    def close(self):
+        """Close the connection used to read the version."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+            self._connection = None
+            self._data_version = None
+            self._version = None
+
+
+dataset_version = DatasetVersion(DATABASE_PATH)
+
+
+class DatasetETagMiddleware:
+    """
+    ASGI middleware adding dataset-versioned ETags to casting GET responses.
+
+    The version combines the database's dataset version, which changes with
+    every change to the castings table whichever process makes it, and the
+    content hash of the in-memory casting index that lookups are served
+    from. Requests whose If-None-Match matches get a 304 without reaching
+    the endpoint. Nothing is cached while the database has no dataset
+    version.
+    """
+
+    def __init__(self, app, path_prefix: str = "/api/castings"):
+        self.app = app
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in ("GET", "HEAD")
+            or not scope["path"].startswith(self.path_prefix)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        version = dataset_version.get()
+        if version is None:
+            await self.app(scope, receive, send)
+            return
+        version = f"{version}:{casting_index.version or ''}"
+
+        etag = compute_etag(version, scope["path"], scope.get("query_string", b""))
+        cache_headers = [
+            (b"etag", etag.encode("latin-1")),
+            (b"cache-control", CACHE_CONTROL.encode("latin-1")),
+        ]
+
+        if_none_match = None
+        for name, value in scope["headers"]:
+            if name == b"if-none-match":
+                if_none_match = value.decode("latin-1")
+                break
+
+        if etag_matches(if_none_match, etag):
+            await send({
+                "type": "http.response.start",
+                "status": 304,
+                "headers": cache_headers,
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_etag(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                message["headers"] = list(message.get("headers", [])) + cache_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
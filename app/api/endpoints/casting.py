@@ -1,39 +1,73 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.db.database import get_db
+from app.api.export import EXPORT_MEDIA_TYPES, export_castings_query, stream_export
+from app.api.facets import casting_facets_counts
+from app.api.pagination import set_next_cursor
+from app.api.queries import (
+    casting_by_number_query,
+    list_castings_query,
+    paginate,
+    search_castings_query,
+)
+from app.api.serialization import castings_response
+from app.db.casting_index import casting_index
+from app.db.database import SessionLocal, get_db
 from app.models.casting import Casting as CastingModel
-from app.schemas.casting import Casting
+from app.schemas.casting import (
+    Casting,
+    CastingBatchRequest,
+    CastingBatchResponse,
+    CastingFacets,
+)
 
 router = APIRouter()
 
+# Casting numbers per IN (...) query, well below SQLite's bound parameter limit
+BATCH_CHUNK_SIZE = 500
+
 
 @router.get("/", response_model=List[Casting])
 def get_castings(
-    skip: int = 0,
-    limit: int = 100,
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     db: Session = Depends(get_db)
 ):
     """
     Retrieve a list of castings with pagination.
+    
+    Pass the `cursor` returned in the `X-Next-Cursor` (or `Link`) header to
+    fetch the next page; cursor pages cost the same at any depth, unlike
+    `skip`.
     """
-    castings = db.query(CastingModel).offset(skip).limit(limit).all()
-    return castings
+    query, params = list_castings_query(skip, limit, cursor)
+    rows = db.execute(query, params).all()
+    castings, next_cursor = paginate(rows, limit)
+    response = castings_response(castings)
+    set_next_cursor(request, response, next_cursor)
+    
+    return response
 
 
 @router.get("/{casting_id}", response_model=Casting)
-def get_casting_by_id(
-    casting_id: str,
-    db: Session = Depends(get_db)
-):
+def get_casting_by_id(casting_id: str):
     """
     Retrieve a specific casting by its casting number.
+    
+    Served from the in-memory casting index when it is loaded, otherwise
+    from the database.
     """
-    casting = db.query(CastingModel).filter(
-        CastingModel.casting == casting_id
-    ).first()
+    if casting_index.loaded:
+        casting = casting_index.get(casting_id)
+    else:
+        with SessionLocal() as db:
+            query, params = casting_by_number_query(casting_id)
+            casting = db.scalars(query, params).first()
     
     if casting is None:
         raise HTTPException(
@@ -44,34 +78,184 @@ def get_casting_by_id(
     return casting
 
 
+@router.get("/prefix/{prefix}", response_model=List[Casting])
+def get_castings_by_prefix(
+    prefix: str = Path(..., min_length=1, description="Leading digits of the casting number"),
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """
+    Retrieve castings whose casting number starts with the given prefix.
+    
+    Served from the sorted in-memory casting index when it is loaded,
+    otherwise from the database.
+    """
+    if casting_index.loaded:
+        return casting_index.search_prefix(prefix, limit=limit)
+    
+    with SessionLocal() as db:
+        castings = db.query(CastingModel).filter(
+            CastingModel.casting.startswith(prefix, autoescape=True)
+        ).order_by(CastingModel.casting).limit(limit).all()
+    
+    return castings
+
+
+@router.post("/batch", response_model=CastingBatchResponse)
+def get_castings_batch(batch: CastingBatchRequest):
+    """
+    Look up many castings by casting number in a single request.
+    
+    Served from the in-memory casting index when it is loaded, otherwise
+    with chunked IN (...) queries.
+    """
+    # Drop duplicates while keeping the request order
+    casting_ids = list(dict.fromkeys(batch.castings))
+    
+    if casting_index.loaded:
+        by_casting = {
+            casting_id: casting_index.get(casting_id)
+            for casting_id in casting_ids
+        }
+    else:
+        by_casting = {}
+        with SessionLocal() as db:
+            for i in range(0, len(casting_ids), BATCH_CHUNK_SIZE):
+                chunk = casting_ids[i:i + BATCH_CHUNK_SIZE]
+                for casting in db.query(CastingModel).filter(
+                    CastingModel.casting.in_(chunk)
+                ):
+                    by_casting[casting.casting] = casting
+    
+    found = []
+    missing = []
+    for casting_id in casting_ids:
+        casting = by_casting.get(casting_id)
+        if casting is None:
+            missing.append(casting_id)
+        else:
+            found.append(casting)
+    
+    return {"found": found, "missing": missing}
+
+
+@router.post("/index/refresh")
+def refresh_casting_index(db: Session = Depends(get_db)):
+    """
+    Rebuild the in-memory casting index, e.g. after importing new data.
+    """
+    total = casting_index.rebuild(db)
+    return {"castings": total}
+
 
 @router.get("/search/", response_model=List[Casting])
 def search_castings(
+    request: Request,
     years: Optional[str] = None,
     cid: Optional[int] = None,
     main_caps: Optional[str] = None,
     comments: Optional[str] = None,
-    skip: int = 0,
-    limit: int = 100,
+    year: Optional[int] = Query(None, description="Produced in this year"),
+    year_from: Optional[int] = Query(None, description="Production overlaps years from this year"),
+    year_to: Optional[int] = Query(None, description="Production overlaps years up to this year"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     db: Session = Depends(get_db)
 ):
     """
     Search for castings based on various criteria.
-    """
-    query = db.query(CastingModel)
     
-    if years:
-        query = query.filter(CastingModel.years.ilike(f"%{years}%"))
+    `years` matches the production years text, while `year`, `year_from`
+    and `year_to` run range queries against the parsed production years.
+    `comments` is a full-text search; every word must match the start of a
+    word in the comments, and results are ordered by relevance.
     
-    if cid:
-        query = query.filter(CastingModel.cid == cid)
+    Results support the same cursor pagination as the list endpoint.
+    """
+    query, params = search_castings_query(
+        skip,
+        limit,
+        cursor,
+        years=years,
+        cid=cid,
+        main_caps=main_caps,
+        comments=comments,
+        year=year,
+        year_from=year_from,
+        year_to=year_to,
+    )
+    castings, next_cursor = paginate(db.execute(query, params).all(), limit)
+    response = castings_response(castings)
+    set_next_cursor(request, response, next_cursor)
     
-    if main_caps:
-        query = query.filter(CastingModel.main_caps.ilike(f"%{main_caps}%"))
+    return response
+
+
+@router.get("/facets/", response_model=CastingFacets)
+def get_casting_facets(
+    years: Optional[str] = None,
+    cid: Optional[int] = None,
+    main_caps: Optional[str] = None,
+    comments: Optional[str] = None,
+    year: Optional[int] = Query(None, description="Produced in this year"),
+    year_from: Optional[int] = Query(None, description="Production overlaps years from this year"),
+    year_to: Optional[int] = Query(None, description="Production overlaps years up to this year"),
+    limit: int = Query(20, ge=1, le=1000, description="Values returned per facet"),
+    db: Session = Depends(get_db)
+):
+    """
+    Count castings by CID, main caps, production start decade and comment token.
     
-    if comments:
-        query = query.filter(CastingModel.comments.ilike(f"%{comments}%"))
+    The filters work like the search endpoint's. Without filters the counts
+    come from the casting_facets summary table, which triggers keep up to
+    date; comment token counts are recounted by imports and syncs, and
+    `stale` is true if comments changed since. With filters the matching
+    castings are counted per request. Each facet lists its most common
+    values first.
+    """
+    return casting_facets_counts(
+        db,
+        limit,
+        years=years,
+        cid=cid,
+        main_caps=main_caps,
+        comments=comments,
+        year=year,
+        year_from=year_from,
+        year_to=year_to,
+    )
+
+
+@router.get("/export/")
+def export_castings(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+    years: Optional[str] = None,
+    cid: Optional[int] = None,
+    main_caps: Optional[str] = None,
+    comments: Optional[str] = None,
+    year: Optional[int] = Query(None, description="Produced in this year"),
+    year_from: Optional[int] = Query(None, description="Production overlaps years from this year"),
+    year_to: Optional[int] = Query(None, description="Production overlaps years up to this year"),
+):
+    """
+    Export all castings, or those matching the search criteria, in one response.
     
-    castings = query.offset(skip).limit(limit).all()
+    The filters work like the search endpoint's. Rows are ordered by id and
+    streamed as NDJSON (one casting per line) or CSV while they are read
+    from the database.
+    """
+    query, params = export_castings_query(
+        years=years,
+        cid=cid,
+        main_caps=main_caps,
+        comments=comments,
+        year=year,
+        year_from=year_from,
+        year_to=year_to,
+    )
     
-    return castings
+    return StreamingResponse(
+        stream_export(query, params, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="castings.{format}"'},
+    )
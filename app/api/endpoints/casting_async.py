@@ -0,0 +1,116 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.pagination import set_next_cursor
+from app.api.queries import (
+    casting_by_number_query,
+    list_castings_query,
+    paginate,
+    search_castings_query,
+)
+from app.api.serialization import castings_response
+from app.db.casting_index import casting_index
+from app.db.database import get_async_db, get_async_sessionmaker
+from app.schemas.casting import Casting
+
+# Async versions of the list, lookup and search endpoints, used when
+# CASTING_DB_MODE=async. They share their queries with
+# app.api.endpoints.casting and run on the event loop instead of the
+# threadpool.
+router = APIRouter()
+
+
+@router.get("/", response_model=List[Casting])
+async def get_castings(
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Retrieve a list of castings with pagination.
+
+    Pass the `cursor` returned in the `X-Next-Cursor` (or `Link`) header to
+    fetch the next page; cursor pages cost the same at any depth, unlike
+    `skip`.
+    """
+    query, params = list_castings_query(skip, limit, cursor)
+    result = await db.execute(query, params)
+    castings, next_cursor = paginate(result.all(), limit)
+    response = castings_response(castings)
+    set_next_cursor(request, response, next_cursor)
+
+    return response
+
+
+@router.get("/{casting_id}", response_model=Casting)
+async def get_casting_by_id(casting_id: str):
+    """
+    Retrieve a specific casting by its casting number.
+
+    Served from the in-memory casting index when it is loaded, otherwise
+    from the database.
+    """
+    if casting_index.loaded:
+        casting = casting_index.get(casting_id)
+    else:
+        async with get_async_sessionmaker()() as db:
+            query, params = casting_by_number_query(casting_id)
+            result = await db.scalars(query, params)
+            casting = result.first()
+
+    if casting is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Casting with number {casting_id} not found"
+        )
+
+    return casting
+
+
+@router.get("/search/", response_model=List[Casting])
+async def search_castings(
+    request: Request,
+    years: Optional[str] = None,
+    cid: Optional[int] = None,
+    main_caps: Optional[str] = None,
+    comments: Optional[str] = None,
+    year: Optional[int] = Query(None, description="Produced in this year"),
+    year_from: Optional[int] = Query(None, description="Production overlaps years from this year"),
+    year_to: Optional[int] = Query(None, description="Production overlaps years up to this year"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Search for castings based on various criteria.
+
+    `years` matches the production years text, while `year`, `year_from`
+    and `year_to` run range queries against the parsed production years.
+    `comments` is a full-text search; every word must match the start of a
+    word in the comments, and results are ordered by relevance.
+
+    Results support the same cursor pagination as the list endpoint.
+    """
+    query, params = search_castings_query(
+        skip,
+        limit,
+        cursor,
+        years=years,
+        cid=cid,
+        main_caps=main_caps,
+        comments=comments,
+        year=year,
+        year_from=year_from,
+        year_to=year_to,
+    )
+    result = await db.execute(query, params)
+    castings, next_cursor = paginate(result.all(), limit)
+    response = castings_response(castings)
+    set_next_cursor(request, response, next_cursor)
+
+    return response
@@ -0,0 +1,92 @@
+import csv
+import io
+import json
+from typing import Any, Dict, Iterator, Tuple
+
+from sqlalchemy import Select, select
+
+from app.api.queries import (
+    CASTING_FIELD_COLUMNS,
+    CASTING_FIELDS,
+    apply_search_filters,
+    filter_combination,
+    search_params,
+    statement_cache,
+)
+from app.db.database import SessionLocal
+from app.models.casting import Casting as CastingModel
+
+# Exported fields, in the same order as the API's JSON responses
+EXPORT_COLUMNS = CASTING_FIELDS
+
+# Rows fetched from the database cursor and serialized per chunk
+EXPORT_CHUNK_SIZE = 1000
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def export_castings_query(**filters) -> Tuple[Select, Dict[str, Any]]:
+    """
+    Build the query and parameters for exporting castings, filtered like
+    the search endpoint.
+
+    Plain columns are selected instead of ORM objects, and rows are ordered
+    by id.
+    """
+    params = search_params(**filters)
+
+    def build():
+        query = apply_search_filters(select(*CASTING_FIELD_COLUMNS), params)
+        return query.order_by(CastingModel.id)
+
+    key = ("export", filter_combination(params))
+    return statement_cache.get(key, build), params
+
+
+def _ndjson_chunk(rows) -> str:
+    return "".join(
+        json.dumps(dict(zip(EXPORT_COLUMNS, row)), separators=(",", ":")) + "\n"
+        for row in rows
+    )
+
+
+def _csv_chunk(rows) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+def stream_export(query: Select, params: Dict[str, Any], export_format: str) -> Iterator[bytes]:
+    """
+    Stream the rows of an export query as NDJSON or CSV.
+
+    Rows are fetched EXPORT_CHUNK_SIZE at a time with yield_per, so memory
+    stays flat however many rows are exported. The generator owns its
+    session, which stays open until the last chunk has been sent.
+
+    Args:
+        query: Query from export_castings_query
+        params: Bound parameters from export_castings_query
+        export_format: "ndjson" or "csv"
+
+    Yields:
+        Encoded chunks of the response body
+    """
+    if export_format == "csv":
+        serialize = _csv_chunk
+        # Send the header before running the query
+        yield _csv_chunk([EXPORT_COLUMNS]).encode("utf-8")
+    else:
+        serialize = _ndjson_chunk
+
+    with SessionLocal() as db:
+        result = db.execute(
+            query,
+            params,
+            execution_options={"yield_per": EXPORT_CHUNK_SIZE},
+        )
+        for rows in result.partitions():
+            yield serialize(rows).encode("utf-8")
@@ -0,0 +1,155 @@
+from collections import Counter
+from typing import Any, Dict, List
+
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.orm import Session
+
+from app.api.queries import (
+    apply_search_filters,
+    filter_combination,
+    search_params,
+    statement_cache,
+)
+from app.db.casting_facets import comment_tokens
+from app.models.casting import Casting as CastingModel
+from app.models.casting import (
+    FACET_COMMENT_TOKEN,
+    FACET_STALE,
+    FACET_TOTAL,
+    casting_facets,
+)
+
+# Facets returned by the facets endpoint, in response order
+FACETS = ("cid", "main_caps", "decade", FACET_COMMENT_TOKEN)
+
+# Column expression of each facet counted with GROUP BY for filtered
+# requests; matches the summary table's FACET_EXPRESSIONS
+FACET_COLUMNS = {
+    "cid": CastingModel.cid,
+    "main_caps": CastingModel.main_caps,
+    "decade": CastingModel.start_year // 10 * 10,
+}
+
+
+def _empty_facets() -> Dict[str, List[Dict[str, Any]]]:
+    return {facet: [] for facet in FACETS}
+
+
+def summary_facets(db: Session, limit: int) -> Dict[str, Any]:
+    """
+    Read the facet counts of all castings from the summary table.
+
+    One indexed query returns the `limit` most common values of every
+    facet. Nothing is written: comment token counts are recounted by the
+    importers and sync, and reported as stale if comments changed since.
+    """
+    def build():
+        position = func.row_number().over(
+            partition_by=casting_facets.c.facet,
+            order_by=(casting_facets.c.count.desc(), casting_facets.c.value),
+        )
+        ranked = select(
+            casting_facets.c.facet,
+            casting_facets.c.value,
+            casting_facets.c.count,
+            position.label("position"),
+        ).where(
+            casting_facets.c.facet.in_(FACETS + (FACET_TOTAL, FACET_STALE))
+        ).subquery()
+
+        return select(
+            ranked.c.facet, ranked.c.value, ranked.c.count
+        ).where(
+            ranked.c.position <= bindparam("limit")
+        ).order_by(ranked.c.facet, ranked.c.position)
+
+    statement = statement_cache.get(("facets", "summary"), build)
+
+    total = 0
+    stale = False
+    facets = _empty_facets()
+    for facet, value, count in db.execute(statement, {"limit": limit}):
+        if facet == FACET_TOTAL:
+            total = count
+        elif facet == FACET_STALE:
+            stale = True
+        else:
+            facets[facet].append({"value": value, "count": count})
+
+    return {"total": total, "source": "summary", "stale": stale, "facets": facets}
+
+
+def filtered_facets(db: Session, params: Dict[str, Any], limit: int) -> Dict[str, Any]:
+    """
+    Count the facets of the castings matching the search parameters.
+
+    The summary table only holds counts over all castings, so each facet is
+    counted with a GROUP BY over the matching rows; comment tokens are
+    counted by tokenizing the matching comments like the full-text index.
+    """
+    combination = filter_combination(params)
+    params = dict(params, limit=limit)
+
+    total_statement = statement_cache.get(
+        ("facets", FACET_TOTAL, combination),
+        lambda: apply_search_filters(
+            select(func.count(CastingModel.id)), params
+        ),
+    )
+    total = db.execute(total_statement, params).scalar_one()
+
+    facets = _empty_facets()
+    for facet, expression in FACET_COLUMNS.items():
+        def build(expression=expression):
+            count = func.count().label("count")
+            query = select(expression.label("value"), count).where(
+                expression.isnot(None)
+            )
+            query = apply_search_filters(query, params)
+            return query.group_by(expression).order_by(
+                count.desc(), expression
+            ).limit(bindparam("limit"))
+
+        statement = statement_cache.get(("facets", facet, combination), build)
+        facets[facet] = [
+            {"value": value, "count": count}
+            for value, count in db.execute(statement, params)
+        ]
+
+    comments_statement = statement_cache.get(
+        ("facets", FACET_COMMENT_TOKEN, combination),
+        lambda: apply_search_filters(
+            select(CastingModel.comments).where(CastingModel.comments.isnot(None)),
+            params,
+        ),
+    )
+    tokens = Counter()
+    for comments in db.execute(comments_statement, params).scalars():
+        tokens.update(comment_tokens(comments))
+
+    most_common = sorted(tokens.items(), key=lambda item: (-item[1], item[0]))
+    facets[FACET_COMMENT_TOKEN] = [
+        {"value": token, "count": count} for token, count in most_common[:limit]
+    ]
+
+    return {"total": total, "source": "query", "stale": False, "facets": facets}
+
+
+def casting_facets_counts(db: Session, limit: int, **filters) -> Dict[str, Any]:
+    """
+    Count castings by CID, main caps, production start decade and comment
+    token, optionally restricted by the search endpoint's filters.
+
+    Unfiltered requests are served from the casting_facets summary table;
+    filtered requests count the matching castings.
+
+    Returns:
+        The number of matching castings, where the counts came from
+        ("summary" or "query"), whether the comment token counts are stale
+        and, per facet, up to `limit` values with their counts, most
+        common first
+    """
+    params = search_params(**filters)
+    if not params:
+        return summary_facets(db, limit)
+    return filtered_facets(db, params, limit)
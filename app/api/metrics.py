@@ -0,0 +1,335 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.routing import Match
+
+from app.api.queries import statement_cache
+
+# Bucket upper bounds, in the unit of each histogram
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_TIME_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+DB_QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+SIZE_BUCKETS = (100, 1000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000)
+
+# Route label for requests that match no route, so unknown paths cannot
+# create unbounded label values
+UNMATCHED_ROUTE = "<unmatched>"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class RequestStats:
+    """Database work done while handling one request."""
+
+    __slots__ = ("scope", "queries", "seconds")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.queries = 0
+        self.seconds = 0.0
+
+
+# Stats of the request being handled, seen by the engine event handlers in
+# the threadpool and in async code alike
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, extra: Sequence[Tuple[str, str]] = ()) -> str:
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    """A metric family with one value per label set."""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self._values: Dict[Labels, float] = {}
+
+    def clear(self):
+        """Drop every recorded value."""
+        self._values.clear()
+
+    def render(self) -> List[str]:
+        """Render the family in the Prometheus text format."""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(labels)} {_format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    type_name = "counter"
+
+    def inc(self, labels: Labels = (), amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+
+class Gauge(Metric):
+    type_name = "gauge"
+
+    def inc(self, labels: Labels = (), amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, labels: Labels = (), amount: float = 1):
+        self.inc(labels, -amount)
+
+    def set(self, labels: Labels = (), value: float = 0):
+        self._values[labels] = value
+
+
+class Histogram(Metric):
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float]):
+        super().__init__(name, documentation)
+        self.buckets = tuple(buckets)
+        # Per label set: count per bucket (the last one is +Inf), and sum
+        self._observations: Dict[Labels, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, labels: Labels, value: float):
+        counts, total = self._observations.setdefault(
+            labels, ([0] * (len(self.buckets) + 1), [0.0])
+        )
+        counts[bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def clear(self):
+        self._observations.clear()
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        for labels, (counts, total) in sorted(self._observations.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = _format_labels(labels, [("le", _format_value(bound))])
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total[0])}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """The API's request and database metrics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = Counter(
+            "http_requests_total", "Total HTTP requests by method, route and status."
+        )
+        self.in_progress = Gauge(
+            "http_requests_in_progress", "HTTP requests currently being handled."
+        )
+        self.latency = Histogram(
+            "http_request_duration_seconds",
+            "Time from receiving a request to sending the end of its response.",
+            LATENCY_BUCKETS,
+        )
+        self.response_size = Histogram(
+            "http_response_size_bytes", "Size of response bodies.", SIZE_BUCKETS
+        )
+        self.request_db_queries = Histogram(
+            "http_request_db_queries",
+            "Database queries executed while handling a request.",
+            DB_QUERY_BUCKETS,
+        )
+        self.request_db_time = Histogram(
+            "http_request_db_duration_seconds",
+            "Time spent executing database queries while handling a request.",
+            DB_TIME_BUCKETS,
+        )
+        self.db_queries = Counter(
+            "db_queries_total", "Database queries executed, inside requests or not."
+        )
+        self.db_time = Counter(
+            "db_query_duration_seconds_total", "Time spent executing database queries."
+        )
+
+    def request_started(self, method: str):
+        """Record a request that is now being handled."""
+        with self._lock:
+            self.in_progress.inc((("method", method),))
+
+    def observe_request(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        seconds: float,
+        size: int,
+        stats: RequestStats,
+    ):
+        """Record a finished request."""
+        labels = (("method", method), ("route", route))
+        with self._lock:
+            self.in_progress.dec((("method", method),))
+            self.requests.inc(labels + (("status", str(status)),))
+            self.latency.observe(labels, seconds)
+            self.response_size.observe(labels, size)
+            self.request_db_queries.observe(labels, stats.queries)
+            self.request_db_time.observe(labels, stats.seconds)
+
+    def observe_query(self, seconds: float):
+        """Record a database query."""
+        with self._lock:
+            self.db_queries.inc()
+            self.db_time.inc(amount=seconds)
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text format."""
+        cache = statement_cache.stats()
+        extra = [
+            Gauge("sql_statement_cache_statements", "SQL statements in the statement cache."),
+            Counter("sql_statement_cache_hits_total", "Statement cache hits."),
+            Counter("sql_statement_cache_misses_total", "Statement cache misses."),
+        ]
+        extra[0].set(value=cache["statements"])
+        extra[1].inc(amount=cache["hits"])
+        extra[2].inc(amount=cache["misses"])
+
+        with self._lock:
+            lines = [
+                line for family in self.families() + extra for line in family.render()
+            ]
+        return "\n".join(lines) + "\n"
+
+    def families(self) -> List[Metric]:
+        """Return every metric family of the registry."""
+        return [
+            self.requests,
+            self.in_progress,
+            self.latency,
+            self.response_size,
+            self.request_db_queries,
+            self.request_db_time,
+            self.db_queries,
+            self.db_time,
+        ]
+
+    def clear(self):
+        """Reset every metric."""
+        with self._lock:
+            for family in self.families():
+                family.clear()
+
+
+metrics = MetricsRegistry()
+
+
+# The start time is kept on the execution context, which is discarded with
+# the statement, so statements that fail before after_cursor_execute leave
+# nothing behind on the pooled connection
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context.query_start_time = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context.query_start_time
+    metrics.observe_query(elapsed)
+
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.seconds += elapsed
+
+
+def current_request() -> Optional[Tuple[str, str]]:
+    """Return the method and route of the request being handled, if any."""
+    stats = _request_stats.get()
+    if stats is None:
+        return None
+    return stats.scope["method"], route_label(stats.scope)
+
+
+def instrument_engine(engine: Engine):
+    """Count and time every query executed by an engine."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def route_label(scope) -> str:
+    """Return the route template a request matched, e.g. /api/castings/{casting_id}."""
+    route = scope.get("route")
+    if route is None and "app" in scope:
+        # Requests answered by a middleware never reach the router
+        for candidate in scope["app"].router.routes:
+            match, _ = candidate.matches(scope)
+            if match == Match.FULL:
+                route = candidate
+                break
+
+    return getattr(route, "path", UNMATCHED_ROUTE)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request counts, latency, in-flight requests,
+    response sizes and the database work done by each request.
+    """
+
+    def __init__(self, app, registry: MetricsRegistry = metrics):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        stats = RequestStats(scope)
+        token = _request_stats.set(stats)
+        status = 500
+        size = 0
+
+        async def send_with_metrics(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        self.registry.request_started(scope["method"])
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            _request_stats.reset(token)
+            self.registry.observe_request(
+                scope["method"],
+                route_label(scope),
+                status,
+                time.perf_counter() - started,
+                size,
+                stats,
+            )
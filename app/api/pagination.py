@@ -0,0 +1,73 @@
+import base64
+import json
+from typing import List, Optional
+
+from fastapi import HTTPException, Request, Response
+
+
+def encode_cursor(values: List) -> str:
+    """
+    Encode the sort key of the last row on a page as an opaque cursor.
+
+    Args:
+        values: Sort key values of the last row, e.g. [id] or [rank, id]
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def _is_number(value, types) -> bool:
+    return isinstance(value, types) and not isinstance(value, bool)
+
+
+def decode_cursor(cursor: str, size: int) -> List:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string from a previous response
+        size: Expected number of sort key values
+
+    Returns:
+        Sort key values of the last row of the previous page
+
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError):
+        values = None
+
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    # The last value is the id; a rank may precede it
+    *ranks, last_id = values
+    if not _is_number(last_id, int) or not all(_is_number(rank, (int, float)) for rank in ranks):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return values
+
+
+def set_next_cursor(request: Request, response: Response, next_cursor: Optional[str]):
+    """
+    Advertise the next page through the X-Next-Cursor and Link headers.
+
+    Args:
+        request: Current request
+        response: Response to add the headers to
+        next_cursor: Cursor for the next page, or None on the last page
+    """
+    if next_cursor is None:
+        return
+
+    next_url = request.url.remove_query_params("skip").include_query_params(
+        cursor=next_cursor
+    )
+    response.headers["X-Next-Cursor"] = next_cursor
+    response.headers["Link"] = f'<{next_url}>; rel="next"'
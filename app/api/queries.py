@@ -0,0 +1,268 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, and_, bindparam, or_, select
+
+from app.api.pagination import decode_cursor, encode_cursor
+from app.models.casting import Casting as CastingModel
+from app.models.casting import castings_fts, fts_match_query
+from app.schemas.casting import Casting
+
+# Columns selected by the list and search queries, in the same order as the
+# fields of the Casting response schema
+CASTING_FIELDS = list(Casting.model_fields)
+CASTING_FIELD_COLUMNS = [CastingModel.__table__.c[field] for field in CASTING_FIELDS]
+ID_POSITION = CASTING_FIELDS.index("id")
+
+# Bound parameters of the search filters; which of them are present
+# identifies the filter combination
+SEARCH_FILTERS = ("years", "year", "year_from", "year_to", "cid", "main_caps", "match")
+
+
+class StatementCache:
+    """
+    Statements built once per shape and reused with bound parameters.
+
+    Reusing the same statement object lets SQLAlchemy skip rebuilding the
+    query, memoize its cache key and fetch the compiled SQL from the
+    engine's compiled cache, so each shape is compiled once per process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._statements: Dict[Hashable, Select] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, build: Callable[[], Select]) -> Select:
+        """Return the statement for a key, building it on first use."""
+        with self._lock:
+            statement = self._statements.get(key)
+            if statement is not None:
+                self.hits += 1
+                return statement
+            self.misses += 1
+
+        statement = build()
+        with self._lock:
+            return self._statements.setdefault(key, statement)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of cached statements and the hit rate."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "statements": len(self._statements),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else None,
+            }
+
+    def clear(self):
+        """Drop every cached statement and reset the counters."""
+        with self._lock:
+            self._statements.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+statement_cache = StatementCache()
+
+
+def casting_by_number_query(casting_id: str) -> Tuple[Select, Dict[str, Any]]:
+    """Build the query and parameters for a casting by its casting number."""
+    statement = statement_cache.get(
+        ("casting_by_number",),
+        lambda: select(CastingModel).where(
+            CastingModel.casting == bindparam("casting_id")
+        ),
+    )
+    return statement, {"casting_id": casting_id}
+
+
+def list_castings_query(
+    skip: int,
+    limit: int,
+    cursor: Optional[str]
+) -> Tuple[Select, Dict[str, Any]]:
+    """
+    Build the query and parameters for one page of castings ordered by id.
+
+    Plain CASTING_FIELDS rows are selected rather than ORM objects. One
+    extra row is fetched so paginate() can tell whether a next page exists.
+    """
+    params = {"limit": limit + 1, "offset": 0 if cursor else skip}
+    if cursor:
+        (params["last_id"],) = decode_cursor(cursor, 1)
+
+    def build():
+        query = select(*CASTING_FIELD_COLUMNS).order_by(CastingModel.id)
+        if cursor:
+            query = query.where(CastingModel.id > bindparam("last_id"))
+        return query.offset(bindparam("offset")).limit(bindparam("limit"))
+
+    return statement_cache.get(("list", bool(cursor)), build), params
+
+
+def search_params(
+    years: Optional[str] = None,
+    cid: Optional[int] = None,
+    main_caps: Optional[str] = None,
+    comments: Optional[str] = None,
+    year: Optional[int] = None,
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Convert the search endpoint's filters into bound parameters.
+
+    Only active filters get a parameter (named as in SEARCH_FILTERS).
+    """
+    params = {}
+
+    if years:
+        params["years"] = f"%{years}%"
+
+    if year is not None:
+        params["year"] = year
+
+    if year_from is not None:
+        params["year_from"] = year_from
+
+    if year_to is not None:
+        params["year_to"] = year_to
+
+    if cid:
+        params["cid"] = cid
+
+    if main_caps:
+        params["main_caps"] = f"%{main_caps}%"
+
+    if comments and comments.strip():
+        params["match"] = fts_match_query(comments)
+
+    return params
+
+
+def apply_search_filters(query: Select, params: Dict[str, Any]) -> Select:
+    """
+    Apply the search filters whose parameters are present to a query.
+
+    The filters compare against bound parameters, so the query depends only
+    on which filters are active. A "match" parameter joins the full-text
+    index, making castings_fts.c.rank available for ordering.
+    """
+    if "years" in params:
+        query = query.where(CastingModel.years.ilike(bindparam("years")))
+
+    if "year" in params:
+        query = query.where(
+            CastingModel.start_year <= bindparam("year"),
+            CastingModel.end_year >= bindparam("year")
+        )
+
+    if "year_from" in params:
+        query = query.where(CastingModel.end_year >= bindparam("year_from"))
+
+    if "year_to" in params:
+        query = query.where(CastingModel.start_year <= bindparam("year_to"))
+
+    if "cid" in params:
+        query = query.where(CastingModel.cid == bindparam("cid"))
+
+    if "main_caps" in params:
+        query = query.where(CastingModel.main_caps.ilike(bindparam("main_caps")))
+
+    if "match" in params:
+        # Full-text search through the FTS5 index
+        query = query.join(
+            castings_fts, castings_fts.c.rowid == CastingModel.id
+        ).where(
+            castings_fts.c.castings_fts.op("MATCH")(bindparam("match"))
+        )
+
+    return query
+
+
+def filter_combination(params: Dict[str, Any]) -> Tuple[bool, ...]:
+    """Identify which search filters a set of parameters activates."""
+    return tuple(name in params for name in SEARCH_FILTERS)
+
+
+def search_castings_query(
+    skip: int,
+    limit: int,
+    cursor: Optional[str],
+    **filters,
+) -> Tuple[Select, Dict[str, Any]]:
+    """
+    Build the query and parameters for one page of search results.
+
+    Rows hold the CASTING_FIELDS, ordered by id, or by relevance then id
+    for comment searches; ranked queries also select the rank for the
+    cursor. One extra row is fetched so paginate() can tell whether a next
+    page exists. Each filter combination is built and compiled once.
+    """
+    params = search_params(**filters)
+    ranked = "match" in params
+    combination = filter_combination(params)
+
+    if cursor:
+        if ranked:
+            params["last_rank"], params["last_id"] = decode_cursor(cursor, 2)
+        else:
+            (params["last_id"],) = decode_cursor(cursor, 1)
+
+    params["offset"] = 0 if cursor else skip
+    params["limit"] = limit + 1
+
+    def build():
+        query = apply_search_filters(select(*CASTING_FIELD_COLUMNS), params)
+
+        if ranked:
+            rank = castings_fts.c.rank
+            query = query.add_columns(rank).order_by(rank, CastingModel.id)
+
+            if cursor:
+                query = query.where(or_(
+                    rank > bindparam("last_rank"),
+                    and_(rank == bindparam("last_rank"), CastingModel.id > bindparam("last_id"))
+                ))
+        else:
+            query = query.order_by(CastingModel.id)
+
+            if cursor:
+                query = query.where(CastingModel.id > bindparam("last_id"))
+
+        return query.offset(bindparam("offset")).limit(bindparam("limit"))
+
+    key = ("search", combination, bool(cursor))
+    return statement_cache.get(key, build), params
+
+
+def paginate(rows: Sequence, limit: int) -> Tuple[List[Tuple], Optional[str]]:
+    """
+    Split the rows of a page query into castings and the next cursor.
+
+    Args:
+        rows: Result rows of list_castings_query or search_castings_query
+        limit: Requested page size
+
+    Returns:
+        CASTING_FIELDS tuples on this page, and the cursor for the next
+        page or None
+    """
+    field_count = len(CASTING_FIELDS)
+    castings = [tuple(row[:field_count]) for row in rows[:limit]]
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        # Ranked rows end with the rank; the cursor is (rank, id)
+        if len(last) == field_count:
+            sort_key = [last[ID_POSITION]]
+        else:
+            sort_key = [last[field_count], last[ID_POSITION]]
+        next_cursor = encode_cursor(sort_key)
+
+    return castings, next_cursor
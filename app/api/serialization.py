@@ -0,0 +1,44 @@
+import json
+from typing import Iterable, Tuple
+
+from fastapi import Response
+
+from app.api.queries import CASTING_FIELDS
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def dump_castings(rows: Iterable[Tuple]) -> bytes:
+    """
+    Serialize CASTING_FIELDS rows to a JSON array of castings.
+
+    The rows come straight from the database, so they already have the
+    types the Casting schema declares and are not validated again. Uses
+    orjson when it is installed and the standard json module otherwise.
+
+    Args:
+        rows: Tuples of values in CASTING_FIELDS order
+
+    Returns:
+        JSON bytes, equal to what FastAPI would render for List[Casting]
+    """
+    castings = [dict(zip(CASTING_FIELDS, row)) for row in rows]
+
+    if orjson is not None:
+        return orjson.dumps(castings)
+
+    return json.dumps(castings, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def castings_response(rows: Iterable[Tuple]) -> Response:
+    """
+    Build a JSON response for CASTING_FIELDS rows without per-row validation.
+
+    Endpoints returning it keep response_model=List[Casting] so the OpenAPI
+    schema is unchanged; FastAPI skips response validation for Response
+    objects.
+    """
+    return Response(content=dump_castings(rows), media_type="application/json")
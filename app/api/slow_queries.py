@@ -0,0 +1,112 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.api.metrics import current_request
+
+# Statements slower than this many milliseconds are logged; unset disables
+# the slow query log
+SLOW_QUERY_MS = os.getenv("CASTING_SLOW_QUERY_MS")
+
+# JSON Lines file the slow queries are appended to
+SLOW_QUERY_LOG = os.getenv("CASTING_SLOW_QUERY_LOG", "slow_queries.jsonl")
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Identify a statement by its SQL text.
+
+    Values are bound parameters, so every request with the same filter
+    combination has the same shape.
+    """
+    return hashlib.sha256(" ".join(statement.split()).encode("utf-8")).hexdigest()[:16]
+
+
+class SlowQueryLog:
+    """
+    Opt-in log of statements that take longer than a threshold.
+
+    Each slow statement is appended to a JSON Lines file with its bound
+    parameters, duration and calling route. The first time a statement
+    shape is logged by a process, its SQL and SQLite EXPLAIN QUERY PLAN are
+    logged with it; later entries only reference the shape.
+    """
+
+    def __init__(self, path: str, threshold_ms: Optional[float]):
+        self.path = path
+        self.threshold_ms = threshold_ms
+        self._lock = threading.Lock()
+        self._planned_shapes = set()
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold_ms is not None
+
+    def instrument(self, engine: Engine):
+        """Time every statement of an engine, if the log is enabled."""
+        if not self.enabled or event.contains(engine, "after_cursor_execute", self._after_cursor_execute):
+            return
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    # Kept on the execution context, so failing statements leave nothing
+    # behind on the pooled connection
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        context.slow_query_start_time = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        duration_ms = (time.perf_counter() - context.slow_query_start_time) * 1000
+        if duration_ms < self.threshold_ms:
+            return
+
+        shape = statement_shape(statement)
+        request = current_request()
+        entry = {
+            "time": datetime.now(timezone.utc).isoformat(),
+            "duration_ms": round(duration_ms, 3),
+            "shape": shape,
+            "method": request[0] if request else None,
+            "route": request[1] if request else None,
+            "executemany": executemany,
+            "parameters": parameters[0] if executemany and parameters else parameters,
+        }
+
+        with self._lock:
+            first_seen = shape not in self._planned_shapes
+            self._planned_shapes.add(shape)
+
+        if first_seen:
+            entry["statement"] = statement
+            entry["plan"] = self._explain(conn, statement, entry["parameters"])
+
+        self._write(entry)
+
+    def _explain(self, conn, statement: str, parameters) -> Optional[List[str]]:
+        """Return the EXPLAIN QUERY PLAN details of a statement."""
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters or ())
+            return [row[-1] for row in cursor.fetchall()]
+        except Exception as e:
+            return [f"EXPLAIN failed: {e}"]
+        finally:
+            cursor.close()
+
+    def _write(self, entry: Dict):
+        line = json.dumps(entry, default=str) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+
+slow_query_log = SlowQueryLog(
+    SLOW_QUERY_LOG,
+    float(SLOW_QUERY_MS) if SLOW_QUERY_MS else None,
+)
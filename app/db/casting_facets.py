@@ -0,0 +1,63 @@
+import re
+import unicodedata
+from typing import Set
+
+from sqlalchemy.orm import Session
+
+from app.models.casting import (
+    CASTING_FACETS_REBUILD_SQL,
+    COMMENT_TOKEN_FACETS_SQL,
+    FACET_COMMENT_TOKEN,
+    FACET_STALE,
+)
+
+# Runs of letters and digits; everything else separates tokens
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+
+def comment_tokens(comments: str) -> Set[str]:
+    """
+    Split a comment into the tokens the full-text index stores for it.
+
+    Mirrors the FTS5 unicode61 tokenizer: runs of letters and digits,
+    case-folded and without diacritics.
+
+    Args:
+        comments: Comment text
+
+    Returns:
+        Distinct tokens of the comment
+    """
+    text = unicodedata.normalize("NFKD", comments.lower())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return set(TOKEN_PATTERN.findall(text))
+
+
+def refresh_comment_tokens(db: Session) -> bool:
+    """
+    Recount the comment token facet if comments changed since it was counted.
+
+    Reads the full-text index vocabulary once rather than the castings
+    table. The caller commits.
+
+    Returns:
+        Whether the counts were stale and have been recounted
+    """
+    connection = db.connection()
+    stale = connection.exec_driver_sql(
+        "SELECT 1 FROM casting_facets WHERE facet = ? AND value = ?",
+        (FACET_STALE, FACET_COMMENT_TOKEN),
+    ).first()
+    if stale is None:
+        return False
+
+    for statement in COMMENT_TOKEN_FACETS_SQL:
+        connection.exec_driver_sql(statement)
+    return True
+
+
+def rebuild_facets(db: Session):
+    """Recount every facet from the castings table. The caller commits."""
+    connection = db.connection()
+    for statement in CASTING_FACETS_REBUILD_SQL:
+        connection.exec_driver_sql(statement)
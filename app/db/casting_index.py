@@ -0,0 +1,160 @@
+import hashlib
+import json
+import threading
+from bisect import bisect_left
+from typing import Dict, List, NamedTuple, Optional
+
+from sqlalchemy.orm import Session
+
+from app.db.database import SessionLocal
+from app.models.casting import Casting as CastingModel
+
+
+def casting_to_dict(casting: CastingModel) -> Dict:
+    """Convert a casting ORM object into a plain dictionary."""
+    return {
+        column.name: getattr(casting, column.name)
+        for column in CastingModel.__table__.columns
+    }
+
+
+def dataset_version(by_casting: Dict[str, Dict]) -> str:
+    """
+    Compute a content hash of the castings, used as the dataset version.
+
+    Args:
+        by_casting: Castings keyed by casting number
+
+    Returns:
+        Hex digest that changes whenever any casting changes
+    """
+    hasher = hashlib.sha256()
+    for casting_number in sorted(by_casting):
+        row = json.dumps(by_casting[casting_number], sort_keys=True, default=str)
+        hasher.update(row.encode("utf-8"))
+        hasher.update(b"\n")
+    return hasher.hexdigest()[:32]
+
+
+class _Snapshot(NamedTuple):
+    by_casting: Dict[str, Dict]
+    sorted_castings: List[str]
+    version: str
+
+
+class CastingIndex:
+    """
+    In-process index of the castings table keyed by casting number.
+
+    The whole table is small enough to keep in memory, so exact lookups can
+    be served without opening a database session. A sorted list of casting
+    numbers is kept alongside the mapping for prefix searches, together
+    with a content hash of the snapshot that identifies the dataset
+    version. The index is rebuilt by loading a fresh snapshot and swapping
+    it in with a single assignment, so readers always see either the old
+    or the new snapshot.
+    """
+
+    def __init__(self):
+        self._snapshot: Optional[_Snapshot] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the index has been loaded."""
+        return self._snapshot is not None
+
+    @property
+    def version(self) -> Optional[str]:
+        """Content hash of the loaded dataset, or None if not loaded."""
+        snapshot = self._snapshot
+        return snapshot.version if snapshot is not None else None
+
+    def __len__(self) -> int:
+        return len(self._snapshot.by_casting) if self._snapshot is not None else 0
+
+    def load(self, db: Optional[Session] = None) -> int:
+        """
+        Load (or reload) the index from the database.
+
+        Args:
+            db: Database session to read from. A new session is opened if
+                not provided.
+
+        Returns:
+            Number of castings in the index
+        """
+        owns_session = db is None
+        if owns_session:
+            db = SessionLocal()
+
+        try:
+            with self._lock:
+                by_casting = {
+                    str(casting.casting): casting_to_dict(casting)
+                    for casting in db.query(CastingModel).all()
+                }
+                # Swap in the new snapshot atomically
+                self._snapshot = _Snapshot(
+                    by_casting, sorted(by_casting), dataset_version(by_casting)
+                )
+        finally:
+            if owns_session:
+                db.close()
+
+        return len(by_casting)
+
+    def rebuild(self, db: Optional[Session] = None) -> int:
+        """Rebuild the index after the castings table has changed."""
+        return self.load(db)
+
+    def clear(self):
+        """Drop the index so lookups fall back to the database."""
+        with self._lock:
+            self._snapshot = None
+
+    def get(self, casting_id: str) -> Optional[Dict]:
+        """
+        Look up a casting by its casting number.
+
+        Args:
+            casting_id: Casting number to look up
+
+        Returns:
+            Casting data, or None if not found
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        return snapshot.by_casting.get(casting_id)
+
+    def search_prefix(self, prefix: str, limit: int = 100) -> List[Dict]:
+        """
+        Find castings whose casting number starts with a prefix.
+
+        Args:
+            prefix: Leading digits of the casting number
+            limit: Maximum number of castings to return
+
+        Returns:
+            Matching castings ordered by casting number
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return []
+
+        by_casting, sorted_castings, _ = snapshot
+        results = []
+        position = bisect_left(sorted_castings, prefix)
+        while position < len(sorted_castings) and len(results) < limit:
+            casting_number = sorted_castings[position]
+            if not casting_number.startswith(prefix):
+                break
+            results.append(by_casting[casting_number])
+            position += 1
+
+        return results
+
+
+# Shared index used by the API
+casting_index = CastingIndex()
@@ -1,9 +1,20 @@
+import os
+
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+# SQLite database file, e.g. a generated catalog for benchmarks and load tests
+DATABASE_PATH = os.getenv("CASTING_DB_PATH", "./castings.db")
+
 # SQLite database URL
-SQLALCHEMY_DATABASE_URL = "sqlite:///./castings.db"
+SQLALCHEMY_DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
+
+# SQLite database URL for the asyncio driver (requires aiosqlite)
+SQLALCHEMY_ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///{DATABASE_PATH}"
+
+# Database access mode for the API endpoints: "sync" or "async"
+DATABASE_MODE = os.getenv("CASTING_DB_MODE", "sync")
 
 # Create SQLAlchemy engine
 engine = create_engine(
@@ -16,6 +27,10 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Create Base class
 Base = declarative_base()
 
+# Asyncio engine and session factory, created on first use
+async_engine = None
+AsyncSessionLocal = None
+
 
 # Dependency to get DB session
 def get_db():
@@ -24,3 +39,24 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_async_sessionmaker():
+    """Create the asyncio engine and session factory on first use."""
+    global async_engine, AsyncSessionLocal
+
+    if AsyncSessionLocal is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        async_engine = create_async_engine(SQLALCHEMY_ASYNC_DATABASE_URL)
+        AsyncSessionLocal = async_sessionmaker(
+            async_engine, autoflush=False, expire_on_commit=False
+        )
+
+    return AsyncSessionLocal
+
+
+# Dependency to get an asyncio DB session
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
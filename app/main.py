@@ -1,20 +1,59 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import APIRouter, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
-from app.api.endpoints import casting
-from app.db.database import engine
+from app.api.caching import DatasetETagMiddleware, dataset_version
+from app.api.endpoints import casting, casting_async
+from app.api.metrics import MetricsMiddleware, instrument_engine, metrics
+from app.api.queries import statement_cache
+from app.api.slow_queries import slow_query_log
+from app.db.casting_index import casting_index
+from app.db import database
+from app.db.database import DATABASE_MODE, engine
 from app.models import casting as casting_models
 
 # Create database tables
 casting_models.Base.metadata.create_all(bind=engine)
 
+# Count and time the queries of every request for /metrics, and log slow
+# queries when CASTING_SLOW_QUERY_MS is set
+engines = [engine]
+if DATABASE_MODE == "async":
+    database.get_async_sessionmaker()
+    engines.append(database.async_engine.sync_engine)
+
+for instrumented_engine in engines:
+    instrument_engine(instrumented_engine)
+    slow_query_log.instrument(instrumented_engine)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Load the in-memory casting index on startup.
+    """
+    casting_index.load()
+    yield
+    casting_index.clear()
+    dataset_version.close()
+
+    if database.async_engine is not None:
+        await database.async_engine.dispose()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Casting Number Lookup API",
     description="API for looking up casting numbers and their associated data",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
+# Add dataset-versioned ETags and 304 responses to casting GET requests
+app.add_middleware(DatasetETagMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -22,14 +61,40 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allows all methods
     allow_headers=["*"],  # Allows all headers
+    expose_headers=["X-Next-Cursor", "Link", "ETag"],  # Pagination and caching headers
 )
 
-# Include routers
-app.include_router(
-    casting.router,
-    prefix="/api/castings",
-    tags=["castings"],
-)
+# Record request metrics outside every other middleware, so 304 responses
+# and CORS preflight requests are measured too
+app.add_middleware(MetricsMiddleware)
+
+def include_casting_routes(target: FastAPI, database_mode: str):
+    """
+    Include the casting endpoints in an app.
+
+    In async mode the async list, lookup and search endpoints replace the
+    sync endpoints for the same paths and methods; only the sync endpoints
+    without an async version are included alongside them.
+    """
+    routers = [casting.router]
+    if database_mode == "async":
+        overridden = {
+            (route.path, method)
+            for route in casting_async.router.routes
+            for method in route.methods
+        }
+        sync_router = APIRouter()
+        sync_router.routes.extend(
+            route for route in casting.router.routes
+            if not any((route.path, method) in overridden for method in route.methods)
+        )
+        routers = [casting_async.router, sync_router]
+
+    for router in routers:
+        target.include_router(router, prefix="/api/castings", tags=["castings"])
+
+
+include_casting_routes(app, DATABASE_MODE)
 
 
 @app.get("/")
@@ -43,6 +108,25 @@ def read_root():
     }
 
 
+@app.get("/stats/statements")
+def get_statement_cache_stats():
+    """
+    Report how often the cached SQL statements are reused.
+    """
+    return statement_cache.stats()
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def get_metrics():
+    """
+    Expose request, latency and database metrics in the Prometheus text format.
+    """
+    return PlainTextResponse(
+        metrics.render(),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import DDL, Column, Index, Integer, String, column, event, table
 
 from app.db.database import Base
 
@@ -7,12 +7,245 @@ class Casting(Base):
     """SQLAlchemy model for Chevrolet casting data."""
     
     __tablename__ = "castings"
+    __table_args__ = (
+        Index("ix_castings_year_range", "start_year", "end_year"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     years = Column(String, index=True, nullable=True)  # e.g., "1980-85"
+    start_year = Column(Integer, nullable=True)  # Parsed from years, e.g., 1980
+    end_year = Column(Integer, nullable=True)  # Parsed from years, e.g., 1985
     casting = Column(String, unique=True, index=True, nullable=False)  # Casting number
     cid = Column(Integer, nullable=True)  # Cubic Inch Displacement
     low_power = Column(String, nullable=True)  # Some values are "-"
     high_power = Column(String, nullable=True)  # Some values are "-"
     main_caps = Column(String, nullable=True)  # Some values are "-"
     comments = Column(String, nullable=True)
+    row_hash = Column(String(32), nullable=True)  # Content hash of the imported row, used by sync
+
+
+# SQLite FTS5 index over castings.comments. It is an external content table,
+# so only the inverted index is stored; triggers keep it in sync with every
+# insert, update and delete on the castings table.
+castings_fts = table(
+    "castings_fts",
+    column("rowid"),
+    column("castings_fts"),
+    column("rank"),
+)
+
+CASTINGS_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE castings_fts USING fts5(
+        comments, content='castings', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER castings_fts_insert AFTER INSERT ON castings BEGIN
+        INSERT INTO castings_fts(rowid, comments) VALUES (new.id, new.comments);
+    END
+    """,
+    """
+    CREATE TRIGGER castings_fts_delete AFTER DELETE ON castings BEGIN
+        INSERT INTO castings_fts(castings_fts, rowid, comments)
+        VALUES ('delete', old.id, old.comments);
+    END
+    """,
+    """
+    CREATE TRIGGER castings_fts_update AFTER UPDATE OF comments ON castings BEGIN
+        INSERT INTO castings_fts(castings_fts, rowid, comments)
+        VALUES ('delete', old.id, old.comments);
+        INSERT INTO castings_fts(rowid, comments) VALUES (new.id, new.comments);
+    END
+    """,
+]
+
+# fts5vocab table over the full-text index: per token, the number of
+# castings containing it
+castings_fts_vocab = table(
+    "castings_fts_vocab",
+    column("term"),
+    column("doc"),
+    column("cnt"),
+)
+
+CASTINGS_FTS_DDL += [
+    "CREATE VIRTUAL TABLE castings_fts_vocab USING fts5vocab(castings_fts, row)",
+]
+
+# Summary table of casting counts per facet value, e.g. ("cid", 350, 27),
+# so facet counts never need a GROUP BY over the castings table. Triggers
+# keep the cid, main_caps and decade counts and the single "total" row up
+# to date on every insert, update and delete; NULL values are not counted.
+# Comment token counts are copied from the full-text index vocabulary
+# instead, as SQL cannot tokenize: the triggers only add a "stale" row
+# when comments change, and the import scripts recount them at the end of
+# each import or sync (see app.db.casting_facets).
+casting_facets = table(
+    "casting_facets",
+    column("facet"),
+    column("value"),
+    column("count"),
+)
+
+# SQL expression of each facet counted by the triggers, for a row alias
+FACET_EXPRESSIONS = {
+    "cid": "{row}.cid",
+    "main_caps": "{row}.main_caps",
+    "decade": "{row}.start_year / 10 * 10",  # Decade production started
+}
+FACET_TOTAL = "total"
+FACET_COMMENT_TOKEN = "comment_token"
+FACET_STALE = "stale"
+
+
+def _facet_items(row: str):
+    items = [
+        (facet, expression.format(row=row))
+        for facet, expression in FACET_EXPRESSIONS.items()
+    ]
+    return items + [(FACET_TOTAL, "'castings'")]
+
+
+def _count_facets_sql(row: str) -> str:
+    return "\n".join(
+        f"""
+        INSERT INTO casting_facets (facet, value, count)
+        SELECT '{facet}', {value}, 1 WHERE {value} IS NOT NULL
+        ON CONFLICT (facet, value) DO UPDATE SET count = count + 1;
+        """
+        for facet, value in _facet_items(row)
+    )
+
+
+def _uncount_facets_sql(row: str) -> str:
+    return "\n".join(
+        f"""
+        UPDATE casting_facets SET count = count - 1
+        WHERE facet = '{facet}' AND value = {value};
+        DELETE FROM casting_facets
+        WHERE facet = '{facet}' AND value = {value} AND count <= 0;
+        """
+        for facet, value in _facet_items(row)
+    )
+
+
+def _mark_tokens_stale_sql(row: str) -> str:
+    return f"""
+        INSERT INTO casting_facets (facet, value, count)
+        SELECT '{FACET_STALE}', '{FACET_COMMENT_TOKEN}', 1 WHERE {row}.comments IS NOT NULL
+        ON CONFLICT (facet, value) DO NOTHING;
+    """
+
+
+CASTING_FACETS_DDL = [
+    """
+    CREATE TABLE casting_facets (
+        facet TEXT NOT NULL,
+        value NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (facet, value)
+    ) WITHOUT ROWID
+    """,
+    f"""
+    CREATE TRIGGER casting_facets_insert AFTER INSERT ON castings BEGIN
+        {_count_facets_sql("new")}
+        {_mark_tokens_stale_sql("new")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER casting_facets_delete AFTER DELETE ON castings BEGIN
+        {_uncount_facets_sql("old")}
+        {_mark_tokens_stale_sql("old")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER casting_facets_update AFTER UPDATE OF cid, main_caps, start_year ON castings BEGIN
+        {_uncount_facets_sql("old")}
+        {_count_facets_sql("new")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER casting_facets_update_comments AFTER UPDATE OF comments ON castings BEGIN
+        {_mark_tokens_stale_sql("old")}
+        {_mark_tokens_stale_sql("new")}
+    END
+    """,
+]
+
+# Recount the comment tokens from the full-text index vocabulary
+COMMENT_TOKEN_FACETS_SQL = [
+    f"DELETE FROM casting_facets WHERE facet IN ('{FACET_COMMENT_TOKEN}', '{FACET_STALE}')",
+    f"""
+    INSERT INTO casting_facets (facet, value, count)
+    SELECT '{FACET_COMMENT_TOKEN}', term, doc FROM castings_fts_vocab WHERE doc > 0
+    """,
+]
+
+# Recount the whole summary, e.g. after a bulk load without triggers
+CASTING_FACETS_REBUILD_SQL = ["DELETE FROM casting_facets"] + [
+    f"""
+    INSERT INTO casting_facets (facet, value, count)
+    SELECT '{facet}', {value}, COUNT(*) FROM castings
+    WHERE {value} IS NOT NULL GROUP BY {value}
+    """
+    for facet, value in _facet_items("castings")
+] + COMMENT_TOKEN_FACETS_SQL
+
+# Version of the castings data, shared by every process using the database.
+# The epoch is random per table creation, so a dropped and reloaded database
+# never repeats an earlier version; triggers bump the counter on every
+# insert, update and delete.
+dataset_version = table(
+    "dataset_version",
+    column("epoch"),
+    column("counter"),
+)
+
+DATASET_VERSION_DDL = [
+    "CREATE TABLE dataset_version (epoch TEXT NOT NULL, counter INTEGER NOT NULL)",
+    "INSERT INTO dataset_version (epoch, counter) VALUES (lower(hex(randomblob(8))), 0)",
+] + [
+    f"""
+    CREATE TRIGGER dataset_version_{operation.lower()} AFTER {operation} ON castings BEGIN
+        UPDATE dataset_version SET counter = counter + 1;
+    END
+    """
+    for operation in ("INSERT", "UPDATE", "DELETE")
+]
+
+for statement in CASTINGS_FTS_DDL + CASTING_FACETS_DDL + DATASET_VERSION_DDL:
+    event.listen(
+        Casting.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="sqlite"),
+    )
+
+for name in (
+    "castings_fts_vocab",
+    "castings_fts",
+    "casting_facets",
+    "dataset_version",
+):
+    event.listen(
+        Casting.__table__,
+        "before_drop",
+        DDL(f"DROP TABLE IF EXISTS {name}").execute_if(dialect="sqlite"),
+    )
+
+
+def fts_match_query(text: str) -> str:
+    """
+    Build an FTS5 query that matches every word in the text as a prefix.
+    
+    Each word is quoted so punctuation such as the dash in "Z-28" is
+    treated as part of a phrase rather than FTS5 query syntax.
+    
+    Args:
+        text: Search text entered by the user
+        
+    Returns:
+        FTS5 MATCH expression
+    """
+    words = text.split()
+    return " ".join('"{}"*'.format(word.replace('"', '""')) for word in words)
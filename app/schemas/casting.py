@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Dict, List, Optional, Union
 
 from pydantic import BaseModel, Field
 
@@ -35,6 +35,8 @@ class CastingInDB(CastingBase):
     """Schema for casting data in the database."""
     
     id: int
+    start_year: Optional[int] = Field(None, description="First production year parsed from years")
+    end_year: Optional[int] = Field(None, description="Last production year parsed from years")
 
     class Config:
         orm_mode = True
@@ -43,3 +45,43 @@ class CastingInDB(CastingBase):
 class Casting(CastingInDB):
     """Schema for casting data returned by the API."""
     pass
+
+
+class CastingBatchRequest(BaseModel):
+    """Schema for looking up many castings at once."""
+    
+    castings: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=5000,
+        description="Casting numbers to look up"
+    )
+
+
+class CastingBatchResponse(BaseModel):
+    """Schema for the result of a batch lookup."""
+    
+    found: List[Casting] = Field(..., description="Castings that were found, in request order")
+    missing: List[str] = Field(..., description="Casting numbers that were not found")
+
+
+class FacetCount(BaseModel):
+    """Schema for the number of castings with one facet value."""
+    
+    value: Union[int, str] = Field(..., description="Facet value, e.g. a CID or a comment token")
+    count: int = Field(..., description="Number of castings with this value")
+
+
+class CastingFacets(BaseModel):
+    """Schema for casting counts per facet."""
+    
+    total: int = Field(..., description="Number of castings counted")
+    source: str = Field(..., description="'summary' for the precomputed counts, 'query' for filtered requests")
+    stale: bool = Field(
+        False,
+        description="Comment token counts predate the latest comment changes; the next import or sync recounts them"
+    )
+    facets: Dict[str, List[FacetCount]] = Field(
+        ...,
+        description="Most common values per facet: cid, main_caps, decade and comment_token"
+    )
@@ -0,0 +1,461 @@
+import argparse
+import csv
+import math
+import os
+import random
+import re
+import sqlite3
+import sys
+import time
+from bisect import bisect_right
+from collections import Counter, defaultdict, deque
+from itertools import accumulate
+from typing import Dict, Hashable, Iterable, Iterator, Optional, Sequence, Tuple
+
+from sqlalchemy import create_engine
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from app.models import casting as casting_models
+from app.utils.import_data import (
+    CASTING_COLUMNS,
+    CHEV_COLUMN_MAPPING,
+    INSERT_SQL,
+    NULL_VALUES,
+    YEARS_PATTERN,
+    clean_data,
+    parse_years,
+)
+
+# Start years are moved by up to this many years, so generated catalogs
+# have more year ranges than the source file
+YEAR_JITTER = 2
+
+# Separators between the phrases of a comment, e.g. "car, truck & marine"
+COMMENT_SEPARATOR_PATTERN = re.compile(r"(\s*[,&/]\s*)")
+
+# Marks a comment with text in the distribution of comment kinds
+COMMENT_TEXT = object()
+
+
+class Distribution:
+    """Empirical distribution of observed values, sampled by frequency."""
+
+    def __init__(self, counts: Dict[Hashable, int]):
+        if not counts:
+            raise ValueError("Cannot build a distribution from no observations")
+        self.values = list(counts)
+        self.cum_weights = list(accumulate(counts.values()))
+        self.total = self.cum_weights[-1]
+
+    @classmethod
+    def of(cls, values: Iterable[Hashable]) -> "Distribution":
+        return cls(Counter(values))
+
+    def sample(self, rng: random.Random):
+        return self.values[bisect_right(self.cum_weights, rng.random() * self.total)]
+
+
+class CatalogModel:
+    """
+    Field distributions learned from a casting CSV file.
+
+    CID values follow the source frequencies. Year ranges, power ratings
+    and main caps are sampled from the rows with the same CID, so engines
+    keep their production periods, and year ranges keep their format
+    ("1969", "1968-73" or "1968-1973"). Comments are rebuilt from the
+    phrases and separators of the source comments. Placeholder values such
+    as "-" and "_" appear as often as in the source.
+    """
+
+    def __init__(self, records: Sequence[Dict[str, str]]):
+        if not records:
+            raise ValueError("No records to learn from")
+
+        self.casting_lengths = Distribution.of(len(record["casting"]) for record in records)
+        self.cids = Distribution.of(record["cid"] for record in records)
+
+        by_cid = defaultdict(list)
+        for record in records:
+            by_cid[record["cid"]].append(record)
+
+        self.years_by_cid = {
+            cid: Distribution.of(self.years_shape(record["years"]) for record in group)
+            for cid, group in by_cid.items()
+        }
+        self.power_by_cid = {
+            cid: Distribution.of((record["low_power"], record["high_power"]) for record in group)
+            for cid, group in by_cid.items()
+        }
+        self.main_caps_by_cid = {
+            cid: Distribution.of(record["main_caps"] for record in group)
+            for cid, group in by_cid.items()
+        }
+
+        start_years = [parse_years(record["years"])[0] for record in records]
+        start_years = [year for year in start_years if year is not None]
+        self.first_year = min(start_years, default=None)
+        self.last_year = max(start_years, default=None)
+
+        # Comments: placeholder or text, then phrases joined by separators
+        self.comment_kinds = Distribution.of(
+            record["comments"] if record["comments"] in NULL_VALUES else COMMENT_TEXT
+            for record in records
+        )
+        phrase_counts, phrases, separators = Counter(), Counter(), Counter()
+        for record in records:
+            if record["comments"] in NULL_VALUES:
+                continue
+            parts = COMMENT_SEPARATOR_PATTERN.split(record["comments"].strip())
+            phrase_counts[len(parts[::2])] += 1
+            phrases.update(part for part in parts[::2] if part)
+            separators.update(parts[1::2])
+        self.comment_phrase_counts = Distribution(phrase_counts) if phrase_counts else None
+        self.comment_phrases = Distribution(phrases) if phrases else None
+        self.comment_separators = Distribution(separators or {", ": 1})
+
+    @classmethod
+    def from_csv(
+        cls,
+        file_path: str,
+        column_mapping: Optional[Dict[str, str]] = CHEV_COLUMN_MAPPING
+    ) -> "CatalogModel":
+        """
+        Learn the distributions of a CSV file.
+
+        Args:
+            file_path: Path to the CSV file, e.g. chev-casting.csv
+            column_mapping: Mapping from CSV columns to database columns
+
+        Returns:
+            The learned model
+        """
+        column_mapping = column_mapping or {}
+        records = []
+        with open(file_path, "r", encoding="utf-8-sig", newline="") as f:
+            for row in csv.DictReader(f):
+                record = {
+                    column_mapping.get(key, key): (value or "").strip()
+                    for key, value in row.items()
+                    if key
+                }
+                if record.get("casting"):
+                    records.append({
+                        column: record.get(column, "") for column in CHEV_COLUMN_MAPPING.values()
+                    })
+        return cls(records)
+
+    @staticmethod
+    def years_shape(years: str) -> Tuple:
+        """
+        Describe a years value as (format, start year, span).
+
+        Values that are not year ranges are kept as ("literal", value, 0).
+        """
+        match = YEARS_PATTERN.match(years)
+        if not match:
+            return "literal", years, 0
+
+        start_year, end_year = parse_years(years)
+        end = match.group(2)
+        if end is None:
+            year_format = "single"
+        elif len(end) == 2:
+            year_format = "short"
+        else:
+            year_format = "long"
+        return year_format, start_year, end_year - start_year
+
+    def sample_years(self, rng: random.Random, cid: str) -> str:
+        year_format, start_year, span = self.years_by_cid[cid].sample(rng)
+        if year_format == "literal":
+            return start_year
+
+        start_year = min(
+            max(start_year + rng.randint(-YEAR_JITTER, YEAR_JITTER), self.first_year),
+            self.last_year
+        )
+        end_year = start_year + span
+        if year_format == "single":
+            return str(start_year)
+        if year_format == "short":
+            return f"{start_year}-{end_year % 100:02d}"
+        return f"{start_year}-{end_year}"
+
+    def sample_comment(self, rng: random.Random) -> str:
+        kind = self.comment_kinds.sample(rng)
+        if kind is not COMMENT_TEXT:
+            return kind
+
+        count = self.comment_phrase_counts.sample(rng)
+        phrases = []
+        # Draw a few times to avoid repeating a phrase, as in "car, car"
+        for _ in range(count * 3):
+            phrase = self.comment_phrases.sample(rng)
+            if phrase not in phrases:
+                phrases.append(phrase)
+            if len(phrases) == count:
+                break
+
+        comment = phrases[0]
+        for phrase in phrases[1:]:
+            comment += self.comment_separators.sample(rng) + phrase
+        return comment
+
+    def sample(self, rng: random.Random) -> Dict[str, str]:
+        """
+        Sample one record, without a casting number.
+
+        Returns:
+            Raw CSV values keyed by database column
+        """
+        cid = self.cids.sample(rng)
+        low_power, high_power = self.power_by_cid[cid].sample(rng)
+        return {
+            "years": self.sample_years(rng, cid),
+            "cid": cid,
+            "low_power": low_power,
+            "high_power": high_power,
+            "main_caps": self.main_caps_by_cid[cid].sample(rng),
+            "comments": self.sample_comment(rng),
+        }
+
+
+class CastingNumbers:
+    """
+    Unique casting numbers of the learned lengths, in a seeded order.
+
+    Numbers of each length are a permutation of all numbers of that length
+    (index * multiplier + offset modulo the number of values), so no set of
+    issued numbers has to be kept. The multiplier is coprime with the number
+    of values and close to its golden ratio, which spreads consecutive
+    numbers over the whole range. When a length runs out, the next longer
+    length is used.
+    """
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        self.issued = defaultdict(int)
+        self.permutations = {}
+
+    def permutation(self, size: int) -> Tuple[int, int]:
+        multiplier = int(size * 0.6180339887) | 1
+        while math.gcd(multiplier, size) != 1:
+            multiplier += 2
+        return multiplier, self.rng.randrange(size)
+
+    def next(self, length: int) -> str:
+        while self.issued[length] >= 9 * 10 ** (length - 1):
+            length += 1
+
+        size = 9 * 10 ** (length - 1)
+        if length not in self.permutations:
+            self.permutations[length] = self.permutation(size)
+        multiplier, offset = self.permutations[length]
+
+        index = self.issued[length]
+        self.issued[length] += 1
+        return str(10 ** (length - 1) + (index * multiplier + offset) % size)
+
+
+def generate_records(
+    model: CatalogModel,
+    rows: int,
+    seed: int = 0,
+    duplicates: float = 0.0
+) -> Iterator[Dict[str, str]]:
+    """
+    Generate casting records.
+
+    The same model, seed and arguments always generate the same records.
+
+    Args:
+        model: Learned field distributions
+        rows: Number of records to generate
+        seed: Random seed
+        duplicates: Fraction of records that repeat a recent casting number
+            with other values, like the duplicate rows of chev-casting.csv
+
+    Yields:
+        Raw CSV values keyed by database column
+    """
+    rng = random.Random(seed)
+    numbers = CastingNumbers(random.Random(seed + 1))
+    recent = deque(maxlen=1000)
+
+    for _ in range(rows):
+        record = model.sample(rng)
+        if recent and rng.random() < duplicates:
+            record["casting"] = rng.choice(recent)
+        else:
+            record["casting"] = numbers.next(model.casting_lengths.sample(rng))
+            recent.append(record["casting"])
+        yield record
+
+
+def write_csv(
+    records: Iterable[Dict[str, str]],
+    file_path: str,
+    column_mapping: Dict[str, str] = CHEV_COLUMN_MAPPING
+) -> int:
+    """
+    Write records in the chev-casting.csv format, trailing comma included.
+
+    Returns:
+        Number of records written
+    """
+    header = list(column_mapping) + [""]
+    columns = list(column_mapping.values())
+    count = 0
+    with open(file_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(header)
+        for record in records:
+            writer.writerow([record[column] for column in columns] + [""])
+            count += 1
+    return count
+
+
+def write_sqlite(
+    records: Iterable[Dict[str, str]],
+    file_path: str,
+    batch_size: int = 10000
+) -> int:
+    """
+    Write records to a new SQLite database with the API's schema.
+
+    Records are cleaned like the importers clean them, so the database is
+    the same as importing the equivalent CSV. A repeated casting number
+    keeps its first record, as with sync_csv.
+
+    Returns:
+        Number of castings written
+    """
+    # Create the tables, indexes and full-text index the API expects
+    schema_engine = create_engine(f"sqlite:///{file_path}")
+    casting_models.Base.metadata.create_all(bind=schema_engine)
+    schema_engine.dispose()
+
+    insert_sql = INSERT_SQL.replace("INSERT INTO", "INSERT OR IGNORE INTO", 1)
+    connection = sqlite3.connect(file_path)
+    try:
+        # A new file: nothing to protect until it is complete
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+
+        # Build the secondary indexes, the full-text index and the facet
+        # summary once at the end instead of updating them for every row.
+        # The unique casting index stays, as it drops repeated casting
+        # numbers.
+        deferred = connection.execute(
+            "SELECT type, name, sql FROM sqlite_master "
+            "WHERE tbl_name = 'castings' AND sql IS NOT NULL "
+            "AND (type = 'trigger' OR (type = 'index' AND sql NOT LIKE 'CREATE UNIQUE%'))"
+        ).fetchall()
+        for object_type, name, _ in deferred:
+            connection.execute(f"DROP {object_type.upper()} {name}")
+
+        batch = []
+        for record in records:
+            cleaned = clean_data(record)
+            batch.append(tuple(cleaned.get(column) for column in CASTING_COLUMNS))
+            if len(batch) >= batch_size:
+                connection.executemany(insert_sql, batch)
+                batch = []
+        if batch:
+            connection.executemany(insert_sql, batch)
+
+        for _, _, sql in deferred:
+            connection.execute(sql)
+        connection.execute("INSERT INTO castings_fts(castings_fts) VALUES ('rebuild')")
+        for statement in casting_models.CASTING_FACETS_REBUILD_SQL:
+            connection.execute(statement)
+        connection.commit()
+
+        count = connection.execute("SELECT COUNT(*) FROM castings").fetchone()[0]
+        connection.execute("ANALYZE")
+    finally:
+        connection.close()
+    return count
+
+
+def output_format(file_path: str, requested: Optional[str]) -> str:
+    """Return the requested format, or the one implied by the file extension."""
+    if requested:
+        return requested
+    extension = os.path.splitext(file_path)[1].lower()
+    return "sqlite" if extension in (".db", ".sqlite", ".sqlite3") else "csv"
+
+
+def main():
+    """Main function."""
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description="Generate a synthetic casting catalog")
+    parser.add_argument("output", help="CSV or SQLite file to write")
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=100000,
+        help="Number of castings to generate (default: 100000)"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Random seed; the same seed generates the same catalog (default: 0)"
+    )
+    parser.add_argument(
+        "--source",
+        default="chev-casting.csv",
+        help="CSV file to learn the field distributions from (default: chev-casting.csv)"
+    )
+    parser.add_argument(
+        "--format",
+        choices=["csv", "sqlite"],
+        default=None,
+        help="Output format (default: sqlite for .db/.sqlite files, csv otherwise)"
+    )
+    parser.add_argument(
+        "--duplicates",
+        type=float,
+        default=0.0,
+        help="Fraction of rows repeating an earlier casting number (default: 0)"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=10000,
+        help="Number of rows inserted at once into a SQLite file (default: 10000)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Overwrite the output file if it exists"
+    )
+    args = parser.parse_args()
+
+    if os.path.exists(args.output):
+        if not args.force:
+            print(f"{args.output} already exists; use --force to overwrite it")
+            sys.exit(1)
+        os.remove(args.output)
+
+    model = CatalogModel.from_csv(args.source)
+    records = generate_records(model, args.rows, seed=args.seed, duplicates=args.duplicates)
+
+    started = time.perf_counter()
+    if output_format(args.output, args.format) == "sqlite":
+        count = write_sqlite(records, args.output, batch_size=args.batch_size)
+    else:
+        count = write_csv(records, args.output)
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"Wrote {count} castings to {args.output} in {elapsed:.1f} seconds "
+        f"({count / elapsed:.0f} rows/sec)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,209 @@
 import argparse
 import csv
+import hashlib
+import io
+import json
 import os
+import queue
+import re
+import sqlite3
 import sys
-from typing import Dict, List, Optional, Union
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
 import pandas as pd
+from sqlalchemy import bindparam, delete, insert, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 # Add parent directory to path to allow imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
+from app.db.casting_facets import refresh_comment_tokens
 from app.db.database import SessionLocal, engine
 from app.models.casting import Casting as CastingModel
 from app.models import casting as casting_models
 
 
+# Matches "1955", "1980-85" and "1980-1985"
+YEARS_PATTERN = re.compile(r"^\s*(\d{4})\s*(?:-\s*(\d{4}|\d{2}))?\s*$")
+
+# Column mapping for the Chevrolet casting data CSV format
+CHEV_COLUMN_MAPPING = {
+    "Years": "years",
+    "Casting": "casting",
+    "CID": "cid",
+    "Low Power": "low_power",
+    "High Power": "high_power",
+    "Main Caps": "main_caps",
+    "Comments": "comments"
+}
+
+# Columns written by the Core import engine (everything but the id)
+CASTING_COLUMNS = [
+    column.name for column in CastingModel.__table__.columns if column.name != "id"
+]
+
+# Position of the casting number in insert parameter tuples
+CASTING_POSITION = CASTING_COLUMNS.index("casting")
+
+# Columns covered by the row hash (everything the CSV determines)
+HASHED_COLUMNS = [column for column in CASTING_COLUMNS if column != "row_hash"]
+
+# Values that mean "no data" in any column
+NULL_VALUES = ("", "-")
+
+# Stray placeholder tokens that also mean "no data" in the power columns
+POWER_NULL_VALUES = ("_",)
+POWER_COLUMNS = ("low_power", "high_power")
+
+# Raw DBAPI statements taking parameter tuples in CASTING_COLUMNS order
+INSERT_SQL = (
+    f"INSERT INTO {CastingModel.__tablename__} ({', '.join(CASTING_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in CASTING_COLUMNS)})"
+)
+UPSERT_SQL = INSERT_SQL + " ON CONFLICT(casting) DO UPDATE SET " + ", ".join(
+    f"{column} = excluded.{column}" for column in CASTING_COLUMNS if column != "casting"
+)
+
+
 def create_tables():
     """Create database tables."""
     casting_models.Base.metadata.create_all(bind=engine)
 
 
+def parse_years(years) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Parse a production years string into a numeric range.
+    
+    Args:
+        years: Years string such as "1955" or "1980-85"
+        
+    Returns:
+        Tuple of (start_year, end_year), or (None, None) if not parseable
+    """
+    if years is None:
+        return None, None
+    
+    match = YEARS_PATTERN.match(str(years))
+    if not match:
+        return None, None
+    
+    start_year = int(match.group(1))
+    end = match.group(2)
+    if end is None:
+        return start_year, start_year
+    
+    if len(end) == 2:
+        # Two-digit end years are relative to the start year's century
+        end_year = start_year - start_year % 100 + int(end)
+        if end_year < start_year:
+            end_year += 100
+    else:
+        end_year = int(end)
+    
+    return start_year, end_year
+
+
+
+def row_hash(values: List) -> str:
+    """
+    Compute the content hash of a cleaned row.
+    
+    Args:
+        values: Cleaned values in HASHED_COLUMNS order
+        
+    Returns:
+        Hex digest stored in the row_hash column
+    """
+    row = json.dumps(list(values), separators=(",", ":"), default=str)
+    return hashlib.sha256(row.encode("utf-8")).hexdigest()[:32]
+
+
+def parse_cid(cid):
+    """
+    Convert a CID to an integer if it is written as one.
+    
+    Values int() cannot parse, such as "350/400" or "350.0", are kept as
+    they are.
+    """
+    try:
+        return int(cid)
+    except (ValueError, TypeError):
+        return cid
+
+
+def first_rows(rows: List, seen: set) -> List:
+    """
+    Drop rows whose casting number appeared earlier in the same import.
+    
+    Every importer, sync_csv and reset_db let the first row win when a
+    casting number appears more than once, so syncing against the file a
+    database was imported from changes nothing.
+    
+    Args:
+        rows: Cleaned records, or insert parameter tuples in CASTING_COLUMNS order
+        seen: Casting numbers of the earlier rows; updated in place
+        
+    Returns:
+        The rows whose casting number was not seen before
+    """
+    kept = []
+    for row in rows:
+        casting = row.get("casting") if isinstance(row, dict) else row[CASTING_POSITION]
+        if casting in seen:
+            continue
+        seen.add(casting)
+        kept.append(row)
+    return kept
+
+
+def first_rows_on_disk(rows: List[Dict], seen_db: sqlite3.Connection) -> List[Dict]:
+    """
+    Drop rows whose casting number appeared earlier in the same import.
+    
+    Like first_rows, but the casting numbers of the earlier rows are kept
+    in a scratch SQLite database instead of a set, so memory use does not
+    grow with the number of rows imported.
+    
+    Args:
+        rows: Cleaned records
+        seen_db: Scratch database from open_seen_castings; updated in place
+        
+    Returns:
+        The rows whose casting number was not seen before
+    """
+    rows = first_rows(rows, set())
+    castings = json.dumps([row.get("casting") for row in rows])
+    repeated = {
+        casting for (casting,) in seen_db.execute(
+            "SELECT value FROM json_each(?) WHERE value IN (SELECT casting FROM seen)",
+            (castings,)
+        )
+    }
+    rows = [row for row in rows if row.get("casting") not in repeated]
+    seen_db.executemany(
+        "INSERT INTO seen (casting) VALUES (?)",
+        [(row.get("casting"),) for row in rows]
+    )
+    return rows
+
+
+def open_seen_castings() -> sqlite3.Connection:
+    """
+    Open a scratch database for first_rows_on_disk.
+    
+    An empty filename gives a private temporary database that SQLite
+    spills to disk once it outgrows its page cache, and deletes on close.
+    """
+    seen_db = sqlite3.connect("")
+    seen_db.execute("CREATE TABLE seen (casting TEXT PRIMARY KEY) WITHOUT ROWID")
+    return seen_db
+
+
 def clean_data(record: Dict) -> Dict:
     """
     Clean and prepare data for database insertion.
@@ -35,20 +219,85 @@ def clean_data(record: Dict) -> Dict:
     
     # Convert empty strings to None
     for key, value in cleaned.items():
-        if value == "" or value == "-":
+        if value in NULL_VALUES:
+            cleaned[key] = None
+        elif key in POWER_COLUMNS and value in POWER_NULL_VALUES:
             cleaned[key] = None
     
     # Convert CID to integer if possible
     if cleaned.get("cid") and cleaned["cid"] not in (None, "-"):
-        try:
-            cleaned["cid"] = int(cleaned["cid"])
-        except (ValueError, TypeError):
-            # If conversion fails, keep as is
-            pass
+        cleaned["cid"] = parse_cid(cleaned["cid"])
+    
+    # Parse the years string into a numeric range
+    if "years" in cleaned:
+        cleaned["start_year"], cleaned["end_year"] = parse_years(cleaned["years"])
+    
+    # Hash the cleaned row so sync_csv can detect changes
+    cleaned["row_hash"] = row_hash([cleaned.get(column) for column in HASHED_COLUMNS])
     
     return cleaned
 
 
+def clean_dataframe(
+    df: pd.DataFrame,
+    column_mapping: Optional[Dict[str, str]] = None
+) -> List[Tuple]:
+    """
+    Clean a whole DataFrame at once and prepare it for insertion.
+    
+    The vectorised equivalent of calling clean_data on every row, for
+    DataFrames read with dtype=str and keep_default_na=False.
+    
+    Args:
+        df: DataFrame of raw CSV values
+        column_mapping: Mapping from CSV columns to database columns
+        
+    Returns:
+        Insert parameter tuples in CASTING_COLUMNS order
+    """
+    # Drop any unnamed columns, such as the one after a trailing comma
+    df = df.drop(columns=[col for col in df.columns if "Unnamed" in str(col)])
+    
+    # Apply column mapping if provided
+    if column_mapping:
+        df = df.rename(columns=column_mapping)
+    
+    has_years = "years" in df.columns
+    df = df.reindex(columns=CASTING_COLUMNS)
+    
+    # Convert empty strings and placeholder tokens to missing values
+    df = df.replace(list(NULL_VALUES), None)
+    for column in POWER_COLUMNS:
+        df[column] = df[column].replace(list(POWER_NULL_VALUES), None)
+    
+    # Convert CID to integer, keeping values that cannot be converted.
+    # parse_cid runs once per distinct value, so both cleaners agree.
+    cids = df["cid"].dropna().unique()
+    df["cid"] = df["cid"].map({cid: parse_cid(cid) for cid in cids})
+    
+    # Parse the years strings into numeric ranges (see parse_years)
+    if has_years:
+        parts = df["years"].astype("string").str.extract(YEARS_PATTERN.pattern)
+        start_year = pd.to_numeric(parts[0])
+        end_year = pd.to_numeric(parts[1])
+        
+        # Two-digit end years are relative to the start year's century
+        two_digit = parts[1].str.len() == 2
+        relative = start_year - start_year % 100 + end_year
+        relative = relative.where(relative >= start_year, relative + 100)
+        end_year = end_year.where(~two_digit, relative).fillna(start_year)
+        
+        df["start_year"] = start_year.astype("Int64")
+        df["end_year"] = end_year.astype("Int64")
+    
+    df = df.astype(object).where(df.notna(), None)
+    df["row_hash"] = [
+        row_hash(values)
+        for values in df[HASHED_COLUMNS].itertuples(index=False, name=None)
+    ]
+    return list(df.itertuples(index=False, name=None))
+
+
 def import_csv_with_pandas(
     file_path: str,
     db: Session,
@@ -58,6 +307,10 @@ def import_csv_with_pandas(
     """
     Import data from a CSV file using pandas.
     
+    Rows are written with upserts, so casting numbers already in the
+    database update the existing row; within the file the first row of a
+    repeated casting number wins.
+    
     Args:
         file_path: Path to the CSV file
         db: Database session
@@ -67,35 +320,18 @@ def import_csv_with_pandas(
     Returns:
         Number of records imported
     """
-    # Read CSV file
-    df = pd.read_csv(file_path)
+    # Read CSV file, keeping the raw strings for clean_dataframe
+    df = pd.read_csv(file_path, dtype=str, keep_default_na=False)
     
-    # Drop any unnamed columns
-    unnamed_cols = [col for col in df.columns if 'Unnamed' in col]
-    if unnamed_cols:
-        df = df.drop(columns=unnamed_cols)
-        print(f"Dropped unnamed columns: {unnamed_cols}")
-    
-    # Apply column mapping if provided
-    if column_mapping:
-        df = df.rename(columns=column_mapping)
-    
-    # Convert DataFrame to list of dictionaries
-    records = df.to_dict(orient="records")
+    # Clean the whole file at once
+    rows = first_rows(clean_dataframe(df, column_mapping), set())
     
     # Insert records in batches
     total_imported = 0
-    for i in range(0, len(records), batch_size):
-        batch = records[i:i + batch_size]
+    for i in range(0, len(rows), batch_size):
+        batch = rows[i:i + batch_size]
         
-        # Clean data
-        cleaned_batch = [clean_data(record) for record in batch]
-        
-        # Create model instances
-        model_instances = [CastingModel(**record) for record in cleaned_batch]
-        
-        # Add to session
-        db.add_all(model_instances)
+        db.connection().exec_driver_sql(UPSERT_SQL, batch)
         
         # Commit
         db.commit()
@@ -115,6 +351,8 @@ def import_csv_with_csv_reader(
     """
     Import data from a CSV file using csv.DictReader.
     
+    The first row of a repeated casting number wins.
+    
     Args:
         file_path: Path to the CSV file
         db: Database session
@@ -131,6 +369,7 @@ def import_csv_with_csv_reader(
         # Process records in batches
         batch = []
         total_imported = 0
+        seen = set()
         
         for row in reader:
             # Apply column mapping if provided
@@ -144,8 +383,8 @@ def import_csv_with_csv_reader(
             # Clean data
             cleaned_row = clean_data(row)
             
-            # Add to batch
-            batch.append(cleaned_row)
+            # Add to batch, skipping repeated casting numbers
+            batch.extend(first_rows([cleaned_row], seen))
             
             # Process batch if it reaches the batch size
             if len(batch) >= batch_size:
@@ -181,6 +420,293 @@ def import_csv_with_csv_reader(
         return total_imported
 
 
+def column_positions(
+    header: List[str],
+    column_mapping: Optional[Dict[str, str]] = None
+) -> List[Tuple[int, str]]:
+    """
+    Resolve the CSV position of every database column.
+    
+    Args:
+        header: CSV header row
+        column_mapping: Mapping from CSV columns to database columns
+        
+    Returns:
+        List of (CSV column index, database column name)
+    """
+    if column_mapping:
+        return [
+            (header.index(csv_col), db_col)
+            for csv_col, db_col in column_mapping.items()
+            if csv_col in header
+        ]
+    return [(i, name) for i, name in enumerate(header) if name in CASTING_COLUMNS]
+
+
+def iter_csv_chunks(
+    file_path: str,
+    column_mapping: Optional[Dict[str, str]] = None,
+    chunk_size: int = 1000
+) -> Iterator[Tuple[List[Dict], int]]:
+    """
+    Read, map and clean a CSV file in fixed-size chunks.
+    
+    Only one chunk of records is held in memory at a time, so memory use
+    does not depend on the size of the file.
+    
+    Args:
+        file_path: Path to the CSV file
+        column_mapping: Mapping from CSV columns to database columns
+        chunk_size: Number of records per chunk
+        
+    Yields:
+        Tuples of (cleaned records, bytes of the file consumed so far)
+    """
+    with open(file_path, "rb") as raw:
+        # utf-8-sig strips the byte order mark some CSV exports start with
+        text = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+        reader = csv.reader(text)
+        header = next(reader, None)
+        if header is None:
+            return
+        
+        positions = column_positions(header, column_mapping)
+        
+        chunk = []
+        for row in reader:
+            if not row:
+                continue
+            record = {
+                db_col: row[i] if i < len(row) else ""
+                for i, db_col in positions
+            }
+            chunk.append(clean_data(record))
+            
+            if len(chunk) >= chunk_size:
+                yield chunk, raw.tell()
+                chunk = []
+        
+        if chunk:
+            yield chunk, raw.tell()
+
+
+def import_csv_streaming(
+    file_path: str,
+    db: Session,
+    column_mapping: Optional[Dict[str, str]] = None,
+    batch_size: int = 1000
+) -> int:
+    """
+    Import a CSV file of any size with bounded memory.
+    
+    The file is read, cleaned and written one chunk at a time with Core
+    bulk upserts, and progress is reported from the bytes consumed. The
+    casting numbers already imported are kept in a scratch database on
+    disk, so the first row of a repeated casting number wins without
+    holding every casting number in memory.
+    
+    Args:
+        file_path: Path to the CSV file
+        db: Database session
+        column_mapping: Mapping from CSV columns to database columns
+        batch_size: Number of records per chunk
+        
+    Returns:
+        Number of records imported
+    """
+    total_bytes = os.path.getsize(file_path)
+    total_imported = 0
+    last_percent = -1
+    
+    seen_db = open_seen_castings()
+    try:
+        for chunk, bytes_read in iter_csv_chunks(file_path, column_mapping, batch_size):
+            chunk = first_rows_on_disk(chunk, seen_db)
+            upsert_castings(db, chunk)
+            db.commit()
+            total_imported += len(chunk)
+            
+            # Report progress at most once per percent of the file
+            percent = int(bytes_read * 100 / total_bytes) if total_bytes else 100
+            if percent != last_percent:
+                last_percent = percent
+                print(
+                    f"Imported {total_imported} records "
+                    f"({bytes_read}/{total_bytes} bytes, {percent}%)"
+                )
+    finally:
+        seen_db.close()
+    
+    return total_imported
+
+
+def shard_file(file_path: str, shard_bytes: int) -> Tuple[List[str], List[Tuple[int, int]]]:
+    """
+    Split a CSV file into byte ranges that start and end on line breaks.
+    
+    Fields containing line breaks are not supported, since a shard
+    boundary could fall inside one.
+    
+    Args:
+        file_path: Path to the CSV file
+        shard_bytes: Approximate size of each shard in bytes
+        
+    Returns:
+        The CSV header, and a list of (start, end) byte offsets
+    """
+    size = os.path.getsize(file_path)
+    
+    with open(file_path, "rb") as f:
+        header_line = f.readline()
+        data_start = f.tell()
+        
+        boundaries = [data_start]
+        position = data_start + shard_bytes
+        while position < size:
+            # Move the boundary to the start of the next line
+            f.seek(position)
+            f.readline()
+            boundary = f.tell()
+            if boundary >= size:
+                break
+            if boundary > boundaries[-1]:
+                boundaries.append(boundary)
+            position = boundary + shard_bytes
+        boundaries.append(size)
+    
+    header = next(csv.reader([header_line.decode("utf-8-sig")]))
+    shards = [
+        (start, end) for start, end in zip(boundaries, boundaries[1:]) if end > start
+    ]
+    return header, shards
+
+
+def parse_shard(
+    file_path: str,
+    start: int,
+    end: int,
+    positions: List[Tuple[int, str]]
+) -> List[Tuple]:
+    """
+    Parse and clean one byte range of a CSV file.
+    
+    Runs in a worker process of import_csv_parallel.
+    
+    Returns:
+        Insert parameter tuples in CASTING_COLUMNS order
+    """
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8")
+    
+    rows = []
+    for row in csv.reader(io.StringIO(text, newline="")):
+        if not row:
+            continue
+        record = clean_data({
+            db_col: row[i] if i < len(row) else ""
+            for i, db_col in positions
+        })
+        rows.append(tuple(record.get(column) for column in CASTING_COLUMNS))
+    
+    return rows
+
+
+def import_csv_parallel(
+    file_path: str,
+    db: Session,
+    column_mapping: Optional[Dict[str, str]] = None,
+    batch_size: int = 1000,
+    workers: Optional[int] = None,
+    shard_bytes: int = 4 * 1024 * 1024
+) -> int:
+    """
+    Import a CSV file by parsing it in parallel with a single DB writer.
+    
+    The file is split into byte-range shards that worker processes parse
+    and clean into insert parameter tuples. Finished shards are passed in
+    file order through a bounded queue to this thread, the only writer,
+    which applies them with an upsert executemany. The queue bounds how
+    many parsed shards are held in memory at once. The first row of a
+    repeated casting number wins.
+    
+    Args:
+        file_path: Path to the CSV file
+        db: Database session
+        column_mapping: Mapping from CSV columns to database columns
+        batch_size: Number of records to insert at once
+        workers: Number of worker processes (default: number of CPUs)
+        shard_bytes: Approximate size of each shard in bytes
+        
+    Returns:
+        Number of records imported
+    """
+    workers = workers or os.cpu_count() or 1
+    header, shards = shard_file(file_path, shard_bytes)
+    positions = column_positions(header, column_mapping)
+    
+    max_pending = workers * 2
+    parsed = queue.Queue(maxsize=max_pending)
+    stop = threading.Event()
+    
+    def put(item):
+        # Give up if the writer has stopped, instead of blocking forever
+        while not stop.is_set():
+            try:
+                parsed.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+    
+    def produce():
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                pending = deque()
+                for start, end in shards:
+                    if stop.is_set():
+                        break
+                    pending.append(
+                        executor.submit(parse_shard, file_path, start, end, positions)
+                    )
+                    if len(pending) >= max_pending:
+                        put(pending.popleft().result())
+                while pending and not stop.is_set():
+                    put(pending.popleft().result())
+                if stop.is_set():
+                    executor.shutdown(cancel_futures=True)
+        except Exception as e:
+            put(e)
+        put(None)
+    
+    producer = threading.Thread(target=produce, name="csv-shard-producer", daemon=True)
+    producer.start()
+    
+    total_imported = 0
+    seen = set()
+    try:
+        connection = db.connection()
+        while True:
+            rows = parsed.get()
+            if rows is None:
+                break
+            if isinstance(rows, Exception):
+                raise rows
+            
+            rows = first_rows(rows, seen)
+            for i in range(0, len(rows), batch_size):
+                connection.exec_driver_sql(UPSERT_SQL, rows[i:i + batch_size])
+            db.commit()
+            connection = db.connection()
+            
+            total_imported += len(rows)
+            print(f"Imported {total_imported} records")
+    finally:
+        stop.set()
+        producer.join()
+    
+    return total_imported
+
+
 def import_chev_casting_data(file_path: str, db: Session, batch_size: int = 1000) -> int:
     """
     Import Chevrolet casting data from the specific CSV format.
@@ -193,25 +719,210 @@ def import_chev_casting_data(file_path: str, db: Session, batch_size: int = 1000
     Returns:
         Number of records imported
     """
-    # Define column mapping for the Chevrolet casting data
-    column_mapping = {
-        "Years": "years",
-        "Casting": "casting",
-        "CID": "cid",
-        "Low Power": "low_power",
-        "High Power": "high_power",
-        "Main Caps": "main_caps",
-        "Comments": "comments"
-    }
-    
     return import_csv_with_pandas(
         file_path,
         db,
-        column_mapping=column_mapping,
+        column_mapping=CHEV_COLUMN_MAPPING,
         batch_size=batch_size
     )
 
 
+def upsert_castings(db: Session, records: List[Dict]):
+    """
+    Insert or update cleaned records with a single Core executemany.
+    
+    Records whose casting number already exists in the database update the
+    existing row. Callers drop repeated casting numbers with first_rows
+    first.
+    
+    Args:
+        db: Database session
+        records: Cleaned records
+    """
+    if not records:
+        return
+    
+    # executemany needs every parameter set to have the same keys
+    rows = [
+        {column: record.get(column) for column in CASTING_COLUMNS}
+        for record in records
+    ]
+    
+    stmt = sqlite_insert(CastingModel.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["casting"],
+        set_={
+            column: stmt.excluded[column]
+            for column in CASTING_COLUMNS
+            if column != "casting"
+        }
+    )
+    db.execute(stmt, rows)
+
+
+def import_csv_with_core(
+    file_path: str,
+    db: Session,
+    column_mapping: Optional[Dict[str, str]] = None,
+    batch_size: int = 1000
+) -> int:
+    """
+    Import data from a CSV file with Core bulk upserts.
+    
+    Rows are read with csv.DictReader and written with one
+    INSERT ... ON CONFLICT(casting) DO UPDATE executemany per batch,
+    without creating ORM objects. Casting numbers already in the database
+    update the existing row; within the file the first row of a repeated
+    casting number wins.
+    
+    Args:
+        file_path: Path to the CSV file
+        db: Database session
+        column_mapping: Mapping from CSV columns to database columns
+        batch_size: Number of records to insert at once
+        
+    Returns:
+        Number of records imported
+    """
+    total_imported = 0
+    batch = []
+    seen = set()
+    
+    # utf-8-sig strips the byte order mark some CSV exports start with
+    with open(file_path, "r", newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        
+        for row in reader:
+            # Apply column mapping if provided
+            if column_mapping:
+                row = {
+                    db_col: row[csv_col]
+                    for csv_col, db_col in column_mapping.items()
+                    if csv_col in row
+                }
+            
+            batch.extend(first_rows([clean_data(row)], seen))
+            
+            if len(batch) >= batch_size:
+                upsert_castings(db, batch)
+                db.commit()
+                total_imported += len(batch)
+                print(f"Imported {total_imported} records")
+                batch = []
+        
+        # Process remaining records
+        if batch:
+            upsert_castings(db, batch)
+            db.commit()
+            total_imported += len(batch)
+            print(f"Imported {total_imported} records")
+    
+    return total_imported
+
+
+def sync_csv(
+    file_path: str,
+    db: Session,
+    column_mapping: Optional[Dict[str, str]] = None,
+    batch_size: int = 500,
+    dry_run: bool = False
+) -> Dict[str, int]:
+    """
+    Bring the castings table in line with a CSV file by applying only changes.
+    
+    Every CSV row is cleaned and hashed, and compared with the row_hash
+    stored for its casting number. New casting numbers are inserted,
+    rows whose hash differs are updated and casting numbers missing from
+    the file are deleted, all in a single transaction, so readers never
+    see a partial sync. The first row wins when a casting number appears
+    more than once.
+    
+    Args:
+        file_path: Path to the CSV file
+        db: Database session
+        column_mapping: Mapping from CSV columns to database columns
+        batch_size: Number of rows per executemany and per delete
+        dry_run: Compute the changes without applying them
+        
+    Returns:
+        Number of rows inserted, updated, deleted, unchanged, and
+        duplicate rows skipped
+    """
+    records = {}
+    duplicates = 0
+    
+    # utf-8-sig strips the byte order mark some CSV exports start with
+    with open(file_path, "r", newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            # Apply column mapping if provided
+            if column_mapping:
+                row = {
+                    db_col: row[csv_col]
+                    for csv_col, db_col in column_mapping.items()
+                    if csv_col in row
+                }
+            
+            record = clean_data(row)
+            if record.get("casting") in records:
+                duplicates += 1
+                continue
+            records[record.get("casting")] = record
+    
+    table = CastingModel.__table__
+    existing = {
+        casting: (row_id, stored_hash)
+        for row_id, casting, stored_hash in db.execute(
+            select(table.c.id, table.c.casting, table.c.row_hash)
+        )
+    }
+    
+    inserts = []
+    updates = []
+    unchanged = 0
+    for casting, record in records.items():
+        values = {column: record.get(column) for column in CASTING_COLUMNS}
+        if casting not in existing:
+            inserts.append(values)
+        elif existing[casting][1] != record["row_hash"]:
+            updates.append(dict(values, row_id=existing[casting][0]))
+        else:
+            unchanged += 1
+    deletes = [row_id for casting, (row_id, _) in existing.items() if casting not in records]
+    
+    summary = {
+        "inserted": len(inserts),
+        "updated": len(updates),
+        "deleted": len(deletes),
+        "unchanged": unchanged,
+        "duplicates": duplicates,
+    }
+    
+    if dry_run:
+        db.rollback()
+        return summary
+    
+    try:
+        # Apply every change in one transaction
+        for i in range(0, len(deletes), batch_size):
+            db.execute(delete(table).where(table.c.id.in_(deletes[i:i + batch_size])))
+        
+        for i in range(0, len(updates), batch_size):
+            db.execute(
+                update(table).where(table.c.id == bindparam("row_id")),
+                updates[i:i + batch_size]
+            )
+        
+        for i in range(0, len(inserts), batch_size):
+            db.execute(insert(table), inserts[i:i + batch_size])
+        
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    
+    return summary
+
+
 def main():
     """Main function."""
     # Parse command line arguments
@@ -219,9 +930,13 @@ def main():
     parser.add_argument("file_path", help="Path to the CSV file")
     parser.add_argument(
         "--method",
-        choices=["pandas", "csv", "chev"],
+        choices=["pandas", "csv", "chev", "core", "stream"],
         default="chev",
-        help="Method to use for importing data (default: chev)"
+        help=(
+            "Method to use for importing data (default: chev). "
+            "core imports the Chevrolet format with Core bulk upserts; "
+            "stream does the same without loading the whole file, for very large files"
+        )
     )
     parser.add_argument(
         "--batch-size",
@@ -229,8 +944,26 @@ def main():
         default=1000,
         help="Number of records to insert at once (default: 1000)"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=(
+            "Number of processes parsing the CSV in parallel (default: 1). "
+            "With more than one, shards are parsed in parallel and written "
+            "by a single Core upsert writer; requires --method core"
+        )
+    )
     args = parser.parse_args()
     
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.workers > 1 and args.method != "core":
+        parser.error(
+            f"--workers {args.workers} parses the Chevrolet format with Core upserts; "
+            f"use it with --method core, not --method {args.method}"
+        )
+    
     # Create database tables
     create_tables()
     
@@ -238,8 +971,18 @@ def main():
     db = SessionLocal()
     
     try:
+        started = time.perf_counter()
+        
         # Import data
-        if args.method == "pandas":
+        if args.workers > 1:
+            total_imported = import_csv_parallel(
+                args.file_path,
+                db,
+                column_mapping=CHEV_COLUMN_MAPPING,
+                batch_size=args.batch_size,
+                workers=args.workers
+            )
+        elif args.method == "pandas":
             total_imported = import_csv_with_pandas(
                 args.file_path,
                 db,
@@ -251,6 +994,20 @@ def main():
                 db,
                 batch_size=args.batch_size
             )
+        elif args.method == "core":
+            total_imported = import_csv_with_core(
+                args.file_path,
+                db,
+                column_mapping=CHEV_COLUMN_MAPPING,
+                batch_size=args.batch_size
+            )
+        elif args.method == "stream":
+            total_imported = import_csv_streaming(
+                args.file_path,
+                db,
+                column_mapping=CHEV_COLUMN_MAPPING,
+                batch_size=args.batch_size
+            )
         else:  # chev
             total_imported = import_chev_casting_data(
                 args.file_path,
@@ -258,7 +1015,15 @@ def main():
                 batch_size=args.batch_size
             )
         
+        # Recount the comment tokens of the facet summary now rather than
+        # on the first facets request
+        refresh_comment_tokens(db)
+        db.commit()
+        
+        elapsed = time.perf_counter() - started
+        rate = total_imported / elapsed if elapsed > 0 else 0.0
         print(f"Successfully imported {total_imported} records")
+        print(f"Import took {elapsed:.2f}s ({rate:.0f} rows/sec)")
     
     finally:
         # Close database session
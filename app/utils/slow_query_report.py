@@ -0,0 +1,137 @@
+import argparse
+import json
+import re
+import sys
+from typing import Dict, Iterable, List, Optional
+
+
+def is_table_scan(plan_line: str) -> bool:
+    """Check whether an EXPLAIN QUERY PLAN line reads a whole table."""
+    return plan_line.startswith("SCAN ") and "VIRTUAL TABLE" not in plan_line
+
+
+def describe_filters(statement: Optional[str]) -> str:
+    """
+    Summarise the WHERE clause of a statement, i.e. its filter combination.
+    """
+    if not statement:
+        return "(statement not logged)"
+
+    statement = " ".join(statement.split())
+    match = re.search(r"\bWHERE (.*?)(?: ORDER BY | GROUP BY | LIMIT |$)", statement)
+    if not match:
+        table = re.search(r"\bFROM (\S+)", statement)
+        return f"(no filters on {table.group(1)})" if table else statement[:80]
+
+    # Drop table prefixes to keep the summary short
+    return re.sub(r"\b\w+\.(\w+)", r"\1", match.group(1))
+
+
+def summarise(entries: Iterable[Dict]) -> List[Dict]:
+    """
+    Group slow query log entries by statement shape.
+
+    Returns:
+        One summary per shape, slowest total time first
+    """
+    shapes = {}
+    for entry in entries:
+        summary = shapes.setdefault(entry["shape"], {
+            "shape": entry["shape"],
+            "count": 0,
+            "total_ms": 0.0,
+            "max_ms": 0.0,
+            "routes": set(),
+            "statement": None,
+            "plan": None,
+        })
+        summary["count"] += 1
+        summary["total_ms"] += entry["duration_ms"]
+        summary["max_ms"] = max(summary["max_ms"], entry["duration_ms"])
+        if entry.get("route"):
+            summary["routes"].add(f"{entry['method']} {entry['route']}")
+        if summary["plan"] is None and entry.get("plan") is not None:
+            summary["statement"] = entry.get("statement")
+            summary["plan"] = entry["plan"]
+
+    for summary in shapes.values():
+        summary["mean_ms"] = summary["total_ms"] / summary["count"]
+        summary["table_scan"] = any(is_table_scan(line) for line in summary["plan"] or [])
+        summary["routes"] = sorted(summary["routes"])
+
+    return sorted(shapes.values(), key=lambda summary: summary["total_ms"], reverse=True)
+
+
+def read_log(file_path: str) -> List[Dict]:
+    """Read the entries of a slow query log, skipping malformed lines."""
+    entries = []
+    with open(file_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+    return entries
+
+
+def print_report(summaries: List[Dict], top: Optional[int] = None):
+    """Print the summaries as a readable report."""
+    if not summaries:
+        print("No slow queries logged.")
+        return
+
+    scans = sum(1 for summary in summaries if summary["table_scan"])
+    print(f"{len(summaries)} statement shapes, {scans} with full table scans\n")
+
+    for summary in summaries[:top]:
+        marker = "  [TABLE SCAN]" if summary["table_scan"] else ""
+        print(
+            f"{summary['shape']}  {summary['count']} queries, "
+            f"total {summary['total_ms']:.1f} ms, mean {summary['mean_ms']:.1f} ms, "
+            f"max {summary['max_ms']:.1f} ms{marker}"
+        )
+        print(f"  Filters: {describe_filters(summary['statement'])}")
+        if summary["routes"]:
+            print(f"  Routes:  {', '.join(summary['routes'])}")
+        for line in summary["plan"] or ["(plan not logged)"]:
+            print(f"  Plan:    {line}")
+        print()
+
+
+def main():
+    """Main function."""
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description="Summarise a slow query log")
+    parser.add_argument(
+        "log_path",
+        nargs="?",
+        default="slow_queries.jsonl",
+        help="Path to the slow query log (default: slow_queries.jsonl)"
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=None,
+        help="Only show the N statement shapes with the most total time"
+    )
+    parser.add_argument(
+        "--scans-only",
+        action="store_true",
+        help="Only show statement shapes whose plan scans a whole table"
+    )
+    args = parser.parse_args()
+
+    try:
+        summaries = summarise(read_log(args.log_path))
+    except FileNotFoundError:
+        print(f"Slow query log not found: {args.log_path}")
+        sys.exit(1)
+
+    if args.scans_only:
+        summaries = [summary for summary in summaries if summary["table_scan"]]
+
+    print_report(summaries, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,519 @@
+#!/usr/bin/env python3
+"""
+Benchmark the lookup, list and search endpoints in-process.
+
+Drives the ASGI app directly, with its lifespan, middleware and the
+castings.db database, and reports for every scenario:
+- ops/sec, and p50/p95/p99 latency
+- peak memory allocated while handling one request (tracemalloc)
+
+Scenarios cover exact lookups (hit and miss), the first and a deep page of
+the list endpoint (by offset and by cursor), and the first page of every
+combination of search filters. Results are saved as JSON; compare two runs
+to gate a release on latency and allocation regressions.
+
+Run from the project root:
+    python -m benchmarks.endpoints run --output before.json
+    python -m benchmarks.endpoints run --output after.json
+    python -m benchmarks.endpoints compare before.json after.json --threshold 10
+
+Set CASTING_DB_MODE=async to benchmark the async endpoints.
+"""
+
+import argparse
+import asyncio
+import gc
+import itertools
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+from urllib.parse import urlencode
+
+# Add the project root to the path to allow imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fastapi
+import sqlalchemy
+from sqlalchemy import func, select
+
+from app.api.pagination import encode_cursor
+from app.api.serialization import orjson
+from app.db.casting_index import casting_index
+from app.db.database import DATABASE_MODE, SessionLocal
+from app.main import app
+from app.models.casting import Casting as CastingModel
+
+API_PREFIX = "/api/castings"
+
+# Query parameters of the search endpoint; every subset is a scenario
+SEARCH_PARAMETERS = ("years", "cid", "main_caps", "comments", "year", "year_from", "year_to")
+
+# Result fields compared between runs, and whether higher is better
+COMPARED_FIELDS = {
+    "ops_per_sec": True,
+    "p50_ms": False,
+    "p95_ms": False,
+    "p99_ms": False,
+    "alloc_peak_kib": False,
+}
+DEFAULT_GATED_FIELDS = ("p50_ms", "p95_ms", "alloc_peak_kib")
+
+
+class Scenario(NamedTuple):
+    name: str
+    path: str
+    params: Dict
+    expected_status: int = 200
+
+
+async def asgi_get(path: str, params: Optional[Dict] = None) -> Tuple[int, Dict[str, str], bytes]:
+    """
+    Send a GET request straight to the ASGI app, without a server or client.
+
+    Returns:
+        Status code, response headers and body
+    """
+    query_string = urlencode(params or {}).encode("ascii")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("utf-8"),
+        "query_string": query_string,
+        "root_path": "",
+        "headers": [(b"host", b"benchmark")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("benchmark", 80),
+    }
+    response = {"status": None, "headers": {}, "body": []}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = {
+                name.decode("latin-1").lower(): value.decode("latin-1")
+                for name, value in message.get("headers", [])
+            }
+        elif message["type"] == "http.response.body":
+            response["body"].append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return response["status"], response["headers"], b"".join(response["body"])
+
+
+def sample_casting() -> Dict:
+    """
+    Pick the casting whose values drive the scenarios.
+
+    The lowest id with every searchable field set is used, so every filter
+    combination matches at least this casting and runs are repeatable on
+    the same data.
+    """
+    with SessionLocal() as db:
+        casting = db.scalars(
+            select(CastingModel).where(
+                CastingModel.years.isnot(None),
+                CastingModel.cid.isnot(None),
+                CastingModel.main_caps.isnot(None),
+                CastingModel.comments.isnot(None),
+                CastingModel.start_year.isnot(None),
+                CastingModel.end_year.isnot(None),
+            ).order_by(CastingModel.id).limit(1)
+        ).first()
+
+    if casting is None:
+        raise RuntimeError("No casting with every searchable field set; import data first")
+
+    token = re.search(r"\w{3,}", casting.comments) or re.search(r"\w+", casting.comments)
+    return {
+        "casting": casting.casting,
+        "years": casting.years,
+        "cid": casting.cid,
+        "main_caps": casting.main_caps,
+        "comments": token.group(0),
+        "year": casting.start_year,
+        "year_from": casting.start_year,
+        "year_to": casting.end_year,
+    }
+
+
+def castings_count() -> int:
+    """Count the castings in the database."""
+    with SessionLocal() as db:
+        return db.scalar(select(func.count()).select_from(CastingModel))
+
+
+def deep_cursor(total: int, page_size: int) -> Optional[str]:
+    """
+    Return the cursor the list endpoint hands out for its last page.
+
+    The cursor holds the id of the row before that page, so it is computed
+    directly rather than by walking every page of a large catalog.
+    """
+    if total <= page_size:
+        return None
+    with SessionLocal() as db:
+        last_id = db.scalar(
+            select(CastingModel.id).order_by(CastingModel.id).offset(total - page_size - 1).limit(1)
+        )
+    return encode_cursor([last_id])
+
+
+def search_scenario_name(names: Sequence[str]) -> str:
+    return f"search[{'+'.join(names) or 'no filters'}]"
+
+
+def build_scenarios(sample: Dict, total: int, page_size: int) -> List[Scenario]:
+    """Build every benchmark scenario, in a fixed order."""
+    scenarios = [
+        Scenario("lookup_hit", f"{API_PREFIX}/{sample['casting']}", {}),
+        Scenario("lookup_miss", f"{API_PREFIX}/does-not-exist", {}, 404),
+        Scenario("list_first_page", f"{API_PREFIX}/", {"limit": page_size}),
+        Scenario(
+            "list_deep_offset",
+            f"{API_PREFIX}/",
+            {"skip": max(total - page_size, 0), "limit": page_size},
+        ),
+    ]
+
+    cursor = deep_cursor(total, page_size)
+    if cursor:
+        scenarios.append(Scenario(
+            "list_deep_cursor",
+            f"{API_PREFIX}/",
+            {"cursor": cursor, "limit": page_size},
+        ))
+
+    for size in range(len(SEARCH_PARAMETERS) + 1):
+        for names in itertools.combinations(SEARCH_PARAMETERS, size):
+            params = {name: sample[name] for name in names}
+            params["limit"] = page_size
+            scenarios.append(Scenario(search_scenario_name(names), f"{API_PREFIX}/search/", params))
+
+    return scenarios
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """Return a percentile of sorted values, interpolating between ranks."""
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+async def check_scenario(scenario: Scenario, warmup: int) -> Tuple[int, bytes]:
+    """Warm a scenario up, making sure it answers with the expected status."""
+    for _ in range(max(warmup, 1)):
+        status, _, body = await asgi_get(scenario.path, scenario.params)
+        if status != scenario.expected_status:
+            raise RuntimeError(
+                f"{scenario.name}: expected status {scenario.expected_status}, got {status}"
+            )
+    return status, body
+
+
+async def time_scenario(scenario: Scenario, count: int) -> Tuple[List[float], float]:
+    """Send a scenario's request count times; return each latency and the total time."""
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(count):
+        request_started = time.perf_counter()
+        await asgi_get(scenario.path, scenario.params)
+        latencies.append(time.perf_counter() - request_started)
+    return latencies, time.perf_counter() - started
+
+
+async def trace_allocations(scenario: Scenario, count: int) -> List[int]:
+    """
+    Return the peak memory allocated while handling each of count requests.
+
+    Allocations are traced in their own pass because tracemalloc slows
+    every allocation down and would distort the timings.
+    """
+    peaks = []
+    gc.collect()
+    tracemalloc.start()
+    try:
+        for _ in range(count):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            await asgi_get(scenario.path, scenario.params)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def summarise_timings(latencies: List[float], elapsed: float) -> Dict:
+    """Compute throughput and latency percentiles, in milliseconds."""
+    latencies = sorted(latencies)
+    return {
+        "iterations": len(latencies),
+        "ops_per_sec": round(len(latencies) / elapsed, 1),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 4),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 4),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 4),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 4),
+    }
+
+
+def git_commit() -> Optional[str]:
+    """Return the current git commit of the project, if available."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_benchmarks(
+    iterations: int = 200,
+    rounds: int = 5,
+    warmup: int = 20,
+    alloc_iterations: int = 20,
+    page_size: int = 10,
+    pattern: Optional[str] = None,
+) -> Dict:
+    """
+    Run the benchmark scenarios against the app.
+
+    The timed requests are split into rounds that each run every scenario
+    in turn, so a machine getting slower or faster during the run affects
+    all scenarios alike instead of whichever happened to run at the time.
+
+    Args:
+        iterations: Timed requests per scenario
+        rounds: Rounds the timed requests are spread over
+        warmup: Untimed requests per scenario before timing
+        alloc_iterations: Requests per scenario traced with tracemalloc (0 to skip)
+        page_size: limit of the list and search requests
+        pattern: Only run scenarios whose name contains this text
+
+    Returns:
+        Run metadata and the results of every scenario, keyed by name
+    """
+    rounds = max(1, min(rounds, iterations))
+    async with app.router.lifespan_context(app):
+        total = castings_count()
+        scenarios = build_scenarios(sample_casting(), total, page_size)
+        if pattern:
+            scenarios = [scenario for scenario in scenarios if pattern in scenario.name]
+
+        responses = {}
+        for scenario in scenarios:
+            responses[scenario.name] = await check_scenario(scenario, warmup)
+
+        latencies = {scenario.name: [] for scenario in scenarios}
+        elapsed = {scenario.name: 0.0 for scenario in scenarios}
+        for round_number in range(rounds):
+            # Spread the remainder over the first rounds
+            count = iterations // rounds + (round_number < iterations % rounds)
+            gc.collect()
+            for scenario in scenarios:
+                round_latencies, round_elapsed = await time_scenario(scenario, count)
+                latencies[scenario.name].extend(round_latencies)
+                elapsed[scenario.name] += round_elapsed
+
+        results = {}
+        for scenario in scenarios:
+            status, body = responses[scenario.name]
+            peaks = await trace_allocations(scenario, alloc_iterations) if alloc_iterations else []
+            results[scenario.name] = {
+                "path": scenario.path,
+                "params": scenario.params,
+                "status": status,
+                "response_bytes": len(body),
+                **summarise_timings(latencies[scenario.name], elapsed[scenario.name]),
+                "alloc_peak_kib": round(statistics.median(peaks) / 1024, 2) if peaks else None,
+            }
+
+        meta = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "fastapi": fastapi.__version__,
+            "sqlalchemy": sqlalchemy.__version__,
+            "json_encoder": "orjson" if orjson else "json",
+            "database_mode": DATABASE_MODE,
+            "castings": total,
+            "dataset_version": casting_index.version,
+            "iterations": iterations,
+            "rounds": rounds,
+            "warmup": warmup,
+            "alloc_iterations": alloc_iterations,
+            "page_size": page_size,
+        }
+
+    return {"meta": meta, "results": results}
+
+
+def compare_results(
+    base: Dict,
+    new: Dict,
+    threshold: float = 10.0,
+    gated_fields: Sequence[str] = DEFAULT_GATED_FIELDS,
+) -> List[Dict]:
+    """
+    Compare the scenarios two runs have in common.
+
+    Args:
+        base: Report of the reference run
+        new: Report of the run being checked
+        threshold: Percentage by which a gated field may get worse
+        gated_fields: Result fields that count as regressions
+
+    Returns:
+        One row per scenario with the change of each field in percent
+        (positive is worse) and the gated fields that regressed
+    """
+    rows = []
+    for name, base_result in base["results"].items():
+        new_result = new["results"].get(name)
+        if new_result is None:
+            continue
+
+        changes = {}
+        for field, higher_is_better in COMPARED_FIELDS.items():
+            before, after = base_result.get(field), new_result.get(field)
+            if not before or after is None:
+                continue
+            change = (after - before) / before * 100
+            changes[field] = -change if higher_is_better else change
+
+        rows.append({
+            "name": name,
+            "base": base_result,
+            "new": new_result,
+            "changes": changes,
+            "regressions": [
+                field for field in gated_fields if changes.get(field, 0) > threshold
+            ],
+        })
+    return rows
+
+
+def print_results(report: Dict):
+    """Print the results of a run as a table."""
+    meta = report["meta"]
+    print(
+        f"{meta['castings']} castings, {meta['database_mode']} mode, "
+        f"{meta['json_encoder']}, {meta['iterations']} iterations, page size {meta['page_size']}"
+    )
+    print(f"{'scenario':<60} {'ops/sec':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'alloc KiB':>10}")
+    for name, result in report["results"].items():
+        alloc = result["alloc_peak_kib"]
+        print(
+            f"{name:<60} {result['ops_per_sec']:>9.0f} {result['p50_ms']:>8.3f} "
+            f"{result['p95_ms']:>8.3f} {result['p99_ms']:>8.3f} "
+            f"{alloc if alloc is not None else '-':>10}"
+        )
+
+
+def print_comparison(base: Dict, new: Dict, rows: List[Dict], threshold: float):
+    """Print a comparison of two runs, flagging regressions."""
+    for key in ("castings", "dataset_version", "database_mode", "json_encoder", "page_size"):
+        if base["meta"].get(key) != new["meta"].get(key):
+            print(
+                f"Warning: runs differ in {key} "
+                f"({base['meta'].get(key)} vs {new['meta'].get(key)})"
+            )
+
+    print(f"Change in percent, positive is worse; regressions are over {threshold:g}%")
+    print(f"{'scenario':<60} {'ops/sec':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'alloc':>8}")
+    for row in rows:
+        cells = [
+            f"{row['changes'][field]:+8.1f}" if field in row["changes"] else f"{'-':>8}"
+            for field in COMPARED_FIELDS
+        ]
+        marker = f"  REGRESSION: {', '.join(row['regressions'])}" if row["regressions"] else ""
+        print(f"{row['name']:<60} {' '.join(cells)}{marker}")
+
+    missing = sorted(set(base["results"]) - set(new["results"]))
+    added = sorted(set(new["results"]) - set(base["results"]))
+    if missing:
+        print(f"Only in the base run: {', '.join(missing)}")
+    if added:
+        print(f"Only in the new run: {', '.join(added)}")
+
+    regressed = [row["name"] for row in rows if row["regressions"]]
+    print(f"\n{len(regressed)} of {len(rows)} scenarios regressed")
+
+
+def load_report(file_path: str) -> Dict:
+    with open(file_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Benchmark the lookup, list and search endpoints")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmarks and save the results")
+    run_parser.add_argument("--output", default="benchmark_endpoints.json", help="JSON file for the results (default: benchmark_endpoints.json)")
+    run_parser.add_argument("--iterations", type=int, default=200, help="Timed requests per scenario (default: 200)")
+    run_parser.add_argument("--rounds", type=int, default=5, help="Rounds the timed requests are spread over (default: 5)")
+    run_parser.add_argument("--warmup", type=int, default=20, help="Untimed requests per scenario (default: 20)")
+    run_parser.add_argument("--alloc-iterations", type=int, default=20, help="Requests per scenario traced for allocations, 0 to skip (default: 20)")
+    run_parser.add_argument("--page-size", type=int, default=10, help="limit of list and search requests (default: 10)")
+    run_parser.add_argument("--filter", dest="pattern", help="Only run scenarios whose name contains this text")
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two saved runs")
+    compare_parser.add_argument("base", help="Results of the reference run")
+    compare_parser.add_argument("new", help="Results of the run being checked")
+    compare_parser.add_argument("--threshold", type=float, default=10.0, help="Allowed slowdown in percent (default: 10)")
+    compare_parser.add_argument(
+        "--fields",
+        nargs="+",
+        choices=list(COMPARED_FIELDS),
+        default=list(DEFAULT_GATED_FIELDS),
+        help="Result fields that fail the comparison when they regress (default: p50_ms p95_ms alloc_peak_kib)"
+    )
+    args = parser.parse_args()
+
+    if args.command == "run":
+        report = asyncio.run(run_benchmarks(
+            iterations=args.iterations,
+            rounds=args.rounds,
+            warmup=args.warmup,
+            alloc_iterations=args.alloc_iterations,
+            page_size=args.page_size,
+            pattern=args.pattern,
+        ))
+        print_results(report)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+    else:
+        base, new = load_report(args.base), load_report(args.new)
+        rows = compare_results(base, new, args.threshold, args.fields)
+        print_comparison(base, new, rows, args.threshold)
+        if any(row["regressions"] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Benchmark the CSV import methods across batch sizes and file sizes.
+
+Every cell of the method x batch size x file size matrix imports a
+generated catalog (app.utils.generate_data, chev-casting.csv format) into a
+new scratch SQLite database in its own process, and records:
+- rows/sec of the import call
+- peak RSS of the process (and of any worker processes)
+- committed transactions, each of which makes SQLite fsync its journal
+  and database files
+- fsync/fdatasync calls, when strace is installed
+
+The best configuration for the largest file is recommended and compared
+with the defaults of import_data.py and migrate_database.py.
+
+The pandas method is the chev method without the Chevrolet column mapping,
+so it is benchmarked as chev.
+
+Run from the project root:
+    python -m benchmarks.imports --rows 10000 100000 --batch-sizes 100 1000 5000 20000
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Add the project root to the path to allow imports
+sys.path.append(PROJECT_ROOT)
+
+METHODS = ("chev", "csv", "core", "stream", "parallel")
+
+# Methods that are measured but never recommended: import_data.py --method
+# csv passes no column mapping, so it cannot import the Chevrolet format
+# the benchmark files use
+NOT_RECOMMENDED = ("csv",)
+
+# Configurations the recommendation is compared with
+CURRENT_DEFAULTS = {
+    "import_data.py": ("chev", 1000),
+    "migrate_database.py": ("chev", 100),
+}
+
+
+def run_import(method: str, file_path: str, batch_size: int, workers: int) -> Dict:
+    """
+    Import a file into the configured database and measure it.
+
+    Runs inside the cell process, after CASTING_DB_PATH has been set, so the
+    app modules are imported here.
+    """
+    from sqlalchemy import event, func, select
+
+    from app.db.database import SessionLocal, engine
+    from app.models.casting import Casting as CastingModel
+    from app.utils.import_data import (
+        CHEV_COLUMN_MAPPING,
+        create_tables,
+        import_chev_casting_data,
+        import_csv_parallel,
+        import_csv_streaming,
+        import_csv_with_core,
+        import_csv_with_csv_reader,
+    )
+
+    importers = {
+        "chev": lambda db: import_chev_casting_data(file_path, db, batch_size=batch_size),
+        "csv": lambda db: import_csv_with_csv_reader(
+            file_path, db, column_mapping=CHEV_COLUMN_MAPPING, batch_size=batch_size
+        ),
+        "core": lambda db: import_csv_with_core(
+            file_path, db, column_mapping=CHEV_COLUMN_MAPPING, batch_size=batch_size
+        ),
+        "stream": lambda db: import_csv_streaming(
+            file_path, db, column_mapping=CHEV_COLUMN_MAPPING, batch_size=batch_size
+        ),
+        "parallel": lambda db: import_csv_parallel(
+            file_path, db, column_mapping=CHEV_COLUMN_MAPPING, batch_size=batch_size, workers=workers
+        ),
+    }
+
+    create_tables()
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    commits = 0
+
+    def count_commit(conn):
+        nonlocal commits
+        commits += 1
+
+    event.listen(engine, "commit", count_commit)
+
+    with SessionLocal() as db:
+        # Progress output would only add noise to the measurement
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            started = time.perf_counter()
+            importers[method](db)
+            seconds = time.perf_counter() - started
+        rows = db.scalar(select(func.count()).select_from(CastingModel))
+
+    event.remove(engine, "commit", count_commit)
+
+    # ru_maxrss is in KiB on Linux
+    peak_rss = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    return {
+        "rows": rows,
+        "seconds": round(seconds, 4),
+        "rows_per_sec": round(rows / seconds, 1),
+        "peak_rss_mib": round(peak_rss / 1024, 1),
+        "baseline_rss_mib": round(baseline_rss / 1024, 1),
+        "commits": commits,
+    }
+
+
+def count_fsyncs(strace_output: str) -> Optional[int]:
+    """Sum the fsync and fdatasync calls of an strace -c summary."""
+    calls = None
+    with open(strace_output, "r", encoding="utf-8") as f:
+        for line in f:
+            fields = line.split()
+            if fields and fields[-1] in ("fsync", "fdatasync"):
+                # % time, seconds, usecs/call, calls, [errors,] syscall
+                calls = (calls or 0) + int(fields[3])
+    return calls
+
+
+def run_cell(
+    method: str,
+    file_path: str,
+    batch_size: int,
+    workers: int,
+    work_dir: str,
+    strace: Optional[str],
+) -> Dict:
+    """Run one import in a new process against a new scratch database."""
+    db_path = os.path.join(work_dir, "scratch.db")
+    for suffix in ("", "-journal", "-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+
+    command = [
+        sys.executable, "-m", "benchmarks.imports", "--cell",
+        "--method", method,
+        "--file", file_path,
+        "--batch-size", str(batch_size),
+        "--workers", str(workers),
+    ]
+    strace_output = None
+    if strace:
+        strace_output = os.path.join(work_dir, "strace.txt")
+        command = [strace, "-f", "-c", "-e", "trace=fsync,fdatasync", "-o", strace_output] + command
+
+    completed = subprocess.run(
+        command,
+        cwd=PROJECT_ROOT,
+        env={**os.environ, "CASTING_DB_PATH": db_path},
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(
+            f"{method} import with batch size {batch_size} failed:\n{completed.stderr[-2000:]}"
+        )
+
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["fsyncs"] = count_fsyncs(strace_output) if strace_output else None
+    return result
+
+
+def generate_file(rows: int, seed: int, work_dir: str) -> str:
+    """Generate a catalog CSV with a number of rows, once per run."""
+    from app.utils.generate_data import CatalogModel, generate_records, write_csv
+
+    file_path = os.path.join(work_dir, f"catalog-{rows}.csv")
+    if not os.path.exists(file_path):
+        model = CatalogModel.from_csv(os.path.join(PROJECT_ROOT, "chev-casting.csv"))
+        write_csv(generate_records(model, rows, seed=seed), file_path)
+    return file_path
+
+
+def run_matrix(
+    methods: Sequence[str],
+    batch_sizes: Sequence[int],
+    row_counts: Sequence[int],
+    work_dir: str,
+    repeat: int = 1,
+    workers: int = 4,
+    seed: int = 0,
+    strace: Optional[str] = None,
+) -> List[Dict]:
+    """
+    Run every cell of the matrix.
+
+    With repeat > 1, each cell is run that many times and the run with the
+    median rows/sec is kept.
+
+    Returns:
+        One result per cell, in matrix order
+    """
+    results = []
+    for rows in row_counts:
+        file_path = generate_file(rows, seed, work_dir)
+        for method in methods:
+            for batch_size in batch_sizes:
+                runs = [
+                    run_cell(method, file_path, batch_size, workers, work_dir, strace)
+                    for _ in range(repeat)
+                ]
+                runs.sort(key=lambda run: run["rows_per_sec"])
+                result = {
+                    "method": method,
+                    "batch_size": batch_size,
+                    "file_rows": rows,
+                    "workers": workers if method == "parallel" else 1,
+                    **runs[len(runs) // 2],
+                    "rows_per_sec_runs": [run["rows_per_sec"] for run in runs],
+                }
+                if result["rows"] != rows:
+                    raise RuntimeError(
+                        f"{method} import with batch size {batch_size} imported "
+                        f"{result['rows']} of {rows} rows"
+                    )
+                print_result(result)
+                results.append(result)
+    return results
+
+
+def recommend(results: List[Dict], max_rss_mib: Optional[float] = None) -> Optional[Dict]:
+    """
+    Pick the fastest configuration for the largest file.
+
+    Methods in NOT_RECOMMENDED are skipped.
+
+    Args:
+        results: Results of run_matrix
+        max_rss_mib: Only consider configurations within this peak RSS
+
+    Returns:
+        The recommended result, or None if no configuration qualifies
+    """
+    if not results:
+        return None
+    largest = max(result["file_rows"] for result in results)
+    candidates = [
+        result for result in results
+        if result["file_rows"] == largest
+        and result["method"] not in NOT_RECOMMENDED
+        and (max_rss_mib is None or result["peak_rss_mib"] <= max_rss_mib)
+    ]
+    return max(candidates, key=lambda result: result["rows_per_sec"], default=None)
+
+
+def print_result(result: Dict):
+    fsyncs = result["fsyncs"] if result["fsyncs"] is not None else "-"
+    spread = ""
+    if len(result["rows_per_sec_runs"]) > 1:
+        spread = f"  (runs: {', '.join(f'{value:.0f}' for value in result['rows_per_sec_runs'])})"
+    print(
+        f"{result['file_rows']:>9} {result['method']:<9} {result['batch_size']:>7} "
+        f"{result['rows_per_sec']:>11.0f} {result['peak_rss_mib']:>9.1f} "
+        f"{result['commits']:>8} {fsyncs:>7}{spread}"
+    )
+
+
+def print_recommendation(results: List[Dict], best: Optional[Dict], max_rss_mib: Optional[float]):
+    if best is None:
+        limit = f" within {max_rss_mib:g} MiB peak RSS" if max_rss_mib is not None else ""
+        print(f"\nNo configuration qualifies{limit}.")
+        return
+
+    # The parallel method is import_data.py's Core method with workers
+    method = "core" if best["method"] == "parallel" else best["method"]
+    print(
+        f"\nRecommended for {best['file_rows']} rows: --method {method} "
+        f"--batch-size {best['batch_size']}"
+        + (f" --workers {best['workers']}" if best["method"] == "parallel" else "")
+        + f" ({best['rows_per_sec']:.0f} rows/sec, {best['peak_rss_mib']:.1f} MiB peak RSS, "
+        f"{best['commits']} commit{'s' if best['commits'] != 1 else ''})"
+    )
+
+    for source, (method, batch_size) in CURRENT_DEFAULTS.items():
+        current = next((
+            result for result in results
+            if result["file_rows"] == best["file_rows"]
+            and result["method"] == method
+            and result["batch_size"] == batch_size
+        ), None)
+        if current is not None:
+            print(
+                f"  {best['rows_per_sec'] / current['rows_per_sec']:.1f}x the {source} default "
+                f"({method}, batch size {batch_size}: {current['rows_per_sec']:.0f} rows/sec)"
+            )
+
+
+def cell_main(args):
+    """Run a single import and print its result as JSON."""
+    result = run_import(args.method, args.file, args.batch_size, args.workers)
+    print(json.dumps(result))
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Benchmark the CSV import methods")
+    parser.add_argument("--methods", nargs="+", choices=METHODS, default=list(METHODS), help="Import methods (default: all)")
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[100, 1000, 5000, 20000], help="Batch sizes (default: 100 1000 5000 20000)")
+    parser.add_argument("--rows", nargs="+", type=int, default=[10000, 100000], help="File sizes in rows (default: 10000 100000)")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per cell; the median is kept (default: 1)")
+    parser.add_argument("--workers", type=int, default=4, help="Worker processes of the parallel method (default: 4)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated files (default: 0)")
+    parser.add_argument("--max-rss-mib", type=float, default=None, help="Only recommend configurations within this peak RSS")
+    parser.add_argument("--output", default="benchmark_imports.json", help="JSON file for the results (default: benchmark_imports.json)")
+    parser.add_argument("--work-dir", default=None, help="Directory for the generated files and scratch database (default: a temporary directory)")
+
+    # Internal: run one cell of the matrix in this process
+    parser.add_argument("--cell", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--method", help=argparse.SUPPRESS)
+    parser.add_argument("--file", help=argparse.SUPPRESS)
+    parser.add_argument("--batch-size", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.cell:
+        cell_main(args)
+        return
+
+    strace = shutil.which("strace")
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="casting-import-bench-")
+    os.makedirs(work_dir, exist_ok=True)
+
+    print(f"fsync counts: {'strace' if strace else 'strace not installed, commits only'}")
+    print(f"{'rows':>9} {'method':<9} {'batch':>7} {'rows/sec':>11} {'RSS MiB':>9} {'commits':>8} {'fsyncs':>7}")
+    try:
+        results = run_matrix(
+            args.methods,
+            args.batch_sizes,
+            args.rows,
+            work_dir,
+            repeat=args.repeat,
+            workers=args.workers,
+            seed=args.seed,
+            strace=strace,
+        )
+    finally:
+        if args.work_dir is None:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    best = recommend(results, args.max_rss_mib)
+    print_recommendation(results, best, args.max_rss_mib)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "fsync_source": "strace" if strace else None,
+        },
+        "results": results,
+        "recommendation": best,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
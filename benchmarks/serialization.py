@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark the fast list response path against per-row Pydantic validation.
+
+Compares, for one page of castings:
+1. Loading ORM objects and letting FastAPI validate and serialize them
+   against response_model=List[Casting] (the previous path)
+2. Selecting plain column tuples and serializing them with
+   app.api.serialization (the current path)
+
+Run from the project root against the castings.db database:
+    python -m benchmarks.serialization --limit 100
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import timeit
+from typing import List
+
+# Add the project root to the path to allow imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from sqlalchemy import select
+
+from app.api.queries import list_castings_query, paginate
+from app.api.serialization import castings_response, orjson
+from app.db.database import SessionLocal
+from app.models.casting import Casting as CastingModel
+from app.schemas.casting import Casting
+
+response_field = create_response_field(name="Response_Get_Castings", type_=List[Casting])
+loop = asyncio.new_event_loop()
+
+
+def validated_response(castings) -> bytes:
+    """Render castings the way FastAPI does for response_model=List[Casting]."""
+    content = loop.run_until_complete(
+        serialize_response(field=response_field, response_content=castings, is_coroutine=True)
+    )
+    return JSONResponse(content).body
+
+
+def run(label, func, number):
+    """Time a function and print its throughput."""
+    seconds = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f"{label:<40} {seconds * 1000:8.3f} ms  {1 / seconds:10.0f} ops/sec")
+    return seconds
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Benchmark list response serialization")
+    parser.add_argument("--limit", type=int, default=100, help="Castings per page (default: 100)")
+    parser.add_argument("--number", type=int, default=200, help="Calls per timing run (default: 200)")
+    args = parser.parse_args()
+
+    print(f"Page size: {args.limit}, JSON encoder: {'orjson' if orjson else 'json'}")
+
+    with SessionLocal() as db:
+        orm_castings = db.scalars(
+            select(CastingModel).order_by(CastingModel.id).limit(args.limit)
+        ).all()
+        query, params = list_castings_query(0, args.limit, None)
+        rows, _ = paginate(db.execute(query, params).all(), args.limit)
+
+        # Both paths must produce the same document
+        assert validated_response(orm_castings) == castings_response(rows).body
+
+        print("Serialization only:")
+        slow = run("  ORM objects + Pydantic validation", lambda: validated_response(orm_castings), args.number)
+        fast = run("  Column tuples + direct JSON", lambda: castings_response(rows).body, args.number)
+        print(f"  Speedup: {slow / fast:.1f}x")
+
+        def query_orm():
+            castings = db.scalars(
+                select(CastingModel).order_by(CastingModel.id).limit(args.limit + 1)
+            ).all()
+            db.expunge_all()
+            return validated_response(castings[:args.limit])
+
+        def query_rows():
+            rows = db.execute(*list_castings_query(0, args.limit, None)).all()
+            return castings_response(paginate(rows, args.limit)[0]).body
+
+        print("Query and serialization:")
+        slow = run("  ORM objects + Pydantic validation", query_orm, args.number)
+        fast = run("  Column tuples + direct JSON", query_rows, args.number)
+        print(f"  Speedup: {slow / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -43,6 +43,25 @@ def get_casting_by_id(base_url, casting_id):
     return response.json()
 
 
+def get_castings_batch(base_url, casting_ids):
+    """
+    Look up many castings by number in a single request.
+    
+    Args:
+        base_url: Base URL of the API
+        casting_ids: Casting IDs to look up
+        
+    Returns:
+        Dictionary with the found castings and the missing casting IDs
+    """
+    url = f"{base_url}/api/castings/batch"
+    
+    response = requests.post(url, json={"castings": list(casting_ids)})
+    response.raise_for_status()
+    
+    return response.json()
+
+
 def create_casting(base_url, casting_data):
     """
     Create a new casting.
@@ -133,6 +152,7 @@ def main():
         choices=[
             "list",
             "get",
+            "batch",
             "create",
             "update",
             "delete",
@@ -145,6 +165,10 @@ def main():
         "--casting-id",
         help="Casting ID for get, update, and delete actions"
     )
+    parser.add_argument(
+        "--casting-ids",
+        help="Comma-separated casting IDs for batch action"
+    )
     parser.add_argument(
         "--data",
         help="JSON data for create and update actions"
@@ -153,6 +177,11 @@ def main():
         "--years",
         help="Years for search action (e.g., '1980-85')"
     )
+    parser.add_argument(
+        "--year",
+        type=int,
+        help="Production year for search action (e.g., 1975 matches '1973-80')"
+    )
     parser.add_argument(
         "--cid",
         type=int,
@@ -197,6 +226,15 @@ def main():
                 args.casting_id
             )
         
+        elif args.action == "batch":
+            if args.casting_ids is None:
+                parser.error("--casting-ids is required for batch action")
+            
+            result = get_castings_batch(
+                args.base_url,
+                [casting_id.strip() for casting_id in args.casting_ids.split(",")]
+            )
+        
         elif args.action == "create":
             if args.data is None:
                 parser.error("--data is required for create action")
@@ -244,6 +282,9 @@ def main():
             if args.years is not None:
                 search_params["years"] = args.years
             
+            if args.year is not None:
+                search_params["year"] = args.year
+            
             if args.cid is not None:
                 search_params["cid"] = args.cid
             
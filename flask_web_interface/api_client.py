@@ -1,24 +1,95 @@
 import requests
-from typing import List, Dict, Optional
+from requests.adapters import HTTPAdapter
+from typing import List, Dict, Optional, Tuple
+from urllib3.util.retry import Retry
 import logging
 
 logger = logging.getLogger(__name__)
 
 class CastingAPIClient:
-    """Client for communicating with the FastAPI casting lookup service."""
+    """Client for communicating with the FastAPI casting lookup service.
     
-    def __init__(self, base_url: str = "http://localhost:8000"):
+    Requests go through a pooled keep-alive ``requests.Session`` so page
+    renders reuse connections to the API instead of opening new ones.
+    """
+    
+    def __init__(self, base_url: str = "http://localhost:8000",
+                 pool_connections: int = 10, pool_maxsize: int = 10,
+                 pool_block: bool = True, max_retries: int = 3,
+                 backoff_factor: float = 0.3):
+        """
+        Args:
+            base_url: Base URL of the FastAPI server
+            pool_connections: Number of per-host connection pools to keep
+            pool_maxsize: Maximum connections kept open to each host
+            pool_block: Wait for a free connection instead of opening
+                extra connections beyond ``pool_maxsize``
+            max_retries: Retries of GET and HEAD requests for failed
+                connections and 502/503/504
+            backoff_factor: Exponential backoff factor between retries
+        """
         self.base_url = base_url.rstrip('/')
         self.api_base = f"{self.base_url}/api/castings"
         self.timeout = 10
+        
+        # Only idempotent methods are retried; a POST that failed after it
+        # was sent could be replayed
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            raise_on_status=False,
+        )
+        self._adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            max_retries=retry,
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", self._adapter)
+        self.session.mount("https://", self._adapter)
+    
+    def close(self):
+        """Close pooled connections."""
+        self.session.close()
+    
+    def connection_stats(self) -> Dict:
+        """Report how well pooled connections are being reused."""
+        requests_sent = 0
+        connections_opened = 0
+        pools = self._adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            requests_sent += pool.num_requests
+            connections_opened += pool.num_connections
+        
+        reused = max(requests_sent - connections_opened, 0)
+        return {
+            "requests": requests_sent,
+            "connections_opened": connections_opened,
+            "connections_reused": reused,
+            "reuse_ratio": reused / requests_sent if requests_sent else 0.0,
+        }
     
     def _make_request(self, endpoint: str, params: Dict = None) -> Dict:
         """Make a request to the API with error handling."""
+        response = self._send("GET", endpoint, params=params)
+        return response.json() if response is not None else None
+    
+    def _send(self, method: str, endpoint: str, params: Dict = None,
+              json: Dict = None) -> Optional[requests.Response]:
+        """Send a request to the API, returning None on 404."""
         url = f"{self.api_base}{endpoint}"
         try:
-            response = requests.get(url, params=params, timeout=self.timeout)
+            response = self.session.request(
+                method, url, params=params, json=json, timeout=self.timeout
+            )
             response.raise_for_status()
-            return response.json()
+            return response
         except requests.exceptions.ConnectionError:
             logger.error(f"Failed to connect to API at {url}")
             raise Exception("Unable to connect to the casting lookup API. Please ensure the API server is running.")
@@ -38,20 +109,57 @@ class CastingAPIClient:
         """Get a specific casting by its ID."""
         return self._make_request(f"/{casting_id}")
     
-    def get_all_castings(self, skip: int = 0, limit: int = 100) -> List[Dict]:
-        """Get all castings with pagination."""
-        params = {"skip": skip, "limit": limit}
-        result = self._make_request("/", params=params)
-        return result if result else []
+    def get_castings_page(self, cursor: str = None,
+                          limit: int = 100) -> Tuple[List[Dict], Optional[str]]:
+        """Get one page of castings and the cursor for the next page."""
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        
+        response = self._send("GET", "/", params=params)
+        if response is None:
+            return [], None
+        return response.json(), response.headers.get("X-Next-Cursor")
+    
+    def get_all_castings(self, limit: int = 100) -> List[Dict]:
+        """Get all castings, following cursors page by page."""
+        castings = []
+        cursor = None
+        while True:
+            page, cursor = self.get_castings_page(cursor=cursor, limit=limit)
+            castings.extend(page)
+            if not cursor:
+                return castings
+    
+    def get_castings_batch(self, casting_ids: List[str]) -> Dict:
+        """Look up many castings in one request.
+        
+        Returns a dict with the ``found`` castings and the ``missing``
+        casting numbers.
+        """
+        response = self._send(
+            "POST", "/batch", json={"castings": [str(c) for c in casting_ids]}
+        )
+        if response is None:
+            return {"found": [], "missing": list(casting_ids)}
+        return response.json()
     
     def search_castings(self, years: str = None, cid: int = None, 
                        main_caps: str = None, comments: str = None,
+                       year: int = None, year_from: int = None,
+                       year_to: int = None,
                        skip: int = 0, limit: int = 100) -> List[Dict]:
         """Search castings based on criteria."""
         params = {"skip": skip, "limit": limit}
         
         if years:
             params["years"] = years
+        if year:
+            params["year"] = year
+        if year_from:
+            params["year_from"] = year_from
+        if year_to:
+            params["year_to"] = year_to
         if cid:
             params["cid"] = cid
         if main_caps:
@@ -61,11 +169,20 @@ class CastingAPIClient:
         
         result = self._make_request("/search/", params=params)
         return result if result else []
-    
+
+    def get_facets(self, limit: int = 20, **filters) -> Optional[Dict]:
+        """Get casting counts per CID, main caps, decade and comment token.
+
+        Accepts the same filters as ``search_castings``.
+        """
+        params = {"limit": limit}
+        params.update({name: value for name, value in filters.items() if value})
+        return self._make_request("/facets/", params=params)
+
     def health_check(self) -> bool:
         """Check if the API is accessible."""
         try:
-            response = requests.get(self.base_url, timeout=5)
+            response = self.session.get(self.base_url, timeout=5)
             return response.status_code == 200
         except:
             return False
@@ -1,5 +1,6 @@
 from flask import Flask, render_template, request, redirect, url_for, flash, jsonify
 from api_client import CastingAPIClient
+from health_monitor import HealthMonitor
 import logging
 
 # Configure logging
@@ -12,11 +13,15 @@ app.secret_key = 'your-secret-key-change-this-in-production'
 # Initialize API client
 api_client = CastingAPIClient()
 
+# Probe the API in the background so views never block on a health check
+health_monitor = HealthMonitor(api_client)
+health_monitor.start()
+
 @app.route('/')
 def index():
     """Home page with search forms."""
-    # Check API status
-    api_status = api_client.health_check()
+    # Cached API status from the health monitor
+    api_status = health_monitor.status()['connected']
     return render_template('index.html', api_status=api_status)
 
 @app.route('/search', methods=['POST'])
@@ -78,8 +83,17 @@ def advanced_search():
                 flash('CID must be a number.', 'error')
                 return redirect(url_for('index'))
         
+        # A single year is matched against the production year range,
+        # so "1975" also finds castings made in "1973-80"
+        years = search_params['years'] or None
+        year = None
+        if years and years.isdigit() and len(years) == 4:
+            year = int(years)
+            years = None
+        
         castings = api_client.search_castings(
-            years=search_params['years'] or None,
+            years=years,
+            year=year,
             cid=cid,
             main_caps=search_params['main_caps'] or None,
             comments=search_params['comments'] or None
@@ -98,19 +112,22 @@ def advanced_search():
 def browse_all():
     """Browse all castings with pagination."""
     page = request.args.get('page', 1, type=int)
+    cursor = request.args.get('cursor') or None
     per_page = 50
-    skip = (page - 1) * per_page
     
     try:
-        castings = api_client.get_all_castings(skip=skip, limit=per_page)
+        castings, next_cursor = api_client.get_castings_page(
+            cursor=cursor, limit=per_page
+        )
         
-        # Simple pagination info
-        has_next = len(castings) == per_page
-        has_prev = page > 1
+        # Cursor pagination info
+        has_next = next_cursor is not None
+        has_prev = cursor is not None
         
         return render_template('results.html', 
                              castings=castings,
                              page=page,
+                             next_cursor=next_cursor,
                              has_next=has_next,
                              has_prev=has_prev,
                              show_pagination=True)
@@ -139,12 +156,22 @@ def casting_detail(casting_id):
 
 @app.route('/api/health')
 def api_health():
-    """Check API health status."""
+    """Report the cached API health status."""
     try:
-        status = api_client.health_check()
+        health = health_monitor.status()
+        if health['connected'] is None:
+            status = 'unknown'
+        else:
+            status = 'connected' if health['connected'] else 'disconnected'
+        
         return jsonify({
-            'status': 'connected' if status else 'disconnected',
-            'api_url': api_client.base_url
+            'status': status,
+            'api_url': api_client.base_url,
+            'latency_ms': health['latency_ms'],
+            'last_checked': health['last_checked'],
+            'last_success': health['last_success'],
+            'consecutive_failures': health['consecutive_failures'],
+            'connections': api_client.connection_stats()
         })
     except Exception as e:
         return jsonify({
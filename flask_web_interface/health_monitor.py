@@ -0,0 +1,85 @@
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class HealthMonitor:
+    """Background monitor that probes the API and caches its health.
+
+    Views read the cached status with ``status()`` instead of making a
+    blocking request to the API on every page load.
+    """
+
+    def __init__(self, api_client, interval: float = 15.0):
+        """
+        Args:
+            api_client: CastingAPIClient used to probe the API
+            interval: Seconds between probes
+        """
+        self.api_client = api_client
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._state = {
+            "connected": None,
+            "latency_ms": None,
+            "last_checked": None,
+            "last_success": None,
+            "consecutive_failures": 0,
+        }
+
+    def start(self):
+        """Start probing in a background daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="api-health-monitor", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.check_now()
+            self._stop.wait(self.interval)
+
+    def check_now(self) -> bool:
+        """Probe the API once and update the cached status."""
+        started = time.monotonic()
+        try:
+            connected = self.api_client.health_check()
+        except Exception as e:
+            logger.error(f"API health probe failed: {str(e)}")
+            connected = False
+        latency_ms = (time.monotonic() - started) * 1000
+
+        with self._lock:
+            self._state["connected"] = connected
+            self._state["latency_ms"] = round(latency_ms, 1)
+            self._state["last_checked"] = time.time()
+            if connected:
+                self._state["last_success"] = self._state["last_checked"]
+                self._state["consecutive_failures"] = 0
+            else:
+                self._state["consecutive_failures"] += 1
+
+        return connected
+
+    def status(self) -> Dict:
+        """Return the cached status without contacting the API.
+
+        ``connected`` is None until the first probe has finished.
+        """
+        with self._lock:
+            return dict(self._state)
@@ -5,6 +5,9 @@ This script will:
 1. Drop the existing database
 2. Create the new tables
 3. Import the data from chev-casting.csv
+
+With --sync it instead applies only the rows that changed since the last
+import, without dropping anything.
 """
 
 import os
@@ -14,9 +17,12 @@ import argparse
 # Add the current directory to the path to allow imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from sqlalchemy import inspect
+
+from app.db.casting_facets import refresh_comment_tokens
 from app.db.database import engine, SessionLocal
 from app.models import casting as casting_models
-from app.utils.import_data import import_chev_casting_data
+from app.utils.import_data import CHEV_COLUMN_MAPPING, import_chev_casting_data, sync_csv
 
 
 def drop_tables():
@@ -47,6 +53,8 @@ def import_data(file_path, batch_size=100):
             db,
             batch_size=batch_size
         )
+        refresh_comment_tokens(db)
+        db.commit()
         
         print(f"Successfully imported {total_imported} records.")
     
@@ -55,6 +63,46 @@ def import_data(file_path, batch_size=100):
         db.close()
 
 
+def sync_data(file_path, batch_size=100, dry_run=False):
+    """Apply only the changes between the CSV file and the database."""
+    columns = {column["name"] for column in inspect(engine).get_columns("castings")}
+    if "row_hash" not in columns:
+        print("The castings table predates sync support. Run a full migration first.")
+        return False
+    if not inspect(engine).has_table("casting_facets"):
+        print("The database predates the facet summary. Run a full migration first.")
+        return False
+    
+    print(f"Syncing data from {file_path}...")
+    
+    # Create database session
+    db = SessionLocal()
+    
+    try:
+        summary = sync_csv(
+            file_path,
+            db,
+            column_mapping=CHEV_COLUMN_MAPPING,
+            batch_size=batch_size,
+            dry_run=dry_run
+        )
+        if not dry_run:
+            refresh_comment_tokens(db)
+            db.commit()
+    
+    finally:
+        # Close database session
+        db.close()
+    
+    print(
+        f"{'Would apply' if dry_run else 'Applied'}: "
+        f"{summary['inserted']} inserted, {summary['updated']} updated, "
+        f"{summary['deleted']} deleted, {summary['unchanged']} unchanged "
+        f"({summary['duplicates']} duplicate rows skipped)."
+    )
+    return True
+
+
 def main():
     """Main function."""
     # Parse command line arguments
@@ -77,8 +125,24 @@ def main():
         action="store_true",
         help="Skip dropping existing tables"
     )
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="Apply only inserted, updated and deleted rows instead of dropping and reloading"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="With --sync, report the changes without applying them"
+    )
     args = parser.parse_args()
     
+    if args.sync:
+        create_tables()
+        if sync_data(args.file, args.batch_size, args.dry_run):
+            print("Sync completed successfully.")
+        return
+    
     # Confirm with the user
     if not args.skip_drop:
         confirm = input(
@@ -9,88 +9,146 @@ This script will:
 
 import os
 import sys
+import csv
+import argparse
 import pandas as pd
 
 # Add the current directory to the path to allow imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from app.db.casting_facets import refresh_comment_tokens
 from app.db.database import engine, SessionLocal
 from app.models import casting as casting_models
-from app.models.casting import Casting as CastingModel
-from app.utils.import_data import clean_data
+from app.utils.import_data import (
+    CASTING_COLUMNS,
+    CHEV_COLUMN_MAPPING,
+    INSERT_SQL,
+    clean_dataframe,
+)
 
 
-def import_data(file_path, db):
+def insert_batch(db, batch, rejected):
+    """
+    Insert a batch of rows, isolating failing rows only if the batch fails.
+    
+    The batch is inserted with one executemany inside a savepoint. If that
+    fails, the savepoint is rolled back and the rows are retried one by one,
+    each in its own savepoint, so a bad row is skipped without losing the
+    rest of the batch.
+    
+    Args:
+        db: Database session
+        batch: List of (CSV line number, insert parameter tuple)
+        rejected: List that rejected rows are appended to
+    
+    Returns:
+        Number of rows inserted
+    """
+    connection = db.connection()
+    
+    try:
+        with connection.begin_nested():
+            connection.exec_driver_sql(INSERT_SQL, [row for _, row in batch])
+        return len(batch)
+    except Exception:
+        pass
+    
+    inserted = 0
+    for line, row in batch:
+        try:
+            with connection.begin_nested():
+                connection.exec_driver_sql(INSERT_SQL, row)
+            inserted += 1
+        except Exception as e:
+            error = getattr(e, "orig", e)
+            rejected.append((line, str(error), row))
+    
+    return inserted
+
+
+def write_rejected_report(report_path, rejected):
+    """Write the rejected rows to a CSV report."""
+    with open(report_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["line", "reason"] + CASTING_COLUMNS)
+        for line, reason, row in rejected:
+            writer.writerow([line, reason] + list(row))
+
+
+def import_data(file_path, db, batch_size=5000, report_path="rejected_rows.csv"):
     """
     Import data from CSV file, handling duplicates by skipping them.
+    
+    Rows are deduplicated in memory (the first row with a casting number
+    wins) and inserted in large transactions. Skipped rows are written to
+    a report file along with the reason they were rejected.
     """
-    # Define column mapping for the Chevrolet casting data
-    column_mapping = {
-        "Years": "years",
-        "Casting": "casting",
-        "CID": "cid",
-        "Low Power": "low_power",
-        "High Power": "high_power",
-        "Main Caps": "main_caps",
-        "Comments": "comments"
-    }
-    
-    # Read CSV file
-    df = pd.read_csv(file_path)
-    
-    # Drop any unnamed columns
-    unnamed_cols = [col for col in df.columns if 'Unnamed' in col]
-    if unnamed_cols:
-        df = df.drop(columns=unnamed_cols)
-        print(f"Dropped unnamed columns: {unnamed_cols}")
-    
-    # Apply column mapping
-    df = df.rename(columns=column_mapping)
-    
-    # Convert DataFrame to list of dictionaries
-    records = df.to_dict(orient="records")
+    # Read CSV file, keeping the raw strings so row hashes match sync_csv
+    df = pd.read_csv(file_path, dtype=str, keep_default_na=False)
+    
+    # Clean the whole file at once
+    rows = clean_dataframe(df, CHEV_COLUMN_MAPPING)
     
     # Track unique casting numbers to avoid duplicates
+    casting_position = CASTING_COLUMNS.index("casting")
     unique_castings = set()
-    total_imported = 0
-    skipped = 0
+    unique_rows = []
+    rejected = []
     
-    for record in records:
-        # Clean data
-        cleaned_record = clean_data(record)
+    for i, row in enumerate(rows):
+        # The header is line 1
+        line = i + 2
         
         # Skip if casting number already processed
-        casting_number = cleaned_record.get("casting")
-        if casting_number in unique_castings:
-            skipped += 1
+        casting_number = row[casting_position]
+        if casting_number is not None and casting_number in unique_castings:
+            rejected.append((line, "duplicate casting number", row))
             continue
         
-        # Add to unique set
         unique_castings.add(casting_number)
-        
-        # Create model instance
-        model_instance = CastingModel(**cleaned_record)
-        
-        # Add to session
-        db.add(model_instance)
-        
-        # Commit each record individually to handle errors
-        try:
-            db.commit()
-            total_imported += 1
-            if total_imported % 10 == 0:
-                print(f"Imported {total_imported} records")
-        except Exception as e:
-            db.rollback()
-            print(f"Error importing record with casting {casting_number}: {e}")
-            skipped += 1
+        unique_rows.append((line, row))
+    
+    total_imported = 0
+    for i in range(0, len(unique_rows), batch_size):
+        total_imported += insert_batch(db, unique_rows[i:i + batch_size], rejected)
+        db.commit()
+        print(f"Imported {total_imported} records")
     
+    skipped = len(rejected)
     print(f"Total imported: {total_imported}, Skipped: {skipped}")
+    
+    if rejected:
+        rejected.sort(key=lambda rejection: rejection[0])
+        write_rejected_report(report_path, rejected)
+        print(f"Rejected rows written to {report_path}")
+    
     return total_imported
 
 
 def main():
     """Main function."""
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(
+        description="Reset the database and import Chevrolet casting data"
+    )
+    parser.add_argument(
+        "--file",
+        default="chev-casting.csv",
+        help="Path to the CSV file (default: chev-casting.csv)"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=5000,
+        help="Number of records to insert per transaction (default: 5000)"
+    )
+    parser.add_argument(
+        "--report",
+        default="rejected_rows.csv",
+        help="Path of the rejected rows report (default: rejected_rows.csv)"
+    )
+    args = parser.parse_args()
+    
     print("Dropping existing tables...")
     casting_models.Base.metadata.drop_all(bind=engine)
     print("Tables dropped successfully.")
@@ -99,14 +157,16 @@ def main():
     casting_models.Base.metadata.create_all(bind=engine)
     print("Tables created successfully.")
     
-    print("Importing data from chev-casting.csv...")
+    print(f"Importing data from {args.file}...")
     
     # Create database session
     db = SessionLocal()
     
     try:
         # Import data
-        total_imported = import_data("chev-casting.csv", db)
+        total_imported = import_data(args.file, db, args.batch_size, args.report)
+        refresh_comment_tokens(db)
+        db.commit()
         
         print(f"Successfully imported {total_imported} records.")
     
@@ -7,11 +7,26 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 # Import the test modules
 from tests.test_api import TestCastingAPI
+from tests.test_api_client import TestAPIClient
+from tests.test_caching import TestCaching
+from tests.test_casting_async import TestCastingAsync
+from tests.test_casting_index import TestCastingIndex
 from tests.test_database import TestDatabase
+from tests.test_export import TestExport
 from tests.test_import_data import TestImportData
 from tests.test_main import TestMain
+from tests.test_metrics import TestMetrics
 from tests.test_models import TestModels
+from tests.test_pagination import TestPagination
+from tests.test_reset_db import TestResetDb
 from tests.test_schemas import TestSchemas
+from tests.test_search import TestSearch
+from tests.test_serialization import TestSerialization
+from tests.test_slow_queries import TestSlowQueries
+from tests.test_benchmarks import TestEndpointBenchmarks, TestImportBenchmarks
+from tests.test_generate_data import TestGenerateData
+from tests.test_facets import TestFacets
+from tests.test_health_monitor import TestHealthMonitor
 
 if __name__ == "__main__":
     # Create a test suite
@@ -24,6 +39,22 @@ test_suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestModels))
 test_suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestSchemas))
 test_suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestCastingAPI))
 test_suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestImportData))
+test_suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestCastingIndex))
+test_suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestSearch))
+test_suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestPagination))
+test_suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestCastingAsync))
+test_suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestCaching))
+test_suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestResetDb))
+test_suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestExport))
+test_suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestSerialization))
+test_suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestMetrics))
+test_suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestSlowQueries))
+test_suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestEndpointBenchmarks))
+test_suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestImportBenchmarks))
+test_suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestGenerateData))
+test_suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFacets))
+test_suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestAPIClient))
+test_suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestHealthMonitor))
     
 # Run the tests
 test_result = unittest.TextTestRunner(verbosity=2).run(test_suite)
@@ -0,0 +1,164 @@
+import io
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from urllib3.connectionpool import HTTPConnectionPool
+from urllib3.response import HTTPResponse
+
+# The Flask app imports its modules from its own directory
+sys.path.append(os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "flask_web_interface",
+))
+
+from api_client import CastingAPIClient
+
+
+class FakePools:
+    """Stand-in for urllib3's pool container with fixed pool counters."""
+    
+    def __init__(self, pools):
+        self._pools = pools
+    
+    def keys(self):
+        return list(self._pools)
+    
+    def get(self, key):
+        return self._pools.get(key)
+
+
+class TestAPIClient(unittest.TestCase):
+    """Test cases for the Flask app's API client."""
+    
+    def setUp(self):
+        """Create a client and a mocked transport answering in order."""
+        self.client = CastingAPIClient(backoff_factor=0)
+        self.statuses = []
+        self.methods = []
+    
+    def tearDown(self):
+        self.client.close()
+    
+    def transport(self, pool, conn, method, url, **kwargs):
+        """Answer a request with the next queued status instead of the network."""
+        self.methods.append(method)
+        status = self.statuses.pop(0) if self.statuses else 200
+        return HTTPResponse(
+            body=io.BytesIO(b'{"found": [], "missing": []}'),
+            status=status,
+            headers={"Content-Type": "application/json"},
+            preload_content=False,
+            request_method=method,
+            request_url=url,
+            pool=pool,
+            connection=conn,
+        )
+    
+    def send(self, call):
+        """Run a client call against the mocked transport."""
+        with mock.patch.object(
+            HTTPConnectionPool, "_make_request",
+            lambda pool, conn, method, url, **kwargs: self.transport(
+                pool, conn, method, url, **kwargs
+            ),
+        ):
+            return call()
+    
+    def test_retry_configuration(self):
+        """Test that only idempotent methods are retried."""
+        client = CastingAPIClient(max_retries=5, backoff_factor=0.5)
+        self.addCleanup(client.close)
+        retry = client._adapter.max_retries
+        
+        self.assertEqual(retry.total, 5)
+        self.assertEqual(retry.backoff_factor, 0.5)
+        self.assertEqual(set(retry.status_forcelist), {502, 503, 504})
+        self.assertEqual(retry.allowed_methods, frozenset(["GET", "HEAD"]))
+        self.assertFalse(retry.raise_on_status)
+        
+        self.assertIs(client.session.get_adapter("http://api"), client._adapter)
+        self.assertIs(client.session.get_adapter("https://api"), client._adapter)
+    
+    def test_get_retried_on_unavailable(self):
+        """Test that a GET answered with 503 is sent again."""
+        self.statuses = [503, 503]
+        
+        result = self.send(lambda: self.client.get_casting_by_id("140029"))
+        
+        self.assertEqual(result, {"found": [], "missing": []})
+        self.assertEqual(self.methods, ["GET", "GET", "GET"])
+    
+    def test_get_gives_up_after_max_retries(self):
+        """Test that retries stop after max_retries and the error surfaces."""
+        self.statuses = [503] * 10
+        
+        with self.assertRaises(Exception) as raised:
+            self.send(lambda: self.client.get_casting_by_id("140029"))
+        
+        self.assertIn("503", str(raised.exception))
+        self.assertEqual(len(self.methods), 4)
+    
+    def test_post_not_retried(self):
+        """Test that a batch lookup POST is sent only once."""
+        self.statuses = [503]
+        
+        with self.assertRaises(Exception) as raised:
+            self.send(lambda: self.client.get_castings_batch(["140029"]))
+        
+        self.assertIn("503", str(raised.exception))
+        self.assertEqual(self.methods, ["POST"])
+    
+    def test_not_found_returns_none(self):
+        """Test that a 404 is returned as None without retrying."""
+        self.statuses = [404]
+        
+        result = self.send(lambda: self.client.get_casting_by_id("999999"))
+        
+        self.assertIsNone(result)
+        self.assertEqual(self.methods, ["GET"])
+    
+    def test_connection_stats(self):
+        """Test that request and connection counts are summed over pools."""
+        pools = FakePools({
+            "api": SimpleNamespace(num_requests=10, num_connections=2),
+            "other": SimpleNamespace(num_requests=5, num_connections=3),
+            "evicted": None,
+        })
+        
+        with mock.patch.object(self.client._adapter.poolmanager, "pools", pools):
+            stats = self.client.connection_stats()
+        
+        self.assertEqual(stats["requests"], 15)
+        self.assertEqual(stats["connections_opened"], 5)
+        self.assertEqual(stats["connections_reused"], 10)
+        self.assertAlmostEqual(stats["reuse_ratio"], 10 / 15)
+    
+    def test_connection_stats_without_requests(self):
+        """Test the stats of a client that has not sent anything."""
+        stats = self.client.connection_stats()
+        
+        self.assertEqual(stats, {
+            "requests": 0,
+            "connections_opened": 0,
+            "connections_reused": 0,
+            "reuse_ratio": 0.0,
+        })
+    
+    def test_connection_stats_never_negative(self):
+        """Test that reuse is not negative when connections outnumber requests."""
+        pools = FakePools({
+            "api": SimpleNamespace(num_requests=1, num_connections=3),
+        })
+        
+        with mock.patch.object(self.client._adapter.poolmanager, "pools", pools):
+            stats = self.client.connection_stats()
+        
+        self.assertEqual(stats["connections_reused"], 0)
+        self.assertEqual(stats["reuse_ratio"], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,174 @@
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.database import engine, Base, SessionLocal
+from app.models.casting import Casting as CastingModel
+from app.utils.import_data import clean_data
+from benchmarks.endpoints import SEARCH_PARAMETERS, compare_results, percentile, run_benchmarks
+from benchmarks.imports import count_fsyncs, recommend, run_matrix
+
+
+class TestEndpointBenchmarks(unittest.TestCase):
+    """Test cases for the endpoint benchmark suite."""
+    
+    def setUp(self):
+        """Set up test database."""
+        # Create tables
+        Base.metadata.create_all(bind=engine)
+        
+        # Insert test data
+        records = [
+            {"years": "1973-80", "casting": "330817", "cid": "400", "main_caps": "2", "comments": "car, truck"},
+            {"years": "1975", "casting": "355909", "cid": "262", "main_caps": "2", "comments": "car, truck"},
+            {"years": "1967-68", "casting": "389257", "cid": "302", "main_caps": "4", "comments": "Z-28"},
+        ]
+        db = SessionLocal()
+        try:
+            db.query(CastingModel).delete()
+            db.add_all([CastingModel(**clean_data(record)) for record in records])
+            db.commit()
+        finally:
+            db.close()
+    
+    def tearDown(self):
+        """Clean up after tests."""
+        # Drop tables
+        Base.metadata.drop_all(bind=engine)
+    
+    def test_run_benchmarks(self):
+        """Test that every scenario is run and measured."""
+        report = asyncio.run(run_benchmarks(
+            iterations=4, rounds=2, warmup=1, alloc_iterations=1, page_size=1
+        ))
+        results = report["results"]
+        
+        self.assertEqual(report["meta"]["castings"], 3)
+        self.assertEqual(results["lookup_hit"]["status"], 200)
+        self.assertEqual(results["lookup_miss"]["status"], 404)
+        self.assertEqual(results["list_deep_offset"]["params"], {"skip": 2, "limit": 1})
+        self.assertIn("list_deep_cursor", results)
+        
+        # Every combination of search filters, including none
+        search_results = [name for name in results if name.startswith("search[")]
+        self.assertEqual(len(search_results), 2 ** len(SEARCH_PARAMETERS))
+        self.assertEqual(
+            results["search[years+comments]"]["params"],
+            {"years": "1973-80", "comments": "car", "limit": 1}
+        )
+        
+        for result in results.values():
+            self.assertEqual(result["iterations"], 4)
+            self.assertGreater(result["ops_per_sec"], 0)
+            self.assertLessEqual(result["p50_ms"], result["p99_ms"])
+            self.assertGreater(result["alloc_peak_kib"], 0)
+    
+    def test_compare_results(self):
+        """Test that regressions beyond the threshold are flagged."""
+        base = {"results": {
+            "lookup_hit": {"ops_per_sec": 1000, "p50_ms": 1.0, "p95_ms": 2.0, "p99_ms": 3.0, "alloc_peak_kib": 10},
+            "lookup_miss": {"ops_per_sec": 1000, "p50_ms": 1.0, "p95_ms": 2.0, "p99_ms": 3.0, "alloc_peak_kib": 10},
+            "removed": {"ops_per_sec": 1000, "p50_ms": 1.0, "p95_ms": 2.0, "p99_ms": 3.0, "alloc_peak_kib": 10},
+        }}
+        new = {"results": {
+            "lookup_hit": {"ops_per_sec": 800, "p50_ms": 1.25, "p95_ms": 2.1, "p99_ms": 9.0, "alloc_peak_kib": 10},
+            "lookup_miss": {"ops_per_sec": 1100, "p50_ms": 0.9, "p95_ms": 2.0, "p99_ms": 3.0, "alloc_peak_kib": 12},
+        }}
+        
+        rows = {row["name"]: row for row in compare_results(base, new, threshold=10)}
+        
+        self.assertEqual(set(rows), {"lookup_hit", "lookup_miss"})
+        self.assertAlmostEqual(rows["lookup_hit"]["changes"]["p50_ms"], 25.0)
+        # Fewer ops/sec is worse
+        self.assertAlmostEqual(rows["lookup_hit"]["changes"]["ops_per_sec"], 20.0)
+        # p99 is not gated by default
+        self.assertEqual(rows["lookup_hit"]["regressions"], ["p50_ms"])
+        self.assertEqual(rows["lookup_miss"]["regressions"], ["alloc_peak_kib"])
+        
+        rows = compare_results(base, new, threshold=10, gated_fields=["p99_ms"])
+        self.assertEqual(rows[0]["regressions"], ["p99_ms"])
+    
+    def test_percentile(self):
+        """Test percentiles interpolate between ranks."""
+        values = [1.0, 2.0, 3.0, 4.0, 5.0]
+        self.assertEqual(percentile(values, 0.5), 3.0)
+        self.assertEqual(percentile(values, 0.95), 4.8)
+        self.assertEqual(percentile([7.0], 0.99), 7.0)
+
+
+class TestImportBenchmarks(unittest.TestCase):
+    """Test cases for the import benchmark harness."""
+    
+    def setUp(self):
+        """Create a work directory for the generated files and scratch database."""
+        self.work_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        """Clean up after tests."""
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+    
+    def test_run_matrix(self):
+        """Test that every cell imports the whole file into a scratch database."""
+        results = run_matrix(["chev", "core"], [50, 500], [200], self.work_dir)
+        
+        self.assertEqual(
+            [(result["method"], result["batch_size"]) for result in results],
+            [("chev", 50), ("chev", 500), ("core", 50), ("core", 500)]
+        )
+        for result in results:
+            self.assertEqual(result["rows"], 200)
+            self.assertGreater(result["rows_per_sec"], 0)
+            self.assertGreater(result["peak_rss_mib"], 0)
+            if not shutil.which("strace"):
+                self.assertIsNone(result["fsyncs"])
+        
+        # One commit per batch
+        self.assertEqual(results[0]["commits"], 4)
+        self.assertEqual(results[1]["commits"], 1)
+        
+        # The scratch database is used, not the API database
+        self.assertTrue(os.path.exists(os.path.join(self.work_dir, "scratch.db")))
+    
+    def test_recommend(self):
+        """Test that the fastest configuration for the largest file is recommended."""
+        results = [
+            {"method": "chev", "batch_size": 100, "file_rows": 1000, "rows_per_sec": 9000, "peak_rss_mib": 90},
+            {"method": "chev", "batch_size": 100, "file_rows": 100, "rows_per_sec": 5000, "peak_rss_mib": 90},
+            {"method": "core", "batch_size": 1000, "file_rows": 1000, "rows_per_sec": 8000, "peak_rss_mib": 80},
+            {"method": "parallel", "batch_size": 1000, "file_rows": 1000, "rows_per_sec": 12000, "peak_rss_mib": 150},
+        ]
+        
+        self.assertEqual(recommend(results)["method"], "parallel")
+        self.assertEqual(recommend(results, max_rss_mib=100)["method"], "chev")
+        self.assertIsNone(recommend(results, max_rss_mib=10))
+        
+        # import_data.py cannot run the csv method on the benchmark files
+        results.append(
+            {"method": "csv", "batch_size": 1000, "file_rows": 1000, "rows_per_sec": 20000, "peak_rss_mib": 80}
+        )
+        self.assertEqual(recommend(results)["method"], "parallel")
+    
+    def test_count_fsyncs(self):
+        """Test reading fsync calls from an strace summary."""
+        summary = os.path.join(self.work_dir, "strace.txt")
+        with open(summary, "w") as f:
+            f.write(
+                "% time     seconds  usecs/call     calls    errors syscall\n"
+                "------ ----------- ----------- --------- --------- ----------------\n"
+                " 90.00    0.009000          90       100           fdatasync\n"
+                " 10.00    0.001000          50        20         1 fsync\n"
+                "------ ----------- ----------- --------- --------- ----------------\n"
+                "100.00    0.010000                   120         1 total\n"
+            )
+        
+        self.assertEqual(count_fsyncs(summary), 120)
+
+
+if __name__ == "__main__":
+    unittest.main()
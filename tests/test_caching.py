@@ -0,0 +1,145 @@
+import os
+import sqlite3
+import sys
+import unittest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.main import app
+from app.api.caching import etag_matches
+from app.db.casting_index import casting_index
+from app.db.database import DATABASE_PATH, engine, Base, SessionLocal
+from app.models.casting import Casting as CastingModel
+
+
+class TestCaching(unittest.TestCase):
+    """Test cases for dataset-versioned ETags."""
+    
+    def setUp(self):
+        """Set up test database, index and client."""
+        # Create test client
+        self.client = TestClient(app)
+        
+        # Create tables
+        Base.metadata.create_all(bind=engine)
+        
+        # Create session
+        self.db = SessionLocal()
+        
+        # Insert test data and load the index
+        self.db.query(CastingModel).delete()
+        self.db.add_all([
+            CastingModel(casting="3970010", years="1969-79", start_year=1969, end_year=1979, cid=350),
+            CastingModel(casting="14088526", years="1987", start_year=1987, end_year=1987, cid=350),
+        ])
+        self.db.commit()
+        casting_index.load(self.db)
+    
+    def tearDown(self):
+        """Clean up after tests."""
+        # Close session
+        self.db.close()
+        casting_index.clear()
+        
+        # Drop tables
+        Base.metadata.drop_all(bind=engine)
+    
+    def test_etag_matches(self):
+        """Test If-None-Match parsing."""
+        self.assertTrue(etag_matches('"abc"', '"abc"'))
+        self.assertTrue(etag_matches('"xyz", W/"abc"', '"abc"'))
+        self.assertFalse(etag_matches("*", '"abc"'))
+        self.assertFalse(etag_matches('"xyz"', '"abc"'))
+        self.assertFalse(etag_matches(None, '"abc"'))
+    
+    def test_etag_and_not_modified(self):
+        """Test that matching requests get a 304 without touching the DB."""
+        for url in ("/api/castings/3970010", "/api/castings/", "/api/castings/search/?cid=350"):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            etag = response.headers["ETag"]
+            self.assertIn("max-age", response.headers["Cache-Control"])
+            
+            with patch("app.db.database.SessionLocal") as session_local:
+                response = self.client.get(url, headers={"If-None-Match": etag})
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.headers["ETag"], etag)
+            self.assertEqual(response.content, b"")
+            session_local.assert_not_called()
+    
+    def test_etag_varies_by_url(self):
+        """Test that different requests get different ETags."""
+        first = self.client.get("/api/castings/", params={"limit": 1})
+        second = self.client.get("/api/castings/", params={"limit": 2})
+        self.assertNotEqual(first.headers["ETag"], second.headers["ETag"])
+    
+    def test_etag_changes_with_dataset(self):
+        """Test that changes to the database update ETags."""
+        response = self.client.get("/api/castings/search/?cid=350")
+        etag = response.headers["ETag"]
+        
+        self.db.query(CastingModel).filter(
+            CastingModel.casting == "14088526"
+        ).update({"comments": "Camaro"})
+        self.db.commit()
+        
+        response = self.client.get("/api/castings/search/?cid=350", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+        self.assertEqual(response.json()[1]["comments"], "Camaro")
+    
+    def test_etag_changes_with_other_processes(self):
+        """Test that imports by other connections update ETags without an index refresh."""
+        response = self.client.get("/api/castings/")
+        etag = response.headers["ETag"]
+        
+        connection = sqlite3.connect(DATABASE_PATH)
+        try:
+            connection.execute("INSERT INTO castings (casting, cid) VALUES ('3932386', 350)")
+            connection.commit()
+        finally:
+            connection.close()
+        
+        response = self.client.get("/api/castings/", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 3)
+    
+    def test_etag_changes_with_index(self):
+        """Test that rebuilding the index updates ETags."""
+        casting_index.clear()
+        response = self.client.get("/api/castings/3970010")
+        etag = response.headers["ETag"]
+        
+        self.client.post("/api/castings/index/refresh")
+        response = self.client.get("/api/castings/3970010", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+    
+    def test_errors_are_not_cached(self):
+        """Test that error responses carry no ETag."""
+        response = self.client.get("/api/castings/9999999")
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn("ETag", response.headers)
+    
+    def test_wildcard_is_not_honoured(self):
+        """Test that If-None-Match: * does not hide missing castings."""
+        response = self.client.get("/api/castings/9999999", headers={"If-None-Match": "*"})
+        self.assertEqual(response.status_code, 404)
+        
+        response = self.client.get("/api/castings/3970010", headers={"If-None-Match": "*"})
+        self.assertEqual(response.status_code, 200)
+    
+    def test_no_etag_without_dataset_version(self):
+        """Test that nothing is cached while the database has no dataset version."""
+        self.db.execute(text("DROP TABLE dataset_version"))
+        self.db.commit()
+        response = self.client.get("/api/castings/")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response.headers)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import sys
+import unittest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.main import app
+from app.api.endpoints import casting_async
+from app.db.database import engine, Base, SessionLocal
+from app.models.casting import Casting as CastingModel
+from app.utils.import_data import clean_data
+
+
+class TestCastingAsync(unittest.TestCase):
+    """Test cases for the async endpoints."""
+    
+    def setUp(self):
+        """Set up test database and clients."""
+        # Test clients for the sync app and an app using the async router
+        self.sync_client = TestClient(app)
+        async_app = FastAPI()
+        async_app.include_router(casting_async.router, prefix="/api/castings")
+        self.async_client = TestClient(async_app)
+        
+        # Create tables
+        Base.metadata.create_all(bind=engine)
+        
+        # Insert test data
+        records = [
+            {"years": "1973-80", "casting": "330817", "cid": "400", "comments": "car, truck"},
+            {"years": "1975", "casting": "355909", "cid": "262", "comments": "car, truck"},
+            {"years": "1967-68", "casting": "389257", "cid": "302", "comments": "Z-28"},
+            {"years": "1968", "casting": "3914678", "cid": "302", "comments": "Camaro, Z-28"},
+        ]
+        db = SessionLocal()
+        try:
+            db.query(CastingModel).delete()
+            db.add_all([CastingModel(**clean_data(record)) for record in records])
+            db.commit()
+        finally:
+            db.close()
+    
+    def tearDown(self):
+        """Clean up after tests."""
+        # Drop tables
+        Base.metadata.drop_all(bind=engine)
+    
+    def assertSameResponse(self, url, params=None):
+        """Check that the sync and async endpoints respond identically."""
+        sync_response = self.sync_client.get(url, params=params)
+        async_response = self.async_client.get(url, params=params)
+        self.assertEqual(async_response.status_code, sync_response.status_code)
+        self.assertEqual(async_response.json(), sync_response.json())
+        self.assertEqual(
+            async_response.headers.get("X-Next-Cursor"),
+            sync_response.headers.get("X-Next-Cursor")
+        )
+        return async_response
+    
+    def test_get_castings(self):
+        """Test the async list endpoint."""
+        response = self.assertSameResponse("/api/castings/", {"limit": 3})
+        self.assertEqual(len(response.json()), 3)
+        self.assertSameResponse(
+            "/api/castings/",
+            {"limit": 3, "cursor": response.headers["X-Next-Cursor"]}
+        )
+    
+    def test_get_casting_by_id(self):
+        """Test the async lookup endpoint."""
+        response = self.assertSameResponse("/api/castings/389257")
+        self.assertEqual(response.json()["cid"], 302)
+        
+        response = self.assertSameResponse("/api/castings/9999999")
+        self.assertEqual(response.status_code, 404)
+    
+    def test_search_castings(self):
+        """Test the async search endpoint."""
+        response = self.assertSameResponse("/api/castings/search/", {"year": 1975})
+        self.assertEqual(len(response.json()), 2)
+        
+        response = self.assertSameResponse("/api/castings/search/", {"comments": "Z-28", "limit": 1})
+        self.assertIn("X-Next-Cursor", response.headers)
+        self.assertSameResponse("/api/castings/search/", {"cid": 302})
+    
+    def test_invalid_page_size(self):
+        """Test that the async endpoints reject the same page sizes."""
+        for path in ("/api/castings/", "/api/castings/search/"):
+            for params in ({"limit": 0}, {"limit": -1}, {"skip": -1}):
+                response = self.assertSameResponse(path, params)
+                self.assertEqual(response.status_code, 422)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+import os
+import sys
+import unittest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.main import app
+from app.api.endpoints import casting as casting_endpoints
+from app.db.casting_index import CastingIndex, casting_index
+from app.db.database import engine, Base, SessionLocal
+from app.models.casting import Casting as CastingModel
+
+
+class TestCastingIndex(unittest.TestCase):
+    """Test cases for the in-memory casting index."""
+
+    def setUp(self):
+        """Set up test database."""
+        # Create tables
+        Base.metadata.create_all(bind=engine)
+
+        # Create session
+        self.db = SessionLocal()
+
+        # Clear existing data
+        self.db.query(CastingModel).delete()
+        self.db.add_all([
+            CastingModel(casting="3970010", years="1969-79", cid=350, main_caps="2 or 4"),
+            CastingModel(casting="14088526", years="1987", cid=350, comments="Camaro"),
+        ])
+        self.db.commit()
+
+    def tearDown(self):
+        """Clean up after tests."""
+        # Close session
+        self.db.close()
+        casting_index.clear()
+
+        # Drop tables
+        Base.metadata.drop_all(bind=engine)
+
+    def test_load_and_get(self):
+        """Test loading the index and looking up castings."""
+        index = CastingIndex()
+        self.assertFalse(index.loaded)
+        self.assertIsNone(index.get("3970010"))
+
+        self.assertEqual(index.load(self.db), 2)
+        self.assertTrue(index.loaded)
+        self.assertEqual(len(index), 2)
+
+        casting = index.get("3970010")
+        self.assertEqual(casting["cid"], 350)
+        self.assertEqual(casting["main_caps"], "2 or 4")
+        self.assertIsNone(index.get("9999999"))
+
+    def test_rebuild(self):
+        """Test that a rebuild picks up new rows."""
+        index = CastingIndex()
+        index.load(self.db)
+
+        self.db.add(CastingModel(casting="3932386", years="1969", cid=302))
+        self.db.commit()
+        self.assertIsNone(index.get("3932386"))
+
+        self.assertEqual(index.rebuild(self.db), 3)
+        self.assertEqual(index.get("3932386")["cid"], 302)
+
+    def test_search_prefix(self):
+        """Test prefix searches over the sorted casting numbers."""
+        self.db.add_all([
+            CastingModel(casting="3970014", years="1970-73", cid=350),
+            CastingModel(casting="3970020", years="1969-73", cid=307),
+            CastingModel(casting="3932386", years="1969", cid=302),
+        ])
+        self.db.commit()
+
+        index = CastingIndex()
+        self.assertEqual(index.search_prefix("397"), [])
+        index.load(self.db)
+
+        results = index.search_prefix("39700")
+        self.assertEqual(
+            [casting["casting"] for casting in results],
+            ["3970010", "3970014", "3970020"]
+        )
+        self.assertEqual(len(index.search_prefix("39", limit=2)), 2)
+        self.assertEqual(index.search_prefix("3971"), [])
+        self.assertEqual(len(index.search_prefix("3970014")), 1)
+
+    def test_prefix_endpoint(self):
+        """Test the prefix endpoint with and without the index."""
+        client = TestClient(app)
+
+        # Database fallback
+        response = client.get("/api/castings/prefix/3970")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([c["casting"] for c in response.json()], ["3970010"])
+
+        # In-memory index
+        casting_index.load(self.db)
+        response = client.get("/api/castings/prefix/140")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([c["casting"] for c in response.json()], ["14088526"])
+
+        response = client.get("/api/castings/prefix/5")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [])
+
+    def test_batch_endpoint(self):
+        """Test batch lookups with and without the index."""
+        client = TestClient(app)
+        request = {"castings": ["14088526", "9999999", "3970010", "14088526"]}
+
+        # Database fallback, one casting number per IN (...) chunk
+        with patch.object(casting_endpoints, "BATCH_CHUNK_SIZE", 1):
+            response = client.post("/api/castings/batch", json=request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [casting["casting"] for casting in response.json()["found"]],
+            ["14088526", "3970010"]
+        )
+        self.assertEqual(response.json()["missing"], ["9999999"])
+
+        # In-memory index
+        casting_index.load(self.db)
+        indexed_response = client.post("/api/castings/batch", json=request)
+        self.assertEqual(indexed_response.status_code, 200)
+        self.assertEqual(indexed_response.json(), response.json())
+
+        # Empty requests are rejected
+        response = client.post("/api/castings/batch", json={"castings": []})
+        self.assertEqual(response.status_code, 422)
+
+    def test_lookup_endpoint_uses_index(self):
+        """Test that the lookup endpoint is served from the index."""
+        client = TestClient(app)
+        casting_index.load(self.db)
+
+        # Remove the row from the database; the index still serves it
+        self.db.query(CastingModel).delete()
+        self.db.commit()
+
+        response = client.get("/api/castings/3970010")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["casting"], "3970010")
+
+        response = client.get("/api/castings/9999999")
+        self.assertEqual(response.status_code, 404)
+
+        # Refreshing the index picks up the deletion
+        response = client.post("/api/castings/index/refresh")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["castings"], 0)
+
+        response = client.get("/api/castings/3970010")
+        self.assertEqual(response.status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import csv
+import io
+import json
+import os
+import sys
+import unittest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.main import app
+from app.api import export
+from app.db.database import engine, Base, SessionLocal
+from app.models.casting import Casting as CastingModel
+from app.utils.import_data import clean_data
+
+
+class TestExport(unittest.TestCase):
+    """Test cases for the export endpoint."""
+    
+    def setUp(self):
+        """Set up test database and client."""
+        # Create test client
+        self.client = TestClient(app)
+        
+        # Create tables
+        Base.metadata.create_all(bind=engine)
+        
+        # Insert test data
+        records = [
+            {"years": "1973-80", "casting": "330817", "cid": "400", "comments": "car, truck"},
+            {"years": "1975", "casting": "355909", "cid": "262", "comments": "car, truck"},
+            {"years": "1967-68", "casting": "389257", "cid": "302", "comments": "Z-28"},
+            {"years": "1982-86", "casting": "366286", "cid": "350", "low_power": "-"},
+        ]
+        db = SessionLocal()
+        try:
+            db.query(CastingModel).delete()
+            db.add_all([CastingModel(**clean_data(record)) for record in records])
+            db.commit()
+        finally:
+            db.close()
+    
+    def tearDown(self):
+        """Clean up after tests."""
+        # Drop tables
+        Base.metadata.drop_all(bind=engine)
+    
+    def test_export_ndjson(self):
+        """Test exporting every casting as NDJSON across several chunks."""
+        with patch.object(export, "EXPORT_CHUNK_SIZE", 1):
+            response = self.client.get("/api/castings/export/")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("application/x-ndjson"))
+        self.assertIn("castings.ndjson", response.headers["content-disposition"])
+        
+        castings = [json.loads(line) for line in response.text.splitlines()]
+        self.assertEqual(
+            [casting["casting"] for casting in castings],
+            ["330817", "355909", "389257", "366286"]
+        )
+        
+        # Rows match the list endpoint's JSON
+        self.assertEqual(castings, self.client.get("/api/castings/").json())
+    
+    def test_export_csv_with_filters(self):
+        """Test exporting a filtered subset as CSV."""
+        response = self.client.get(
+            "/api/castings/export/",
+            params={"format": "csv", "comments": "truck", "year": 1975}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/csv"))
+        
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        self.assertEqual([row["casting"] for row in rows], ["330817", "355909"])
+        self.assertEqual(rows[0]["comments"], "car, truck")
+        self.assertEqual(rows[0]["start_year"], "1973")
+        
+        # No matches still sends the header
+        response = self.client.get("/api/castings/export/", params={"format": "csv", "cid": 999})
+        self.assertEqual(response.text.splitlines(), [",".join(export.EXPORT_COLUMNS)])
+    
+    def test_export_rejects_unknown_format(self):
+        """Test that unknown export formats are rejected."""
+        response = self.client.get("/api/castings/export/", params={"format": "xml"})
+        self.assertEqual(response.status_code, 422)
+
+
+if __name__ == "__main__":
+    unittest.main()
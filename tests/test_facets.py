@@ -0,0 +1,204 @@
+import os
+import sys
+import unittest
+from collections import Counter
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.main import app
+from app.api.facets import casting_facets_counts
+from app.db.casting_facets import comment_tokens, rebuild_facets, refresh_comment_tokens
+from app.db.database import engine, Base, SessionLocal
+from app.models.casting import Casting as CastingModel
+from app.utils.import_data import clean_data
+
+
+class TestFacets(unittest.TestCase):
+    """Test cases for the facets endpoint and its summary table."""
+    
+    def setUp(self):
+        """Set up test database and client."""
+        # Create test client
+        self.client = TestClient(app)
+        
+        # Create tables
+        Base.metadata.create_all(bind=engine)
+        
+        # Insert test data
+        records = [
+            {"years": "1973-80", "casting": "330817", "cid": "400", "main_caps": "2", "comments": "car, truck"},
+            {"years": "1975", "casting": "355909", "cid": "262", "main_caps": "2", "comments": "car, truck"},
+            {"years": "1967-68", "casting": "389257", "cid": "302", "main_caps": "4", "comments": "Z-28"},
+            {"years": "1970-76", "casting": "3970010", "cid": "350", "main_caps": "4", "comments": "car, Corvette"},
+            {"years": "", "casting": "12345", "cid": "350", "main_caps": "", "comments": ""},
+        ]
+        self.db = SessionLocal()
+        self.db.query(CastingModel).delete()
+        self.db.add_all([CastingModel(**clean_data(record)) for record in records])
+        self.db.commit()
+    
+    def tearDown(self):
+        """Clean up after tests."""
+        self.db.close()
+        
+        # Drop tables
+        Base.metadata.drop_all(bind=engine)
+    
+    def summary_rows(self):
+        """Return the summary table as a set of rows."""
+        return set(self.db.execute(text("SELECT facet, value, count FROM casting_facets")).all())
+    
+    def expected_facets(self, castings):
+        """Count the facets of some castings in Python."""
+        tokens = Counter()
+        for casting in castings:
+            if casting.comments:
+                tokens.update(comment_tokens(casting.comments))
+        return {
+            "cid": Counter(c.cid for c in castings if c.cid is not None),
+            "main_caps": Counter(c.main_caps for c in castings if c.main_caps is not None),
+            "decade": Counter(c.start_year // 10 * 10 for c in castings if c.start_year is not None),
+            "comment_token": tokens,
+        }
+    
+    def assert_facets(self, result, castings):
+        """Check facet counts against the castings they count."""
+        self.assertEqual(result["total"], len(castings))
+        expected = self.expected_facets(castings)
+        for facet, counts in expected.items():
+            self.assertEqual(
+                {item["value"]: item["count"] for item in result["facets"][facet]},
+                dict(counts),
+                facet
+            )
+    
+    def test_summary_counts(self):
+        """Test that the summary matches the castings after inserts."""
+        refresh_comment_tokens(self.db)
+        self.db.commit()
+        result = casting_facets_counts(self.db, 100)
+        
+        self.assertEqual(result["source"], "summary")
+        self.assertFalse(result["stale"])
+        self.assert_facets(result, self.db.query(CastingModel).all())
+        
+        # Most common values come first
+        self.assertEqual(result["facets"]["comment_token"][0], {"value": "car", "count": 3})
+        self.assertEqual(result["facets"]["cid"][0], {"value": 350, "count": 2})
+    
+    def test_summary_follows_updates_and_deletes(self):
+        """Test that the triggers keep the summary up to date."""
+        casting = self.db.query(CastingModel).filter(CastingModel.casting == "330817").one()
+        casting.cid = 350
+        casting.start_year = 1981
+        casting.comments = "truck only"
+        self.db.query(CastingModel).filter(CastingModel.casting == "389257").delete()
+        self.db.commit()
+        refresh_comment_tokens(self.db)
+        self.db.commit()
+        
+        result = casting_facets_counts(self.db, 100)
+        self.assert_facets(result, self.db.query(CastingModel).all())
+        
+        # Values no casting has any more are removed
+        self.assertNotIn(302, [item["value"] for item in result["facets"]["cid"]])
+        self.assertNotIn("z", [item["value"] for item in result["facets"]["comment_token"]])
+    
+    def test_summary_read_does_not_write(self):
+        """Test that serving the summary never recounts or writes."""
+        statements = []
+        
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement.lstrip().split(None, 1)[0].upper())
+        
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            response = self.client.get("/api/castings/facets/")
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(statements, ["SELECT"])
+        self.assertTrue(response.json()["stale"])
+        self.assertEqual(response.json()["facets"]["comment_token"], [])
+        
+        # Only imports and syncs recount comment tokens
+        self.assertTrue(refresh_comment_tokens(self.db))
+        self.db.commit()
+        response = self.client.get("/api/castings/facets/")
+        self.assertFalse(response.json()["stale"])
+        self.assertIn({"value": "car", "count": 3}, response.json()["facets"]["comment_token"])
+    
+    def test_comment_tokens_refresh_when_stale(self):
+        """Test that comment tokens are only recounted after comments change."""
+        self.assertTrue(refresh_comment_tokens(self.db))
+        self.assertFalse(refresh_comment_tokens(self.db))
+        
+        # Other columns do not affect the comment tokens
+        self.db.execute(text("UPDATE castings SET cid = 305 WHERE casting = '12345'"))
+        self.assertFalse(refresh_comment_tokens(self.db))
+        
+        self.db.execute(text("UPDATE castings SET comments = 'Camaro' WHERE casting = '12345'"))
+        self.assertTrue(refresh_comment_tokens(self.db))
+        self.db.commit()
+    
+    def test_rebuild_matches_triggers(self):
+        """Test that a full rebuild gives the same summary as the triggers."""
+        refresh_comment_tokens(self.db)
+        maintained = self.summary_rows()
+        
+        rebuild_facets(self.db)
+        self.assertEqual(self.summary_rows(), maintained)
+    
+    def test_comment_tokens_match_full_text_index(self):
+        """Test that Python tokenizing matches the full-text index vocabulary."""
+        self.db.execute(text("UPDATE castings SET comments = 'Café 4-bolt, hi_perf (NOS)' WHERE casting = '12345'"))
+        self.db.commit()
+        
+        vocabulary = {
+            term for (term,) in self.db.execute(text("SELECT term FROM castings_fts_vocab"))
+        }
+        tokens = set()
+        for (comments,) in self.db.query(CastingModel.comments):
+            if comments:
+                tokens |= comment_tokens(comments)
+        
+        self.assertEqual(tokens, vocabulary)
+    
+    def test_filtered_counts(self):
+        """Test facet counts restricted by the search filters."""
+        result = casting_facets_counts(self.db, 100, main_caps="2")
+        self.assertEqual(result["source"], "query")
+        self.assert_facets(result, self.db.query(CastingModel).filter(CastingModel.main_caps == "2").all())
+        
+        result = casting_facets_counts(self.db, 100, comments="car", year_from=1975)
+        self.assert_facets(result, self.db.query(CastingModel).filter(
+            CastingModel.casting.in_(["330817", "355909", "3970010"])
+        ).all())
+    
+    def test_facets_endpoint(self):
+        """Test the facets endpoint."""
+        response = self.client.get("/api/castings/facets/", params={"limit": 1})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["total"], 5)
+        self.assertEqual(data["source"], "summary")
+        self.assertEqual(sorted(data["facets"]), ["cid", "comment_token", "decade", "main_caps"])
+        self.assertEqual(data["facets"]["cid"], [{"value": 350, "count": 2}])
+        self.assertEqual(data["facets"]["main_caps"], [{"value": "2", "count": 2}])
+        
+        response = self.client.get("/api/castings/facets/", params={"cid": 350})
+        data = response.json()
+        self.assertEqual(data["total"], 2)
+        self.assertEqual(data["source"], "query")
+        self.assertEqual(data["facets"]["decade"], [{"value": 1970, "count": 1}])
+        
+        response = self.client.get("/api/castings/facets/", params={"limit": 0})
+        self.assertEqual(response.status_code, 422)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,202 @@
+import csv
+import os
+import random
+import sqlite3
+import sys
+import unittest
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.database import engine, Base, SessionLocal
+from app.models.casting import Casting as CastingModel
+from app.utils.generate_data import (
+    CastingNumbers,
+    CatalogModel,
+    generate_records,
+    write_csv,
+    write_sqlite,
+)
+from app.utils.import_data import (
+    CASTING_COLUMNS,
+    CHEV_COLUMN_MAPPING,
+    import_csv_with_core,
+    parse_years,
+)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestGenerateData(unittest.TestCase):
+    """Test cases for the generate_data module."""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Learn the model from the Chevrolet casting data."""
+        cls.source_path = os.path.join(PROJECT_ROOT, "chev-casting.csv")
+        cls.model = CatalogModel.from_csv(cls.source_path)
+        
+        with open(cls.source_path, "r", encoding="utf-8-sig", newline="") as f:
+            cls.source_rows = list(csv.DictReader(f))
+    
+    def setUp(self):
+        """Set up test database and output paths."""
+        # Create tables
+        Base.metadata.create_all(bind=engine)
+        
+        # Create session
+        self.db = SessionLocal()
+        
+        # Clear existing data
+        self.db.query(CastingModel).delete()
+        self.db.commit()
+        
+        self.csv_path = os.path.join(PROJECT_ROOT, "temp_generated.csv")
+        self.sqlite_path = os.path.join(PROJECT_ROOT, "temp_generated.db")
+    
+    def tearDown(self):
+        """Clean up after tests."""
+        # Close session
+        self.db.close()
+        
+        # Drop tables
+        Base.metadata.drop_all(bind=engine)
+        
+        # Remove temporary files
+        for path in (self.csv_path, self.sqlite_path):
+            if os.path.exists(path):
+                os.remove(path)
+    
+    def test_generation_is_deterministic(self):
+        """Test that a seed always generates the same records."""
+        first = list(generate_records(self.model, 500, seed=3))
+        second = list(generate_records(self.model, 500, seed=3))
+        other = list(generate_records(self.model, 500, seed=4))
+        
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+    
+    def test_generated_values_follow_source(self):
+        """Test that generated values come from the learned distributions."""
+        records = list(generate_records(self.model, 5000, seed=1))
+        
+        source_values = {
+            column: {row[header].strip() for row in self.source_rows}
+            for header, column in CHEV_COLUMN_MAPPING.items()
+        }
+        source_lengths = {len(value) for value in source_values["casting"]}
+        
+        castings = [record["casting"] for record in records]
+        self.assertEqual(len(set(castings)), len(castings))
+        self.assertTrue({len(casting) for casting in castings} <= source_lengths)
+        
+        for column in ("cid", "low_power", "high_power", "main_caps"):
+            self.assertTrue({record[column] for record in records} <= source_values[column])
+        
+        # Placeholders keep their source frequencies roughly
+        source_rate = sum(row["Low Power"] == "-" for row in self.source_rows) / len(self.source_rows)
+        generated_rate = sum(record["low_power"] == "-" for record in records) / len(records)
+        self.assertAlmostEqual(generated_rate, source_rate, delta=0.05)
+        
+        # Year ranges stay parseable and within the source period
+        start_years = [parse_years(value)[0] for value in source_values["years"]]
+        for record in records:
+            start_year, end_year = parse_years(record["years"])
+            self.assertIsNotNone(start_year)
+            self.assertGreaterEqual(start_year, min(start_years))
+            self.assertLessEqual(start_year, max(start_years))
+            self.assertGreaterEqual(end_year, start_year)
+        
+        # Comments are built from the source vocabulary
+        source_words = {
+            word.lower()
+            for value in source_values["comments"]
+            for word in value.replace(",", " ").replace("&", " ").replace("/", " ").split()
+        }
+        for record in records:
+            words = record["comments"].replace(",", " ").replace("&", " ").replace("/", " ").split()
+            self.assertTrue({word.lower() for word in words} <= source_words)
+    
+    def test_duplicates(self):
+        """Test that a fraction of records repeats earlier casting numbers."""
+        records = list(generate_records(self.model, 2000, seed=1, duplicates=0.1))
+        repeated = len(records) - len({record["casting"] for record in records})
+        
+        self.assertGreater(repeated, 100)
+        self.assertLess(repeated, 300)
+    
+    def test_casting_numbers_move_to_longer_lengths(self):
+        """Test that casting numbers stay unique when a length runs out."""
+        numbers = CastingNumbers(random.Random(0))
+        generated = [numbers.next(1) for _ in range(20)]
+        
+        self.assertEqual(len(set(generated)), 20)
+        self.assertEqual(sorted(generated[:9]), [str(digit) for digit in range(1, 10)])
+        self.assertTrue(all(len(number) == 2 for number in generated[9:]))
+    
+    def test_sqlite_matches_csv_import(self):
+        """Test that a generated database equals importing the generated CSV."""
+        records = list(generate_records(self.model, 2000, seed=5))
+        self.assertEqual(write_csv(records, self.csv_path), 2000)
+        self.assertEqual(write_sqlite(records, self.sqlite_path, batch_size=300), 2000)
+        
+        import_csv_with_core(self.csv_path, self.db, column_mapping=CHEV_COLUMN_MAPPING)
+        imported = sorted(
+            tuple(getattr(casting, column) for column in CASTING_COLUMNS)
+            for casting in self.db.query(CastingModel).all()
+        )
+        
+        connection = sqlite3.connect(self.sqlite_path)
+        try:
+            generated = sorted(connection.execute(
+                f"SELECT {', '.join(CASTING_COLUMNS)} FROM castings"
+            ).fetchall())
+            
+            # The deferred full-text index, facet summary and triggers are
+            # in place
+            fts_count = connection.execute(
+                "SELECT COUNT(*) FROM castings_fts WHERE castings_fts MATCH '\"truck\"*'"
+            ).fetchone()[0]
+            like_count = connection.execute(
+                "SELECT COUNT(*) FROM castings WHERE comments LIKE '%truck%'"
+            ).fetchone()[0]
+            triggers = connection.execute(
+                "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger'"
+            ).fetchone()[0]
+            total = connection.execute(
+                "SELECT count FROM casting_facets WHERE facet = 'total'"
+            ).fetchone()[0]
+            cids = connection.execute(
+                "SELECT COUNT(*) FROM casting_facets WHERE facet = 'cid'"
+            ).fetchone()[0]
+        finally:
+            connection.close()
+        
+        self.assertEqual(generated, imported)
+        self.assertEqual(fts_count, like_count)
+        self.assertEqual(triggers, 10)
+        self.assertEqual(total, 2000)
+        self.assertEqual(cids, len({row[CASTING_COLUMNS.index("cid")] for row in imported} - {None}))
+    
+    def test_sqlite_keeps_first_duplicate(self):
+        """Test that a repeated casting number keeps its first record."""
+        records = list(generate_records(self.model, 1000, seed=2, duplicates=0.2))
+        unique = len({record["casting"] for record in records})
+        
+        self.assertEqual(write_sqlite(records, self.sqlite_path), unique)
+        
+        first = {}
+        for record in records:
+            first.setdefault(record["casting"], record)
+        
+        connection = sqlite3.connect(self.sqlite_path)
+        try:
+            stored = dict(connection.execute("SELECT casting, years FROM castings").fetchall())
+        finally:
+            connection.close()
+        
+        self.assertEqual(stored, {casting: record["years"] for casting, record in first.items()})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest import mock
+
+# The Flask app imports its modules from its own directory
+sys.path.append(os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "flask_web_interface",
+))
+
+from health_monitor import HealthMonitor
+
+
+class TestHealthMonitor(unittest.TestCase):
+    """Test cases for the Flask app's API health monitor."""
+    
+    def setUp(self):
+        """Create a monitor around a mocked API client."""
+        self.api_client = mock.Mock()
+        self.api_client.health_check.return_value = True
+        self.monitor = HealthMonitor(self.api_client, interval=0.01)
+    
+    def tearDown(self):
+        self.monitor.stop()
+    
+    def wait_for_probes(self, count, timeout=5.0):
+        """Wait until the background thread has probed the API `count` times."""
+        deadline = time.monotonic() + timeout
+        while self.api_client.health_check.call_count < count:
+            if time.monotonic() > deadline:
+                self.fail(f"expected {count} probes")
+            time.sleep(0.005)
+    
+    def test_initial_status(self):
+        """Test that the status is unknown before the first probe."""
+        status = self.monitor.status()
+        
+        self.assertIsNone(status["connected"])
+        self.assertIsNone(status["latency_ms"])
+        self.assertIsNone(status["last_checked"])
+        self.assertIsNone(status["last_success"])
+        self.assertEqual(status["consecutive_failures"], 0)
+        self.api_client.health_check.assert_not_called()
+    
+    def test_check_success(self):
+        """Test that a successful probe records the time of the success."""
+        self.assertTrue(self.monitor.check_now())
+        
+        status = self.monitor.status()
+        self.assertTrue(status["connected"])
+        self.assertEqual(status["consecutive_failures"], 0)
+        self.assertIsNotNone(status["latency_ms"])
+        self.assertEqual(status["last_success"], status["last_checked"])
+    
+    def test_failures_counted_and_reset(self):
+        """Test that failures accumulate until the next successful probe."""
+        self.monitor.check_now()
+        last_success = self.monitor.status()["last_success"]
+        
+        self.api_client.health_check.return_value = False
+        self.assertFalse(self.monitor.check_now())
+        self.assertFalse(self.monitor.check_now())
+        
+        status = self.monitor.status()
+        self.assertFalse(status["connected"])
+        self.assertEqual(status["consecutive_failures"], 2)
+        self.assertEqual(status["last_success"], last_success)
+        self.assertGreaterEqual(status["last_checked"], last_success)
+        
+        self.api_client.health_check.return_value = True
+        self.assertTrue(self.monitor.check_now())
+        
+        status = self.monitor.status()
+        self.assertTrue(status["connected"])
+        self.assertEqual(status["consecutive_failures"], 0)
+        self.assertGreaterEqual(status["last_success"], last_success)
+    
+    def test_probe_exception_is_failure(self):
+        """Test that an exception from the client counts as disconnected."""
+        self.api_client.health_check.side_effect = Exception("boom")
+        
+        self.assertFalse(self.monitor.check_now())
+        
+        status = self.monitor.status()
+        self.assertFalse(status["connected"])
+        self.assertEqual(status["consecutive_failures"], 1)
+        self.assertIsNone(status["last_success"])
+    
+    def test_status_is_a_copy(self):
+        """Test that callers cannot change the cached status."""
+        self.monitor.status()["connected"] = True
+        
+        self.assertIsNone(self.monitor.status()["connected"])
+    
+    def test_start_and_stop(self):
+        """Test that the thread probes until it is stopped."""
+        self.monitor.start()
+        thread = self.monitor._thread
+        self.assertTrue(thread.is_alive())
+        self.assertTrue(thread.daemon)
+        
+        self.wait_for_probes(3)
+        self.assertTrue(self.monitor.status()["connected"])
+        
+        self.monitor.stop()
+        self.assertFalse(thread.is_alive())
+        self.assertIsNone(self.monitor._thread)
+        
+        probes = self.api_client.health_check.call_count
+        time.sleep(0.05)
+        self.assertEqual(self.api_client.health_check.call_count, probes)
+    
+    def test_start_twice_keeps_one_thread(self):
+        """Test that starting a running monitor does not add a thread."""
+        self.monitor.start()
+        thread = self.monitor._thread
+        self.monitor.start()
+        
+        self.assertIs(self.monitor._thread, thread)
+        running = [
+            t for t in threading.enumerate() if t.name == "api-health-monitor"
+        ]
+        self.assertEqual(running, [thread])
+    
+    def test_restart_after_stop(self):
+        """Test that a stopped monitor can be started again."""
+        self.monitor.start()
+        self.wait_for_probes(1)
+        self.monitor.stop()
+        
+        probes = self.api_client.health_check.call_count
+        self.monitor.start()
+        self.assertTrue(self.monitor._thread.is_alive())
+        self.wait_for_probes(probes + 1)
+    
+    def test_stop_without_start(self):
+        """Test that stopping a monitor that never started does nothing."""
+        self.monitor.stop()
+        
+        self.assertIsNone(self.monitor._thread)
+        self.api_client.health_check.assert_not_called()
+    
+    def test_stop_interrupts_wait(self):
+        """Test that stop does not wait for the rest of the interval."""
+        monitor = HealthMonitor(self.api_client, interval=60.0)
+        monitor.start()
+        self.wait_for_probes(1)
+        
+        started = time.monotonic()
+        monitor.stop()
+        
+        self.assertLess(time.monotonic() - started, 5.0)
+        self.assertEqual(self.api_client.health_check.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
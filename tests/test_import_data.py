@@ -1,6 +1,9 @@
+import csv
 import os
 import sys
 import unittest
+from unittest.mock import patch
+import pandas as pd
 from sqlalchemy.orm import Session
 
 # Add parent directory to path to allow imports
@@ -8,7 +11,23 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.db.database import engine, Base, SessionLocal
 from app.models.casting import Casting as CastingModel
-from app.utils.import_data import import_csv_with_pandas, import_csv_with_csv_reader
+from app.utils.import_data import (
+    CASTING_COLUMNS,
+    CHEV_COLUMN_MAPPING,
+    clean_data,
+    clean_dataframe,
+    import_csv_parallel,
+    import_csv_streaming,
+    import_csv_with_core,
+    import_csv_with_pandas,
+    import_csv_with_csv_reader,
+    import_chev_casting_data,
+    iter_csv_chunks,
+    main,
+    parse_years,
+    shard_file,
+    sync_csv,
+)
 
 
 class TestImportData(unittest.TestCase):
@@ -133,6 +152,394 @@ class TestImportData(unittest.TestCase):
             if os.path.exists(temp_csv_path):
                 os.remove(temp_csv_path)
 
+    
+    def test_import_csv_with_core(self):
+        """Test importing CSV data with Core bulk upserts."""
+        temp_csv_path = os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            "temp_core_data.csv"
+        )
+        
+        with open(temp_csv_path, "w", newline="", encoding="utf-8-sig") as f:
+            f.write("Years,Casting,CID,Low Power,High Power,Main Caps,Comments,\n")
+            f.write("1980-85,140029,350,-,-,2,cars,\n")
+            f.write('1975,355909,262,110,110,2,"car, truck",\n')
+            f.write("1976-85,355909,305,-,-,2,A,\n")
+            f.write("1955,3703524,265,195,_,2,,\n")
+        
+        try:
+            # The first row of a repeated casting number wins
+            total_imported = import_csv_with_core(
+                temp_csv_path,
+                self.db,
+                column_mapping=CHEV_COLUMN_MAPPING,
+                batch_size=2
+            )
+            self.assertEqual(total_imported, 3)
+            self.assertEqual(self.db.query(CastingModel).count(), 3)
+            
+            casting = self.db.query(CastingModel).filter(
+                CastingModel.casting == "355909"
+            ).one()
+            self.assertEqual(casting.cid, 262)
+            self.assertEqual(casting.years, "1975")
+            self.assertEqual((casting.start_year, casting.end_year), (1975, 1975))
+            self.assertEqual(casting.low_power, "110")
+            
+            casting = self.db.query(CastingModel).filter(
+                CastingModel.casting == "3703524"
+            ).one()
+            self.assertIsNone(casting.high_power)
+            self.assertIsNone(casting.comments)
+            
+            # Re-importing updates rows in place
+            import_csv_with_core(
+                temp_csv_path,
+                self.db,
+                column_mapping=CHEV_COLUMN_MAPPING
+            )
+            self.assertEqual(self.db.query(CastingModel).count(), 3)
+        
+        finally:
+            # Remove temporary file
+            if os.path.exists(temp_csv_path):
+                os.remove(temp_csv_path)
+    
+    def test_import_csv_streaming(self):
+        """Test importing CSV data in fixed-size chunks."""
+        temp_csv_path = os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            "temp_stream_data.csv"
+        )
+        
+        with open(temp_csv_path, "w", newline="", encoding="utf-8-sig") as f:
+            f.write("Years,Casting,CID,Low Power,High Power,Main Caps,Comments,\n")
+            for i in range(25):
+                f.write(f'1980-85,{14010200 + i},305,-,-,2,"car, truck",\n')
+            # Repeats of a casting number from an earlier chunk and from
+            # the same chunk are skipped
+            f.write('1986,14010200,350,-,-,4,"truck",\n')
+            f.write('1986,14010224,350,-,-,4,"truck",\n')
+        
+        try:
+            chunks = list(iter_csv_chunks(temp_csv_path, CHEV_COLUMN_MAPPING, chunk_size=10))
+            self.assertEqual([len(chunk) for chunk, _ in chunks], [10, 10, 7])
+            self.assertEqual(chunks[-1][1], os.path.getsize(temp_csv_path))
+            self.assertEqual(chunks[0][0][0]["casting"], "14010200")
+            self.assertEqual(chunks[0][0][0]["start_year"], 1980)
+            self.assertIsNone(chunks[0][0][0]["low_power"])
+            
+            total_imported = import_csv_streaming(
+                temp_csv_path,
+                self.db,
+                column_mapping=CHEV_COLUMN_MAPPING,
+                batch_size=10
+            )
+            self.assertEqual(total_imported, 25)
+            self.assertEqual(self.db.query(CastingModel).count(), 25)
+            
+            for casting_number in ("14010200", "14010224"):
+                casting = self.db.query(CastingModel).filter(
+                    CastingModel.casting == casting_number
+                ).first()
+                self.assertEqual(casting.cid, 305)
+                self.assertEqual(casting.start_year, 1980)
+        
+        finally:
+            # Remove temporary file
+            if os.path.exists(temp_csv_path):
+                os.remove(temp_csv_path)
+    
+    def test_import_csv_streaming_blank_lines(self):
+        """Test that blank lines are skipped when streaming a CSV file."""
+        temp_csv_path = os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            "temp_stream_blank_data.csv"
+        )
+        
+        with open(temp_csv_path, "w", newline="", encoding="utf-8-sig") as f:
+            f.write("Years,Casting,CID,Low Power,High Power,Main Caps,Comments,\n")
+            f.write("1980-85,140029,350,-,-,2,cars,\n")
+            f.write("\n")
+            f.write("1975,355909,262,110,110,2,trucks,\n")
+            f.write("\n")
+        
+        try:
+            chunks = list(iter_csv_chunks(temp_csv_path, CHEV_COLUMN_MAPPING))
+            self.assertEqual(
+                [record["casting"] for record in chunks[0][0]],
+                ["140029", "355909"]
+            )
+            
+            total_imported = import_csv_streaming(
+                temp_csv_path,
+                self.db,
+                column_mapping=CHEV_COLUMN_MAPPING
+            )
+            self.assertEqual(total_imported, 2)
+            self.assertEqual(self.db.query(CastingModel).count(), 2)
+        
+        finally:
+            # Remove temporary file
+            if os.path.exists(temp_csv_path):
+                os.remove(temp_csv_path)
+    
+    def test_import_csv_parallel(self):
+        """Test importing CSV shards parsed by worker processes."""
+        temp_csv_path = os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            "temp_parallel_data.csv"
+        )
+        
+        with open(temp_csv_path, "w", newline="", encoding="utf-8-sig") as f:
+            f.write("Years,Casting,CID,Low Power,High Power,Main Caps,Comments,\n")
+            for i in range(50):
+                f.write(f'1980-85,{14010200 + i},305,-,-,2,"car, truck",\n')
+            # A repeated casting number is skipped
+            f.write('1986,14010200,350,-,-,4,"truck",\n')
+        
+        try:
+            header, shards = shard_file(temp_csv_path, shard_bytes=200)
+            self.assertEqual(header[1], "Casting")
+            self.assertGreater(len(shards), 1)
+            self.assertEqual(shards[-1][1], os.path.getsize(temp_csv_path))
+            for (_, end), (start, _) in zip(shards, shards[1:]):
+                self.assertEqual(end, start)
+            
+            total_imported = import_csv_parallel(
+                temp_csv_path,
+                self.db,
+                column_mapping=CHEV_COLUMN_MAPPING,
+                batch_size=10,
+                workers=2,
+                shard_bytes=200
+            )
+            self.assertEqual(total_imported, 50)
+            self.assertEqual(self.db.query(CastingModel).count(), 50)
+            
+            casting = self.db.query(CastingModel).filter(
+                CastingModel.casting == "14010200"
+            ).first()
+            self.assertEqual(casting.cid, 305)
+            self.assertEqual(casting.start_year, 1980)
+            self.assertEqual(casting.comments, "car, truck")
+        
+        finally:
+            # Remove temporary file
+            if os.path.exists(temp_csv_path):
+                os.remove(temp_csv_path)
+    
+    def test_sync_csv(self):
+        """Test that a sync applies only the changed rows."""
+        temp_csv_path = os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            "temp_sync_data.csv"
+        )
+        header = "Years,Casting,CID,Low Power,High Power,Main Caps,Comments,\n"
+        
+        try:
+            with open(temp_csv_path, "w", newline="", encoding="utf-8-sig") as f:
+                f.write(header)
+                f.write("1980-85,140029,350,-,-,2,cars,\n")
+                f.write('1975,355909,262,110,110,2,"car, truck",\n')
+                f.write("1976-85,355909,305,-,-,2,A,\n")
+                f.write("1955,3703524,265,195,_,2,,\n")
+            
+            summary = sync_csv(temp_csv_path, self.db, column_mapping=CHEV_COLUMN_MAPPING)
+            self.assertEqual(summary["inserted"], 3)
+            self.assertEqual(summary["duplicates"], 1)
+            self.assertEqual(self.db.query(CastingModel).count(), 3)
+            
+            unchanged = self.db.query(CastingModel).filter(
+                CastingModel.casting == "355909"
+            ).one()
+            unchanged_id = unchanged.id
+            self.assertEqual(unchanged.cid, 262)
+            
+            # Correct one row, drop one and add one
+            with open(temp_csv_path, "w", newline="", encoding="utf-8-sig") as f:
+                f.write(header)
+                f.write("1980-86,140029,350,-,-,2,cars,\n")
+                f.write('1975,355909,262,110,110,2,"car, truck",\n')
+                f.write("1969-79,3970010,350,-,-,2 or 4,car,\n")
+            
+            summary = sync_csv(temp_csv_path, self.db, column_mapping=CHEV_COLUMN_MAPPING, dry_run=True)
+            self.assertEqual(
+                summary,
+                {"inserted": 1, "updated": 1, "deleted": 1, "unchanged": 1, "duplicates": 0}
+            )
+            self.assertEqual(self.db.query(CastingModel).count(), 3)
+            
+            summary = sync_csv(temp_csv_path, self.db, column_mapping=CHEV_COLUMN_MAPPING)
+            self.assertEqual(summary["updated"], 1)
+            self.db.expire_all()
+            
+            castings = {
+                casting.casting: casting for casting in self.db.query(CastingModel).all()
+            }
+            self.assertEqual(sorted(castings), ["140029", "355909", "3970010"])
+            self.assertEqual(castings["140029"].years, "1980-86")
+            self.assertEqual(castings["140029"].end_year, 1986)
+            self.assertEqual(castings["355909"].id, unchanged_id)
+            
+            # Nothing changes the second time
+            summary = sync_csv(temp_csv_path, self.db, column_mapping=CHEV_COLUMN_MAPPING)
+            self.assertEqual(summary["unchanged"], 3)
+            self.assertEqual(summary["inserted"] + summary["updated"] + summary["deleted"], 0)
+        
+        finally:
+            # Remove temporary file
+            if os.path.exists(temp_csv_path):
+                os.remove(temp_csv_path)
+    
+    def test_import_chev_casting_data_duplicates(self):
+        """Test that the default importer handles repeated casting numbers."""
+        chev_csv_path = os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            "chev-casting.csv"
+        )
+        with open(chev_csv_path, "r", newline="", encoding="utf-8-sig") as f:
+            rows = list(csv.DictReader(f))
+        unique = len({row["Casting"] for row in rows})
+        self.assertLess(unique, len(rows))
+        
+        # Rows actually written are reported, and re-importing updates in place
+        for _ in range(2):
+            total_imported = import_chev_casting_data(chev_csv_path, self.db, batch_size=100)
+            self.assertEqual(total_imported, unique)
+            self.assertEqual(self.db.query(CastingModel).count(), unique)
+        
+        # The first row of a repeated casting number wins
+        first = next(row for row in rows if row["Casting"] == "355909")
+        casting = self.db.query(CastingModel).filter(CastingModel.casting == "355909").one()
+        self.assertEqual(casting.years, first["Years"])
+        
+        summary = sync_csv(chev_csv_path, self.db, column_mapping=CHEV_COLUMN_MAPPING, dry_run=True)
+        self.assertEqual(summary["unchanged"], unique)
+    
+    def test_sync_after_import_is_noop(self):
+        """Test that syncing the file a database was imported from changes nothing."""
+        chev_csv_path = os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            "chev-casting.csv"
+        )
+        importers = [
+            lambda: import_csv_with_core(chev_csv_path, self.db, column_mapping=CHEV_COLUMN_MAPPING, batch_size=50),
+            lambda: import_csv_streaming(chev_csv_path, self.db, column_mapping=CHEV_COLUMN_MAPPING, batch_size=50),
+            lambda: import_csv_parallel(
+                chev_csv_path, self.db, column_mapping=CHEV_COLUMN_MAPPING, workers=2, shard_bytes=2000
+            ),
+        ]
+        
+        for importer in importers:
+            self.db.query(CastingModel).delete()
+            self.db.commit()
+            
+            total_imported = importer()
+            self.assertEqual(total_imported, self.db.query(CastingModel).count())
+            
+            summary = sync_csv(chev_csv_path, self.db, column_mapping=CHEV_COLUMN_MAPPING, dry_run=True)
+            self.assertGreater(summary["duplicates"], 0)
+            self.assertEqual(summary["inserted"] + summary["updated"] + summary["deleted"], 0)
+            self.assertEqual(summary["unchanged"], total_imported)
+    
+    def test_main_rejects_workers_with_other_methods(self):
+        """Test that --workers is only accepted with the Core method."""
+        for method in ("pandas", "csv", "chev", "stream"):
+            argv = ["import_data", "chev-casting.csv", "--method", method, "--workers", "4"]
+            with patch("sys.argv", argv), patch("sys.stderr"), patch(
+                "app.utils.import_data.import_csv_parallel"
+            ) as import_csv_parallel:
+                with self.assertRaises(SystemExit) as raised:
+                    main()
+            self.assertEqual(raised.exception.code, 2)
+            import_csv_parallel.assert_not_called()
+    
+    def test_parse_years(self):
+        """Test parsing production years into numeric ranges."""
+        self.assertEqual(parse_years("1955"), (1955, 1955))
+        self.assertEqual(parse_years("1980-85"), (1980, 1985))
+        self.assertEqual(parse_years("1985-94"), (1985, 1994))
+        self.assertEqual(parse_years("1998-02"), (1998, 2002))
+        self.assertEqual(parse_years("1980-1985"), (1980, 1985))
+        self.assertEqual(parse_years(1955), (1955, 1955))
+        self.assertEqual(parse_years(None), (None, None))
+        self.assertEqual(parse_years("unknown"), (None, None))
+    
+    def test_clean_data_parses_years(self):
+        """Test that clean_data adds the parsed year range."""
+        cleaned = clean_data({"years": "1973-80", "casting": "330817", "cid": "400"})
+        self.assertEqual(cleaned["start_year"], 1973)
+        self.assertEqual(cleaned["end_year"], 1980)
+        self.assertEqual(cleaned["cid"], 400)
+        
+        cleaned = clean_data({"years": "-", "casting": "330817"})
+        self.assertIsNone(cleaned["start_year"])
+        self.assertIsNone(cleaned["end_year"])
+        
+        # Records without a years column are left alone
+        self.assertNotIn("start_year", clean_data({"casting": "330817"}))
+
+    
+    def test_clean_dataframe_matches_clean_data(self):
+        """Test that vectorised cleaning matches clean_data row by row."""
+        chev_csv_path = os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            "chev-casting.csv"
+        )
+        
+        with open(chev_csv_path, "r", newline="", encoding="utf-8-sig") as f:
+            expected = [
+                clean_data({
+                    db_col: row[csv_col]
+                    for csv_col, db_col in CHEV_COLUMN_MAPPING.items()
+                })
+                for row in csv.DictReader(f)
+            ]
+        expected = [
+            tuple(record.get(column) for column in CASTING_COLUMNS)
+            for record in expected
+        ]
+        
+        df = pd.read_csv(chev_csv_path, dtype=str, keep_default_na=False)
+        self.assertEqual(clean_dataframe(df, CHEV_COLUMN_MAPPING), expected)
+    
+    def test_clean_dataframe_edge_cases(self):
+        """Test vectorised cleaning of unusual values."""
+        records = [
+            {"years": "1998-02", "casting": "10243880", "cid": "350", "high_power": "_"},
+            {"years": "-", "casting": "3970010", "cid": "", "high_power": "300"},
+            {"years": "1969-1979", "casting": "3970014", "cid": "350/400", "high_power": "-"},
+            {"years": "unknown", "casting": "3970020", "cid": "-", "high_power": ""},
+            {"years": "1970", "casting": "3970021", "cid": "350.0", "high_power": ""},
+            {"years": "1970", "casting": "3970022", "cid": " 400 ", "high_power": ""},
+            {"years": "1970", "casting": "3970023", "cid": "3.5e2", "high_power": ""},
+        ]
+        df = pd.DataFrame(records).assign(**{"Unnamed: 4": ""})
+        
+        expected = [
+            tuple(clean_data(record).get(column) for column in CASTING_COLUMNS)
+            for record in records
+        ]
+        rows = clean_dataframe(df)
+        self.assertEqual(rows, expected)
+        
+        row = dict(zip(CASTING_COLUMNS, rows[0]))
+        self.assertEqual((row["start_year"], row["end_year"]), (1998, 2002))
+        self.assertIs(type(row["cid"]), int)
+        self.assertIsNone(row["high_power"])
+        self.assertEqual(dict(zip(CASTING_COLUMNS, rows[2]))["cid"], "350/400")
+        
+        # Float-formatted CIDs are kept as written by both cleaners, so the
+        # row hashes of reset_db and sync agree
+        self.assertEqual(dict(zip(CASTING_COLUMNS, rows[4]))["cid"], "350.0")
+        self.assertEqual(dict(zip(CASTING_COLUMNS, rows[5]))["cid"], 400)
+        self.assertEqual(dict(zip(CASTING_COLUMNS, rows[6]))["cid"], "3.5e2")
+        self.assertEqual(
+            [row[-1] for row in rows],
+            [clean_data(record)["row_hash"] for record in records]
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,12 +1,13 @@
 import os
 import sys
 import unittest
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
 # Add parent directory to path to allow imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.main import app
+from app.main import app, include_casting_routes
 
 
 class TestMain(unittest.TestCase):
@@ -47,6 +48,28 @@ class TestMain(unittest.TestCase):
         self.assertIn("/api/castings/", schema["paths"])
         self.assertIn("/api/castings/{casting_number}", schema["paths"])
         self.assertIn("/api/castings/search/", schema["paths"])
+    
+    def test_async_mode_routes(self):
+        """Test that async mode registers every casting route once."""
+        async_app = FastAPI()
+        include_casting_routes(async_app, "async")
+        
+        routes = [
+            (route.path, method, route.endpoint.__module__)
+            for route in async_app.routes if hasattr(route, "methods") and route.path.startswith("/api/")
+            for method in route.methods
+        ]
+        self.assertEqual(len(routes), len({route[:2] for route in routes}))
+        self.assertIn(("/api/castings/search/", "GET", "app.api.endpoints.casting_async"), routes)
+        self.assertIn(("/api/castings/facets/", "GET", "app.api.endpoints.casting"), routes)
+        
+        schema = async_app.openapi()
+        operation_ids = [
+            operation["operationId"]
+            for path in schema["paths"].values()
+            for operation in path.values()
+        ]
+        self.assertEqual(len(operation_ids), len(set(operation_ids)))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,149 @@
+import os
+import sys
+import unittest
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.main import app
+from app.api.metrics import Histogram, MetricsRegistry, metrics
+from app.db.casting_index import casting_index
+from app.db.database import engine, Base, SessionLocal
+from app.models.casting import Casting as CastingModel
+
+
+class TestMetrics(unittest.TestCase):
+    """Test cases for the metrics endpoint."""
+    
+    def setUp(self):
+        """Set up test database and client."""
+        # Create test client
+        self.client = TestClient(app)
+        
+        # Create tables
+        Base.metadata.create_all(bind=engine)
+        
+        # Insert test data
+        db = SessionLocal()
+        try:
+            db.query(CastingModel).delete()
+            db.add_all([
+                CastingModel(casting="3970010", years="1969-79", cid=350),
+                CastingModel(casting="14088526", years="1987", cid=350, comments="Camaro"),
+            ])
+            db.commit()
+        finally:
+            db.close()
+        
+        # Start from empty metrics
+        metrics.clear()
+    
+    def tearDown(self):
+        """Clean up after tests."""
+        casting_index.clear()
+        
+        # Drop tables
+        Base.metadata.drop_all(bind=engine)
+    
+    def scrape(self):
+        """Fetch /metrics and return its samples by name and labels."""
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/plain; version=0.0.4"))
+        
+        samples = {}
+        for line in response.text.splitlines():
+            if line and not line.startswith("#"):
+                name, value = line.rsplit(" ", 1)
+                samples[name] = float(value)
+        return samples
+    
+    def test_request_metrics(self):
+        """Test request counts, sizes and database work per route."""
+        response = self.client.get("/api/castings/")
+        self.client.get("/api/castings/", params={"limit": 1})
+        self.client.get("/api/castings/9999999")
+        self.client.get("/no/such/path")
+        
+        samples = self.scrape()
+        route = 'method="GET",route="/api/castings/"'
+        self.assertEqual(samples[f'http_requests_total{{{route},status="200"}}'], 2)
+        self.assertEqual(samples[f'http_request_duration_seconds_count{{{route}}}'], 2)
+        self.assertEqual(samples[f'http_request_duration_seconds_bucket{{{route},le="+Inf"}}'], 2)
+        self.assertGreaterEqual(
+            samples[f'http_response_size_bytes_sum{{{route}}}'], len(response.content)
+        )
+        self.assertEqual(samples[f'http_request_db_queries_sum{{{route}}}'], 2)
+        self.assertGreater(samples[f'http_request_db_duration_seconds_sum{{{route}}}'], 0)
+        
+        # Routes are labelled by template, and unknown paths share one label
+        self.assertEqual(
+            samples['http_requests_total{method="GET",route="/api/castings/{casting_id}",status="404"}'],
+            1
+        )
+        self.assertEqual(
+            samples['http_requests_total{method="GET",route="<unmatched>",status="404"}'], 1
+        )
+        
+        # Only the scrape itself is in progress
+        self.assertEqual(samples['http_requests_in_progress{method="GET"}'], 1)
+        self.assertGreaterEqual(samples["db_queries_total"], 3)
+    
+    def test_not_modified_responses_are_measured(self):
+        """Test that 304 responses from the ETag middleware get a route label."""
+        casting_index.load()
+        etag = self.client.get("/api/castings/3970010").headers["etag"]
+        response = self.client.get("/api/castings/3970010", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        
+        samples = self.scrape()
+        route = 'method="GET",route="/api/castings/{casting_id}"'
+        self.assertEqual(samples[f'http_requests_total{{{route},status="304"}}'], 1)
+        self.assertEqual(samples[f'http_request_db_queries_sum{{{route}}}'], 0)
+    
+    def test_failed_queries_leave_no_state(self):
+        """Test that failing statements leave nothing behind on the connection."""
+        with engine.connect() as connection:
+            def snapshot():
+                return {
+                    key: list(value) if isinstance(value, list) else value
+                    for key, value in connection.info.items()
+                }
+            
+            info = snapshot()
+            for _ in range(3):
+                with self.assertRaises(OperationalError):
+                    connection.exec_driver_sql("SELECT * FROM no_such_table")
+            
+            metrics.clear()
+            connection.exec_driver_sql("SELECT 1").all()
+            self.assertEqual(snapshot(), info)
+        
+        samples = self.scrape()
+        self.assertEqual(samples["db_queries_total"], 1)
+    
+    def test_histogram_rendering(self):
+        """Test the Prometheus text rendering of histograms."""
+        histogram = Histogram("test_seconds", "Test histogram.", (0.1, 1.0))
+        labels = (("route", 'a "quoted"\\path'),)
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(labels, value)
+        
+        route = 'route="a \\"quoted\\"\\\\path"'
+        self.assertEqual(histogram.render(), [
+            "# HELP test_seconds Test histogram.",
+            "# TYPE test_seconds histogram",
+            f'test_seconds_bucket{{{route},le="0.1"}} 2',
+            f'test_seconds_bucket{{{route},le="1"}} 3',
+            f'test_seconds_bucket{{{route},le="+Inf"}} 4',
+            f"test_seconds_sum{{{route}}} 3.65",
+            f"test_seconds_count{{{route}}} 4",
+        ])
+        
+        self.assertIn("# TYPE http_requests_total counter", MetricsRegistry().render())
+
+
+if __name__ == "__main__":
+    unittest.main()
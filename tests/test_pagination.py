@@ -0,0 +1,139 @@
+import os
+import sys
+import unittest
+from fastapi.testclient import TestClient
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.main import app
+from app.api.pagination import decode_cursor, encode_cursor
+from app.db.database import engine, Base, SessionLocal
+from app.models.casting import Casting as CastingModel
+
+
+class TestPagination(unittest.TestCase):
+    """Test cases for cursor pagination."""
+    
+    def setUp(self):
+        """Set up test database and client."""
+        # Create test client
+        self.client = TestClient(app)
+        
+        # Create tables
+        Base.metadata.create_all(bind=engine)
+        
+        # Insert test data
+        db = SessionLocal()
+        try:
+            db.query(CastingModel).delete()
+            db.add_all([
+                CastingModel(
+                    casting=str(3900000 + i),
+                    cid=350 if i % 2 else 327,
+                    comments="car, truck" if i % 3 else "truck",
+                )
+                for i in range(25)
+            ])
+            db.commit()
+        finally:
+            db.close()
+    
+    def tearDown(self):
+        """Clean up after tests."""
+        # Drop tables
+        Base.metadata.drop_all(bind=engine)
+    
+    def follow_cursors(self, url, params):
+        """Fetch every page of a listing by following cursors."""
+        pages = []
+        params = dict(params)
+        while True:
+            response = self.client.get(url, params=params)
+            self.assertEqual(response.status_code, 200)
+            pages.append([casting["casting"] for casting in response.json()])
+            
+            next_cursor = response.headers.get("X-Next-Cursor")
+            if next_cursor is None:
+                self.assertNotIn("Link", response.headers)
+                return pages
+            
+            self.assertIn(f"cursor={next_cursor}", response.headers["Link"])
+            params["cursor"] = next_cursor
+    
+    def test_cursor_round_trip(self):
+        """Test encoding and decoding cursors."""
+        cursor = encode_cursor([-1.25, 42])
+        self.assertEqual(decode_cursor(cursor, 2), [-1.25, 42])
+    
+    def test_list_pages(self):
+        """Test following cursors through the list endpoint."""
+        pages = self.follow_cursors("/api/castings/", {"limit": 10})
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+        
+        castings = [casting for page in pages for casting in page]
+        self.assertEqual(castings, [str(3900000 + i) for i in range(25)])
+    
+    def test_exact_last_page(self):
+        """Test that a full last page does not advertise another page."""
+        pages = self.follow_cursors("/api/castings/", {"limit": 25})
+        self.assertEqual([len(page) for page in pages], [25])
+    
+    def test_search_pages(self):
+        """Test following cursors through the search endpoint."""
+        pages = self.follow_cursors("/api/castings/search/", {"cid": 350, "limit": 5})
+        self.assertEqual([len(page) for page in pages], [5, 5, 2])
+        
+        castings = [casting for page in pages for casting in page]
+        self.assertEqual(castings, [str(3900000 + i) for i in range(1, 25, 2)])
+    
+    def test_comment_search_pages(self):
+        """Test following cursors through relevance-ordered results."""
+        response = self.client.get("/api/castings/search/", params={"comments": "truck", "limit": 100})
+        expected = [casting["casting"] for casting in response.json()]
+        self.assertEqual(len(expected), 25)
+        
+        pages = self.follow_cursors("/api/castings/search/", {"comments": "truck", "limit": 7})
+        self.assertEqual([len(page) for page in pages], [7, 7, 7, 4])
+        self.assertEqual([casting for page in pages for casting in page], expected)
+    
+    def test_invalid_cursor(self):
+        """Test that a malformed cursor is rejected."""
+        response = self.client.get("/api/castings/", params={"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 400)
+        
+        response = self.client.get(
+            "/api/castings/search/",
+            params={"comments": "truck", "cursor": encode_cursor([5])}
+        )
+        self.assertEqual(response.status_code, 400)
+    
+    def test_invalid_cursor_values(self):
+        """Test that a cursor with values of the wrong type is rejected."""
+        for values in ([{}], ["x"], [True], [1.5]):
+            response = self.client.get("/api/castings/", params={"cursor": encode_cursor(values)})
+            self.assertEqual(response.status_code, 400, values)
+        
+        for values in (["x", 1], [False, 1], [-1.5, "1"]):
+            response = self.client.get(
+                "/api/castings/search/",
+                params={"comments": "truck", "cursor": encode_cursor(values)}
+            )
+            self.assertEqual(response.status_code, 400, values)
+        
+        response = self.client.get(
+            "/api/castings/search/",
+            params={"comments": "truck", "cursor": encode_cursor([-1.5, 1])}
+        )
+        self.assertEqual(response.status_code, 200)
+    
+    def test_invalid_page_size(self):
+        """Test that skip and limit values that cannot page are rejected."""
+        for path in ("/api/castings/", "/api/castings/search/"):
+            for params in ({"limit": 0}, {"limit": -1}, {"limit": 1001}, {"skip": -1}):
+                response = self.client.get(path, params=params)
+                self.assertEqual(response.status_code, 422, (path, params))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import csv
+import os
+import sys
+import unittest
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.database import engine, Base, SessionLocal
+from app.models.casting import Casting as CastingModel
+from reset_db import import_data
+
+
+class TestResetDb(unittest.TestCase):
+    """Test cases for the reset_db import."""
+
+    def setUp(self):
+        """Set up test database and files."""
+        # Create tables
+        Base.metadata.create_all(bind=engine)
+
+        # Create session
+        self.db = SessionLocal()
+
+        # Clear existing data
+        self.db.query(CastingModel).delete()
+        self.db.commit()
+
+        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.temp_csv_path = os.path.join(base_dir, "temp_reset_data.csv")
+        self.report_path = os.path.join(base_dir, "temp_rejected_rows.csv")
+
+    def tearDown(self):
+        """Clean up after tests."""
+        # Close session
+        self.db.close()
+
+        # Drop tables
+        Base.metadata.drop_all(bind=engine)
+
+        # Remove temporary files
+        for path in (self.temp_csv_path, self.report_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_import_data_skips_and_reports_bad_rows(self):
+        """Test that bad rows are skipped and reported without losing their batch."""
+        with open(self.temp_csv_path, "w", newline="", encoding="utf-8-sig") as f:
+            f.write("Years,Casting,CID,Low Power,High Power,Main Caps,Comments,\n")
+            f.write("1980-85,140029,350,-,-,2,cars,\n")
+            f.write('1975,355909,262,110,110,2,"car, truck",\n')
+            f.write("1976-85,355909,305,-,-,2,A,\n")
+            f.write("1969,,350,-,-,2,no casting number,\n")
+            f.write("1955,3703524,265,195,_,2,,\n")
+
+        total_imported = import_data(
+            self.temp_csv_path,
+            self.db,
+            batch_size=2,
+            report_path=self.report_path
+        )
+        self.assertEqual(total_imported, 3)
+        self.assertEqual(
+            sorted(casting.casting for casting in self.db.query(CastingModel).all()),
+            ["140029", "355909", "3703524"]
+        )
+
+        # The first row with a duplicate casting number wins
+        casting = self.db.query(CastingModel).filter(
+            CastingModel.casting == "355909"
+        ).one()
+        self.assertEqual(casting.cid, 262)
+
+        with open(self.report_path, newline="", encoding="utf-8") as f:
+            report = list(csv.DictReader(f))
+        self.assertEqual([row["line"] for row in report], ["4", "5"])
+        self.assertEqual(report[0]["reason"], "duplicate casting number")
+        self.assertEqual(report[0]["casting"], "355909")
+        self.assertIn("NOT NULL", report[1]["reason"])
+
+    def test_import_data_without_rejects(self):
+        """Test that no report is written when every row is imported."""
+        with open(self.temp_csv_path, "w", newline="", encoding="utf-8-sig") as f:
+            f.write("Years,Casting,CID,Low Power,High Power,Main Caps,Comments,\n")
+            for i in range(12):
+                f.write(f"1980-85,{14010200 + i},305,-,-,2,car,\n")
+
+        total_imported = import_data(
+            self.temp_csv_path,
+            self.db,
+            batch_size=5,
+            report_path=self.report_path
+        )
+        self.assertEqual(total_imported, 12)
+        self.assertEqual(self.db.query(CastingModel).count(), 12)
+        self.assertFalse(os.path.exists(self.report_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import os
+import sys
+import unittest
+from fastapi.testclient import TestClient
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.main import app
+from app.api.queries import search_castings_query, statement_cache
+from app.db.database import engine, Base, SessionLocal
+from app.models.casting import Casting as CastingModel
+from app.utils.import_data import clean_data
+
+
+class TestSearch(unittest.TestCase):
+    """Test cases for the search endpoint."""
+    
+    def setUp(self):
+        """Set up test database and client."""
+        # Create test client
+        self.client = TestClient(app)
+        
+        # Create tables
+        Base.metadata.create_all(bind=engine)
+        
+        # Insert test data
+        records = [
+            {"years": "1973-80", "casting": "330817", "cid": "400", "comments": "car, truck"},
+            {"years": "1975", "casting": "355909", "cid": "262", "comments": "car, truck"},
+            {"years": "1967-68", "casting": "389257", "cid": "302", "comments": "Z-28"},
+            {"years": "1982-86", "casting": "366286", "cid": "350", "comments": "Chevrolet, siamese"},
+            {"years": "-", "casting": "3914678", "cid": "302", "comments": "Camaro, Z-28"},
+        ]
+        db = SessionLocal()
+        try:
+            db.query(CastingModel).delete()
+            db.add_all([CastingModel(**clean_data(record)) for record in records])
+            db.commit()
+        finally:
+            db.close()
+    
+    def tearDown(self):
+        """Clean up after tests."""
+        # Drop tables
+        Base.metadata.drop_all(bind=engine)
+    
+    def search(self, **params):
+        """Run a search and return the matching casting numbers."""
+        response = self.client.get("/api/castings/search/", params=params)
+        self.assertEqual(response.status_code, 200)
+        return sorted(casting["casting"] for casting in response.json())
+    
+    def test_search_by_year(self):
+        """Test searching for castings produced in a given year."""
+        self.assertEqual(self.search(year=1975), ["330817", "355909"])
+        self.assertEqual(self.search(year=1968), ["389257"])
+        self.assertEqual(self.search(year=1990), [])
+        
+        # The text search only matches the literal years string
+        self.assertEqual(self.search(years="1975"), ["355909"])
+    
+    def test_search_by_year_range(self):
+        """Test searching for castings overlapping a range of years."""
+        self.assertEqual(self.search(year_from=1960, year_to=1970), ["389257"])
+        self.assertEqual(self.search(year_from=1976, year_to=1983), ["330817", "366286"])
+        self.assertEqual(self.search(year_from=1985), ["366286"])
+        self.assertEqual(self.search(year_to=1968), ["389257"])
+        self.assertEqual(self.search(year_from=1970, cid=262), ["355909"])
+    
+    def test_search_by_comments(self):
+        """Test full-text search over the comments."""
+        self.assertEqual(self.search(comments="truck"), ["330817", "355909"])
+        self.assertEqual(self.search(comments="Z-28"), ["389257", "3914678"])
+        self.assertEqual(self.search(comments="siam"), ["366286"])
+        self.assertEqual(self.search(comments="camaro z-28"), ["3914678"])
+        self.assertEqual(self.search(comments="Z-28", cid=302, year=1967), ["389257"])
+        self.assertEqual(self.search(comments="marine"), [])
+        self.assertEqual(self.search(comments='"'), [])
+    
+    def test_search_by_comments_orders_by_relevance(self):
+        """Test that comment searches return the best matches first."""
+        response = self.client.get("/api/castings/search/", params={"comments": "Z-28"})
+        self.assertEqual(
+            [casting["casting"] for casting in response.json()],
+            ["389257", "3914678"]
+        )
+    
+    def test_comments_index_follows_updates(self):
+        """Test that the full-text index is kept in sync with the table."""
+        db = SessionLocal()
+        try:
+            casting = db.query(CastingModel).filter(
+                CastingModel.casting == "330817"
+            ).one()
+            casting.comments = "marine"
+            db.query(CastingModel).filter(CastingModel.casting == "355909").delete()
+            db.commit()
+        finally:
+            db.close()
+        
+        self.assertEqual(self.search(comments="truck"), [])
+        self.assertEqual(self.search(comments="marine"), ["330817"])
+    
+    def test_search_statements_are_cached_per_filter_combination(self):
+        """Test that each filter combination builds one reusable statement."""
+        statement_cache.clear()
+        
+        query, params = search_castings_query(0, 10, None, cid=350, comments="truck")
+        same_query, other_params = search_castings_query(0, 20, None, cid=302, comments="Z-28")
+        self.assertIs(query, same_query)
+        self.assertEqual(other_params["cid"], 302)
+        self.assertEqual(other_params["limit"], 21)
+        
+        other_query, _ = search_castings_query(0, 10, None, cid=350)
+        self.assertIsNot(query, other_query)
+        
+        # Cached statements return the right rows for new values
+        self.assertEqual(self.search(year=1975), ["330817", "355909"])
+        self.assertEqual(self.search(year=1968), ["389257"])
+        
+        response = self.client.get("/stats/statements")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {"statements": 3, "hits": 2, "misses": 3, "hit_rate": 0.4}
+        )
+    
+    def test_year_range_query_uses_index(self):
+        """Test that year range searches use the composite index."""
+        with engine.connect() as connection:
+            plan = connection.exec_driver_sql(
+                "EXPLAIN QUERY PLAN SELECT * FROM castings "
+                "WHERE start_year <= 1975 AND end_year >= 1975"
+            ).fetchall()
+        self.assertIn("ix_castings_year_range", " ".join(row[-1] for row in plan))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import asyncio
+import os
+import sys
+import unittest
+from typing import List
+from unittest.mock import patch
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.api import serialization
+from app.api.queries import CASTING_FIELDS
+from app.schemas.casting import Casting
+
+
+class TestSerialization(unittest.TestCase):
+    """Test cases for the fast list response serialization."""
+    
+    def setUp(self):
+        """Set up test rows."""
+        castings = [
+            {
+                "id": 1, "casting": "330817", "years": "1973-80", "start_year": 1973,
+                "end_year": 1980, "cid": 400, "low_power": "150", "high_power": "180",
+                "main_caps": "2", "comments": "car, truck",
+            },
+            {
+                "id": 2, "casting": "3914678", "years": None, "start_year": None,
+                "end_year": None, "cid": None, "low_power": None, "high_power": None,
+                "main_caps": "4", "comments": "Camaro, Z-28 é",
+            },
+        ]
+        self.rows = [tuple(casting[field] for field in CASTING_FIELDS) for casting in castings]
+        self.castings = castings
+    
+    def validated_body(self):
+        """Render the test castings the way FastAPI does for List[Casting]."""
+        field = create_response_field(name="Response", type_=List[Casting])
+        content = asyncio.run(
+            serialize_response(field=field, response_content=self.castings, is_coroutine=True)
+        )
+        return JSONResponse(content).body
+    
+    def test_matches_validated_response(self):
+        """Test that the fast path renders the same bytes as response_model."""
+        response = serialization.castings_response(self.rows)
+        self.assertEqual(response.media_type, "application/json")
+        self.assertEqual(response.body, self.validated_body())
+    
+    def test_json_fallback(self):
+        """Test serialization without orjson installed."""
+        with patch.object(serialization, "orjson", None):
+            body = serialization.dump_castings(self.rows)
+        self.assertEqual(body, self.validated_body())
+
+
+if __name__ == "__main__":
+    unittest.main()
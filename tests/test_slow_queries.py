@@ -0,0 +1,119 @@
+import os
+import sys
+import unittest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.main import app
+from app.api.slow_queries import SlowQueryLog
+from app.db.database import engine, Base, SessionLocal
+from app.models.casting import Casting as CastingModel
+from app.utils.import_data import clean_data
+from app.utils.slow_query_report import describe_filters, read_log, summarise
+
+
+class TestSlowQueries(unittest.TestCase):
+    """Test cases for the slow query log and its report."""
+    
+    def setUp(self):
+        """Set up test database, client and log."""
+        # Create test client
+        self.client = TestClient(app)
+        
+        # Create tables
+        Base.metadata.create_all(bind=engine)
+        
+        # Insert test data
+        records = [
+            {"years": "1973-80", "casting": "330817", "cid": "400", "main_caps": "2", "comments": "car, truck"},
+            {"years": "1975", "casting": "355909", "cid": "262", "main_caps": "2", "comments": "car, truck"},
+            {"years": "1967-68", "casting": "389257", "cid": "302", "main_caps": "4", "comments": "Z-28"},
+        ]
+        db = SessionLocal()
+        try:
+            db.query(CastingModel).delete()
+            db.add_all([CastingModel(**clean_data(record)) for record in records])
+            db.commit()
+        finally:
+            db.close()
+        
+        self.log_path = os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            "temp_slow_queries.jsonl"
+        )
+        # Log every statement
+        self.slow_query_log = SlowQueryLog(self.log_path, 0)
+        self.slow_query_log.instrument(engine)
+    
+    def tearDown(self):
+        """Clean up after tests."""
+        event.remove(engine, "before_cursor_execute", self.slow_query_log._before_cursor_execute)
+        event.remove(engine, "after_cursor_execute", self.slow_query_log._after_cursor_execute)
+        
+        # Drop tables
+        Base.metadata.drop_all(bind=engine)
+        
+        # Remove temporary file
+        if os.path.exists(self.log_path):
+            os.remove(self.log_path)
+    
+    def test_slow_queries_are_logged_with_plans(self):
+        """Test that logged queries carry parameters, route and a deduplicated plan."""
+        self.client.get("/api/castings/search/", params={"years": "197", "main_caps": "2"})
+        self.client.get("/api/castings/search/", params={"years": "196", "main_caps": "4"})
+        self.client.get("/api/castings/search/", params={"comments": "truck"})
+        
+        entries = [
+            entry for entry in read_log(self.log_path)
+            if entry["route"] == "/api/castings/search/"
+        ]
+        self.assertEqual(len(entries), 3)
+        
+        first, second, ranked = entries
+        self.assertEqual(first["method"], "GET")
+        self.assertEqual(first["parameters"][:2], ["%197%", "%2%"])
+        self.assertEqual(second["parameters"][:2], ["%196%", "%4%"])
+        self.assertGreaterEqual(first["duration_ms"], 0)
+        
+        # The plan is logged once per statement shape
+        self.assertEqual(first["shape"], second["shape"])
+        self.assertIn("SCAN castings", first["plan"])
+        self.assertNotIn("plan", second)
+        self.assertNotEqual(ranked["shape"], first["shape"])
+        self.assertTrue(any("castings_fts" in line for line in ranked["plan"]))
+    
+    def test_disabled_log_does_not_instrument(self):
+        """Test that the log is off without a threshold."""
+        disabled = SlowQueryLog(self.log_path + ".off", None)
+        self.assertFalse(disabled.enabled)
+        disabled.instrument(engine)
+        self.assertFalse(
+            event.contains(engine, "after_cursor_execute", disabled._after_cursor_execute)
+        )
+    
+    def test_summarise(self):
+        """Test grouping log entries by statement shape."""
+        self.client.get("/api/castings/search/", params={"years": "197", "main_caps": "2"})
+        self.client.get("/api/castings/search/", params={"years": "196", "main_caps": "4"})
+        self.client.get("/api/castings/search/", params={"comments": "truck"})
+        
+        summaries = {
+            summary["statement"].split("WHERE")[1].split()[0]: summary
+            for summary in summarise(read_log(self.log_path))
+            if summary["routes"] == ["GET /api/castings/search/"]
+        }
+        self.assertEqual(summaries["lower(castings.years)"]["count"], 2)
+        self.assertTrue(summaries["lower(castings.years)"]["table_scan"])
+        # The full-text search reads the FTS index, then castings by rowid
+        self.assertFalse(summaries["castings_fts.castings_fts"]["table_scan"])
+        self.assertEqual(
+            describe_filters(summaries["lower(castings.years)"]["statement"]),
+            "lower(years) LIKE lower(?) AND lower(main_caps) LIKE lower(?)"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()